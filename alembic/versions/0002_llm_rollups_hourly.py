@@ -0,0 +1,59 @@
+"""hourly llm rollups
+
+Revision ID: 0002_llm_rollups_hourly
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_llm_rollups_hourly"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_rollups_hourly",
+        sa.Column("tenant_id", sa.String(length=64), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("provider", sa.String(length=128), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("feature", sa.String(length=128), nullable=False),
+        sa.Column("requests", sa.BigInteger(), nullable=False),
+        sa.Column("errors", sa.BigInteger(), nullable=False),
+        sa.Column("prompt_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("completion_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("total_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("cost_usd", sa.Numeric(20, 6), nullable=False),
+        sa.Column("latency_sum_ms", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.PrimaryKeyConstraint("tenant_id", "bucket_start", "provider", "model", "feature"),
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        bucket = "timezone('UTC', date_trunc('hour', timezone('UTC', timestamp)))"
+    else:
+        bucket = "strftime('%Y-%m-%d %H:00:00.000000', timestamp)"
+    op.execute(
+        f"""
+        INSERT INTO llm_rollups_hourly (
+            tenant_id, bucket_start, provider, model, feature, requests, errors,
+            prompt_tokens, completion_tokens, total_tokens, cost_usd, latency_sum_ms
+        )
+        SELECT
+            tenant_id, {bucket}, provider, model, feature, COUNT(*),
+            SUM(CASE WHEN lower(status) != 'success' THEN 1 ELSE 0 END),
+            SUM(prompt_tokens), SUM(completion_tokens), SUM(total_tokens), SUM(cost_usd), SUM(latency_ms)
+        FROM llm_events
+        GROUP BY tenant_id, {bucket}, provider, model, feature
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("llm_rollups_hourly")
@@ -0,0 +1,82 @@
+"""latency sketch bins for hourly llm rollups
+
+Revision ID: 0003_llm_rollup_latency_bins
+Revises: 0002_llm_rollups_hourly
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_llm_rollup_latency_bins"
+down_revision = "0002_llm_rollups_hourly"
+branch_labels = None
+depends_on = None
+
+# Must match llm_revenue_analyzer.core.sketch (1% relative accuracy).
+_LOG_GAMMA = math.log(1.01 / 0.99)
+
+
+def _latency_bin(value: int) -> int:
+    if value < 1:
+        return 0
+    return math.ceil(math.log(value) / _LOG_GAMMA) + 1
+
+
+def upgrade() -> None:
+    bins_table = op.create_table(
+        "llm_rollup_latency_bins",
+        sa.Column("tenant_id", sa.String(length=64), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("provider", sa.String(length=128), nullable=False),
+        sa.Column("model", sa.String(length=128), nullable=False),
+        sa.Column("feature", sa.String(length=128), nullable=False),
+        sa.Column("bin", sa.Integer(), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.PrimaryKeyConstraint("tenant_id", "bucket_start", "provider", "model", "feature", "bin"),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        bucket = "timezone('UTC', date_trunc('hour', timezone('UTC', timestamp)))"
+    else:
+        bucket = "strftime('%Y-%m-%d %H:00:00.000000', timestamp)"
+    result = bind.execute(
+        sa.text(
+            f"""
+            SELECT tenant_id, {bucket} AS bucket_start, provider, model, feature, latency_ms, COUNT(*)
+            FROM llm_events
+            GROUP BY tenant_id, {bucket}, provider, model, feature, latency_ms
+            """
+        )
+    )
+    counts: dict[tuple[object, ...], int] = {}
+    for tenant_id, bucket_start, provider, model, feature, latency_ms, count in result:
+        if isinstance(bucket_start, str):
+            bucket_start = datetime.fromisoformat(bucket_start)
+        key = (tenant_id, bucket_start, provider, model, feature, _latency_bin(latency_ms))
+        counts[key] = counts.get(key, 0) + count
+    rows = [
+        {
+            "tenant_id": key[0],
+            "bucket_start": key[1],
+            "provider": key[2],
+            "model": key[3],
+            "feature": key[4],
+            "bin": key[5],
+            "count": count,
+        }
+        for key, count in counts.items()
+    ]
+    for offset in range(0, len(rows), 1000):
+        op.bulk_insert(bins_table, rows[offset : offset + 1000])
+
+
+def downgrade() -> None:
+    op.drop_table("llm_rollup_latency_bins")
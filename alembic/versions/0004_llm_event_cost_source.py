@@ -0,0 +1,25 @@
+"""record whether llm event cost was computed or supplied
+
+Revision ID: 0004_llm_event_cost_source
+Revises: 0003_llm_rollup_latency_bins
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_llm_event_cost_source"
+down_revision = "0003_llm_rollup_latency_bins"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows stay NULL: ingest never recorded whether their cost was supplied.
+    op.add_column("llm_events", sa.Column("cost_source", sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("llm_events", "cost_source")
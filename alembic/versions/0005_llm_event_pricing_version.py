@@ -0,0 +1,24 @@
+"""record the pricing catalog version used for computed llm costs
+
+Revision ID: 0005_llm_event_pricing_version
+Revises: 0004_llm_event_cost_source
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_llm_event_pricing_version"
+down_revision = "0004_llm_event_cost_source"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("llm_events", sa.Column("pricing_version", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("llm_events", "pricing_version")
@@ -0,0 +1,62 @@
+"""promote revenue feature attribution to an indexed column
+
+Revision ID: 0006_revenue_event_feature
+Revises: 0005_llm_event_pricing_version
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_revenue_event_feature"
+down_revision = "0005_llm_event_pricing_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "revenue_events",
+        sa.Column("feature", sa.String(length=128), nullable=False, server_default="unattributed"),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        value = "metadata_json ->> 'feature'"
+        value_type = "json_typeof(metadata_json -> 'feature')"
+        string_type = "'string'"
+    else:
+        value = "json_extract(metadata_json, '$.feature')"
+        value_type = "json_type(metadata_json, '$.feature')"
+        string_type = "'text'"
+    bind.execute(
+        sa.text(f"UPDATE revenue_events SET feature = substr({value}, 1, 128) WHERE {value_type} = {string_type}")
+    )
+    # Numbers and booleans are rare; format them like revenue_feature() does (str() of the JSON value).
+    rows = bind.execute(
+        sa.text(
+            f"SELECT id, metadata_json FROM revenue_events "
+            f"WHERE {value_type} IS NOT NULL AND {value_type} NOT IN ({string_type}, 'null')"
+        )
+    ).all()
+    for event_id, metadata in rows:
+        metadata = json.loads(metadata) if isinstance(metadata, str) else metadata
+        bind.execute(
+            sa.text("UPDATE revenue_events SET feature = :feature WHERE id = :id"),
+            {"feature": str(metadata["feature"])[:128], "id": event_id},
+        )
+
+    op.create_index(
+        "ix_revenue_events_tenant_feature_timestamp",
+        "revenue_events",
+        ["tenant_id", "feature", "timestamp"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revenue_events_tenant_feature_timestamp", table_name="revenue_events")
+    op.drop_column("revenue_events", "feature")
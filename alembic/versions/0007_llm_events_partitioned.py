@@ -0,0 +1,116 @@
+"""range-partition llm_events by month on postgres
+
+Revision ID: 0007_llm_events_partitioned
+Revises: 0006_revenue_event_feature
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_llm_events_partitioned"
+down_revision = "0006_revenue_event_feature"
+branch_labels = None
+depends_on = None
+
+# Future months created up front; the partition maintenance task keeps extending this.
+_PREMAKE_MONTHS = 3
+
+_COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('llm_events_id_seq'),
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    tenant_id VARCHAR(64) NOT NULL REFERENCES tenants (id),
+    user_id VARCHAR(128) NOT NULL,
+    request_id VARCHAR(128) NOT NULL,
+    model VARCHAR(128) NOT NULL,
+    provider VARCHAR(128) NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    status VARCHAR(32) NOT NULL,
+    cost_usd NUMERIC(14, 6) NOT NULL,
+    feature VARCHAR(128) NOT NULL,
+    metadata_json JSON,
+    cost_source VARCHAR(16),
+    pricing_version VARCHAR(64)
+"""
+_COLUMN_NAMES = (
+    "id, timestamp, tenant_id, user_id, request_id, model, provider, prompt_tokens, completion_tokens, "
+    "total_tokens, latency_ms, status, cost_usd, feature, metadata_json, cost_source, pricing_version"
+)
+_INDEXES = {
+    "ix_llm_events_timestamp": "timestamp",
+    "ix_llm_events_tenant_id": "tenant_id",
+    "ix_llm_events_request_id": "request_id",
+    "ix_llm_events_model": "model",
+    "ix_llm_events_provider": "provider",
+    "ix_llm_events_feature": "feature",
+    "ix_llm_events_tenant_timestamp": "tenant_id, timestamp",
+}
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _bound(day: date) -> str:
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+
+def _swap_tables(create_sql: str) -> None:
+    """Rename the current table aside, create its replacement, copy rows and drop the old one."""
+    op.execute("ALTER TABLE llm_events RENAME TO llm_events_old")
+    op.execute("ALTER INDEX llm_events_pkey RENAME TO llm_events_old_pkey")
+    for name in _INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("ALTER SEQUENCE llm_events_id_seq OWNED BY NONE")
+    op.execute(create_sql)
+
+
+def _finish_swap() -> None:
+    op.execute(f"INSERT INTO llm_events ({_COLUMN_NAMES}) SELECT {_COLUMN_NAMES} FROM llm_events_old")
+    op.execute("DROP TABLE llm_events_old")
+    op.execute("ALTER SEQUENCE llm_events_id_seq OWNED BY llm_events.id")
+    for name, columns in _INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON llm_events ({columns})")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    earliest = bind.execute(sa.text("SELECT min(timestamp) FROM llm_events")).scalar()
+    today = datetime.now(UTC).date()
+    start = (earliest.astimezone(UTC).date() if earliest else today).replace(day=1)
+    horizon = today.replace(day=1)
+    for _ in range(_PREMAKE_MONTHS + 1):
+        horizon = _next_month(horizon)
+
+    _swap_tables(
+        f"CREATE TABLE llm_events ({_COLUMNS}, PRIMARY KEY (id, timestamp)) PARTITION BY RANGE (timestamp)"
+    )
+    month = start
+    while month < horizon:
+        end = _next_month(month)
+        op.execute(
+            f"CREATE TABLE llm_events_p{month:%Y%m%d}_{end:%Y%m%d} PARTITION OF llm_events "
+            f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(end)})"
+        )
+        month = end
+    op.execute("CREATE TABLE llm_events_default PARTITION OF llm_events DEFAULT")
+    _finish_swap()
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    # Detached (archived) partitions are not copied back.
+    _swap_tables(f"CREATE TABLE llm_events ({_COLUMNS}, PRIMARY KEY (id))")
+    _finish_swap()
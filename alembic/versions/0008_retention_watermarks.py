@@ -0,0 +1,30 @@
+"""retention watermarks for downsampled raw events
+
+Revision ID: 0008_retention_watermarks
+Revises: 0007_llm_events_partitioned
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_retention_watermarks"
+down_revision = "0007_llm_events_partitioned"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "retention_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("purged_before", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("retention_watermarks")
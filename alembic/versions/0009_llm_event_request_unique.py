@@ -0,0 +1,49 @@
+"""unique (tenant_id, request_id) on llm_events for idempotent ingest
+
+Revision ID: 0009_llm_event_request_unique
+Revises: 0008_retention_watermarks
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_llm_event_request_unique"
+down_revision = "0008_retention_watermarks"
+branch_labels = None
+depends_on = None
+
+_INDEX = "uq_llm_events_tenant_request"
+
+
+def _is_partitioned(bind: sa.engine.Connection) -> bool:
+    kind = bind.execute(sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass('llm_events')")).scalar()
+    return kind == "p"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Keep the first copy of each retried event. Rollups still include the removed copies, so
+    # rebuild them afterwards (scripts.rebuild_rollups) if this deletes anything.
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            """
+            DELETE FROM llm_events a USING llm_events b
+            WHERE a.tenant_id = b.tenant_id AND a.request_id = b.request_id AND a.id > b.id
+            """
+        )
+    else:
+        op.execute(
+            "DELETE FROM llm_events WHERE id NOT IN (SELECT min(id) FROM llm_events GROUP BY tenant_id, request_id)"
+        )
+    if bind.dialect.name == "postgresql" and _is_partitioned(bind):
+        # Unique indexes on a partitioned table must include the partition key.
+        op.create_index(_INDEX, "llm_events", ["tenant_id", "request_id", "timestamp"], unique=True)
+    else:
+        op.create_index(_INDEX, "llm_events", ["tenant_id", "request_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name="llm_events")
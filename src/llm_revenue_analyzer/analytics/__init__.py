@@ -1,4 +1,15 @@
 from llm_revenue_analyzer.analytics.anomaly import AnomalyCheckResult, AnomalyDetector
+from llm_revenue_analyzer.analytics.anomaly_queue import AnomalyQueue
+from llm_revenue_analyzer.analytics.cost_series import DailyCostSeries
+from llm_revenue_analyzer.analytics.result_cache import MetricsCacheKey, MetricsResultCache
 from llm_revenue_analyzer.analytics.service import AnalyticsService
 
-__all__ = ["AnalyticsService", "AnomalyDetector", "AnomalyCheckResult"]
+__all__ = [
+    "AnalyticsService",
+    "AnomalyDetector",
+    "AnomalyCheckResult",
+    "AnomalyQueue",
+    "DailyCostSeries",
+    "MetricsCacheKey",
+    "MetricsResultCache",
+]
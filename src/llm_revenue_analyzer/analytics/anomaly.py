@@ -6,6 +6,7 @@ from decimal import Decimal
 
 from sqlalchemy.orm import Session
 
+from llm_revenue_analyzer.analytics.cost_series import DailyCostSeries
 from llm_revenue_analyzer.analytics.service import AnalyticsService
 from llm_revenue_analyzer.store.repos import AlertRepo
 
@@ -20,18 +21,28 @@ class AnomalyCheckResult:
 
 
 class AnomalyDetector:
-    def __init__(self, session: Session, multiplier: float, lookback_days: int) -> None:
+    def __init__(
+        self,
+        session: Session,
+        multiplier: float,
+        lookback_days: int,
+        series: DailyCostSeries | None = None,
+    ) -> None:
         self.session = session
         self.multiplier = multiplier
         self.lookback_days = lookback_days
+        self.series = series
         self.analytics = AnalyticsService(session)
         self.alerts = AlertRepo(session)
 
     def check_daily_cost_spike(self, tenant_id: str, now: datetime | None = None) -> AnomalyCheckResult:
         now_utc = (now or datetime.now(UTC)).astimezone(UTC)
         today = now_utc.date()
-        history = self.analytics.cost_history(tenant_id, days=self.lookback_days + 1, until=now_utc)
-        buckets = {day: cost for day, cost in history}
+        if self.series is not None:
+            buckets = self.series.window(self.session, tenant_id, today, self.lookback_days)
+        else:
+            history = self.analytics.cost_history(tenant_id, days=self.lookback_days + 1, until=now_utc)
+            buckets = {day: cost for day, cost in history}
         today_cost = buckets.get(today, Decimal("0"))
         baseline_days = [today - timedelta(days=offset) for offset in range(1, self.lookback_days + 1)]
         baseline_values = [buckets[d] for d in baseline_days if d in buckets]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, date, datetime
+
+from sqlalchemy.orm import Session
+
+from llm_revenue_analyzer.analytics.anomaly import AnomalyCheckResult, AnomalyDetector
+from llm_revenue_analyzer.analytics.cost_series import DailyCostSeries
+from llm_revenue_analyzer.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CheckKey = tuple[str, date]
+
+
+class AnomalyQueue:
+    """Pending anomaly checks, coalesced to one per tenant and UTC day."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[CheckKey, datetime] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, tenant_id: str, timestamp: datetime) -> None:
+        ts = timestamp.astimezone(UTC) if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
+        key = (tenant_id, ts.date())
+        with self._lock:
+            latest = self._pending.get(key)
+            if latest is None or ts > latest:
+                self._pending[key] = ts
+
+    def drain(self) -> list[tuple[str, datetime]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return sorted(((tenant_id, ts) for (tenant_id, _), ts in pending.items()), key=lambda item: item[1])
+
+    def process(
+        self,
+        session: Session,
+        multiplier: float,
+        lookback_days: int,
+        series: DailyCostSeries | None = None,
+    ) -> list[AnomalyCheckResult]:
+        detector = AnomalyDetector(session=session, multiplier=multiplier, lookback_days=lookback_days, series=series)
+        results: list[AnomalyCheckResult] = []
+        failed = 0
+        for tenant_id, timestamp in self.drain():
+            try:
+                results.append(detector.check_daily_cost_spike(tenant_id, now=timestamp))
+                session.commit()
+            except Exception:
+                session.rollback()
+                failed += 1
+                self.submit(tenant_id, timestamp)
+                logger.exception("anomaly_check_failed", extra={"extra": {"tenant_id": tenant_id}})
+        if results or failed:
+            logger.info(
+                "anomaly_checks_processed",
+                extra={
+                    "extra": {
+                        "checked": len(results),
+                        "triggered": sum(result.triggered for result in results),
+                        "failed": failed,
+                    }
+                },
+            )
+        return results
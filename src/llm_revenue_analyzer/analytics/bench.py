@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from statistics import median
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import Result, event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from llm_revenue_analyzer.analytics.service import AnalyticsEngine, AnalyticsService
+from llm_revenue_analyzer.core.settings import Settings
+from llm_revenue_analyzer.store.db import get_session_factory
+from llm_revenue_analyzer.store.models import RevenueEvent
+from llm_revenue_analyzer.store.repos import LLMEventRepo, RollupRepo, TenantRepo
+
+BENCH_ENDPOINTS = ("summary", "summary_all", "by_model", "by_feature")
+_MODELS = [("openai", "gpt-4o-mini"), ("openai", "gpt-4.1-mini"), ("anthropic", "claude-3-5-haiku")]
+_FEATURES = ["chat", "search", "copilot", "classification"]
+_CHUNK = 5000
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    rows_returned: int = 0
+
+
+@dataclass
+class BenchResult:
+    endpoint: str
+    engine: str
+    statements: int
+    rows_returned: int
+    median_ms: float
+
+
+@contextmanager
+def count_queries(session: Session) -> Iterator[QueryStats]:
+    """Count SELECT statements run through ``session`` and the rows they return.
+
+    Rows returned are not rows scanned: an aggregate that reads the whole window still returns one
+    row per bucket.
+    """
+    stats = QueryStats()
+
+    def _count(state: ORMExecuteState) -> Result[Any] | None:
+        if not state.is_select:
+            return None
+        frozen = state.invoke_statement().freeze()
+        stats.statements += 1
+        stats.rows_returned += len(frozen.data)
+        return frozen()
+
+    event.listen(session, "do_orm_execute", _count)
+    try:
+        yield stats
+    finally:
+        event.remove(session, "do_orm_execute", _count)
+
+
+def seed_synthetic(
+    session: Session,
+    tenants: int,
+    events: int,
+    start: datetime,
+    end: datetime,
+    seed: int = 42,
+) -> list[str]:
+    """Insert ``events`` random LLM events (plus rollups and some revenue) spread over ``[start, end)``.
+
+    Tenants get a long-tailed share of the traffic; the first returned tenant is the busiest.
+    """
+    rng = random.Random(seed)
+    tenant_ids = [f"bench-tenant-{idx:03d}" for idx in range(tenants)]
+    for tenant_id in tenant_ids:
+        TenantRepo(session).ensure(tenant_id)
+    span = (end - start).total_seconds()
+    event_repo, rollup_repo = LLMEventRepo(session), RollupRepo(session)
+    for offset in range(0, events, _CHUNK):
+        rows = []
+        for idx in range(offset, min(offset + _CHUNK, events)):
+            provider, model = rng.choice(_MODELS)
+            prompt_tokens, completion_tokens = rng.randint(50, 4000), rng.randint(10, 1500)
+            rows.append(
+                {
+                    "timestamp": start + timedelta(seconds=rng.random() * span),
+                    "tenant_id": tenant_ids[(int(rng.paretovariate(1.2)) - 1) % tenants],
+                    "user_id": f"user-{rng.randint(1, 50)}",
+                    "request_id": f"bench-{idx}",
+                    "provider": provider,
+                    "model": model,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "latency_ms": int(rng.lognormvariate(6, 0.6)),
+                    "status": "error" if rng.random() < 0.03 else "success",
+                    "cost_usd": Decimal(prompt_tokens + 4 * completion_tokens) / Decimal(10_000_000),
+                    "feature": rng.choice(_FEATURES),
+                    "metadata_json": None,
+                }
+            )
+        event_repo.bulk_create(rows)
+        rollup_repo.apply(rows)
+        session.commit()
+    for idx in range(max(1, events // 20)):
+        session.add(
+            RevenueEvent(
+                timestamp=start + timedelta(seconds=rng.random() * span),
+                tenant_id=tenant_ids[idx % tenants],
+                user_id=f"user-{rng.randint(1, 50)}",
+                amount_usd=Decimal(rng.randint(100, 5000)) / 100,
+                currency="USD",
+                source="usage",
+                feature=rng.choice(_FEATURES),
+            )
+        )
+    session.commit()
+    return tenant_ids
+
+
+def _call(
+    service: AnalyticsService, endpoint: str, tenant_id: str, from_ts: datetime, to_ts: datetime
+) -> Callable[[], object]:
+    quantiles = (0.5, 0.99)
+    calls: dict[str, Callable[[], object]] = {
+        "summary": lambda: service.summary(tenant_id, from_ts, to_ts, quantiles),
+        "summary_all": lambda: service.summaries(None, from_ts, to_ts, quantiles),
+        "by_model": lambda: service.by_model(tenant_id, from_ts, to_ts, "day", quantiles),
+        "by_feature": lambda: service.by_feature(tenant_id, from_ts, to_ts, "day", quantiles),
+    }
+    return calls[endpoint]
+
+
+def run_bench(
+    settings: Settings,
+    tenant_id: str,
+    from_ts: datetime,
+    to_ts: datetime,
+    engines: Sequence[AnalyticsEngine] = ("python", "rollup", "sql"),
+    endpoints: Sequence[str] = BENCH_ENDPOINTS,
+    repeat: int = 5,
+) -> list[BenchResult]:
+    """Time each analytics endpoint per engine; every run uses a fresh session."""
+    session_factory = get_session_factory(settings)
+    results: list[BenchResult] = []
+    for engine in engines:
+        for endpoint in endpoints:
+            timings: list[float] = []
+            runs: list[QueryStats] = []
+            for _ in range(max(1, repeat)):
+                with session_factory() as session, count_queries(session) as stats:
+                    call = _call(AnalyticsService(session, engine=engine), endpoint, tenant_id, from_ts, to_ts)
+                    start = perf_counter()
+                    call()
+                    timings.append((perf_counter() - start) * 1000)
+                runs.append(stats)
+            results.append(BenchResult(endpoint, engine, runs[-1].statements, runs[-1].rows_returned, median(timings)))
+    return results
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.store.repos import LLMEventRepo
+
+logger = get_logger(__name__)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=UTC)
+
+
+class _TenantSeries:
+    __slots__ = ("days", "totals", "loaded_from", "newest")
+
+    def __init__(self, capacity: int, loaded_from: date, newest: date) -> None:
+        self.days: list[date | None] = [None] * capacity
+        self.totals: list[Decimal] = [Decimal("0")] * capacity
+        self.loaded_from = loaded_from
+        self.newest = newest
+
+    @property
+    def capacity(self) -> int:
+        return len(self.days)
+
+    def oldest(self) -> date:
+        return max(self.loaded_from, self.newest - timedelta(days=self.capacity - 1))
+
+    def add(self, day: date, cost_usd: Decimal) -> None:
+        if day < self.oldest():
+            return
+        slot = day.toordinal() % self.capacity
+        if self.days[slot] == day:
+            self.totals[slot] += cost_usd
+        else:
+            self.days[slot] = day
+            self.totals[slot] = cost_usd
+        self.newest = max(self.newest, day)
+
+    def get(self, day: date) -> Decimal | None:
+        slot = day.toordinal() % self.capacity
+        return self.totals[slot] if self.days[slot] == day else None
+
+
+class DailyCostSeries:
+    """Per-tenant ring buffer of the most recent daily LLM cost totals (UTC days)."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._tenants: dict[str, _TenantSeries] = {}
+
+    def add(self, tenant_id: str, timestamp: datetime, cost_usd: Decimal) -> None:
+        day = timestamp.astimezone(UTC).date() if timestamp.tzinfo else timestamp.date()
+        with self._lock:
+            series = self._tenants.get(tenant_id)
+            if series is not None:
+                series.add(day, cost_usd)
+
+    def window(self, session: Session, tenant_id: str, until: date, days: int) -> dict[date, Decimal]:
+        start = until - timedelta(days=days)
+        if days + 1 > self.capacity:
+            return self._fetch(session, tenant_id, start, until)
+        with self._lock:
+            series = self._tenants.get(tenant_id)
+            if series is not None and start >= series.oldest():
+                return self._read(series, start, until)
+        if series is not None and start < series.oldest():
+            return self._fetch(session, tenant_id, start, until)
+
+        loaded = self._load(session, tenant_id, max(until, datetime.now(UTC).date()))
+        with self._lock:
+            series = self._tenants.setdefault(tenant_id, loaded)
+            return self._read(series, start, until)
+
+    def reconcile(self, session: Session) -> int:
+        with self._lock:
+            anchors = {tenant_id: series.newest for tenant_id, series in self._tenants.items()}
+        drifted = 0
+        for tenant_id, newest in anchors.items():
+            loaded = self._load(session, tenant_id, newest)
+            with self._lock:
+                current = self._tenants.get(tenant_id)
+                if current is None or current.newest != newest:
+                    continue
+                if self._read(current, loaded.oldest(), newest) != self._read(loaded, loaded.oldest(), newest):
+                    drifted += 1
+                self._tenants[tenant_id] = loaded
+        if drifted:
+            logger.info("daily_cost_series_reconciled", extra={"extra": {"tenants": len(anchors), "drifted": drifted}})
+        return drifted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tenants.clear()
+
+    def _load(self, session: Session, tenant_id: str, until: date) -> _TenantSeries:
+        start = until - timedelta(days=self.capacity - 1)
+        series = _TenantSeries(self.capacity, loaded_from=start, newest=until)
+        for day, total in self._fetch(session, tenant_id, start, until).items():
+            series.add(day, total)
+        return series
+
+    @staticmethod
+    def _fetch(session: Session, tenant_id: str, start: date, until: date) -> dict[date, Decimal]:
+        rows = LLMEventRepo(session).list_daily_costs(
+            tenant_id, _day_start(start), _day_start(until + timedelta(days=1))
+        )
+        return dict(rows)
+
+    @staticmethod
+    def _read(series: _TenantSeries, start: date, until: date) -> dict[date, Decimal]:
+        result: dict[date, Decimal] = {}
+        day = start
+        while day <= until:
+            total = series.get(day)
+            if total is not None:
+                result[day] = total
+            day += timedelta(days=1)
+        return result
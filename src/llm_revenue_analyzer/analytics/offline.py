@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from llm_revenue_analyzer.analytics.service import (
+    BucketKey,
+    Granularity,
+    Window,
+    _Aggregate,
+    _by_feature_rows,
+    _by_model_rows,
+    _summary_result,
+)
+from llm_revenue_analyzer.core.sketch import nearest_rank
+from llm_revenue_analyzer.store.parquet import LLM_TABLE, REVENUE_TABLE, iter_partitions
+
+T = TypeVar("T")
+
+LLM_READ_COLUMNS = ("total_tokens", "prompt_tokens", "completion_tokens", "cost_micros", "latency_ms", "status")
+LLM_SUM_COLUMNS = ("total_tokens", "prompt_tokens", "completion_tokens", "cost_micros", "latency_ms", "errors")
+
+
+@dataclass
+class _Partial:
+    sums: Counter[str] = field(default_factory=Counter)
+    latencies: Counter[int] = field(default_factory=Counter)
+
+    def merge(self, other: _Partial) -> None:
+        self.sums.update(other.sums)
+        self.latencies.update(other.latencies)
+
+    def aggregate(self, quantiles: Iterable[float]) -> _Aggregate:
+        aggregate = _Aggregate(
+            requests=self.sums["requests"],
+            errors=self.sums["errors"],
+            tokens=self.sums["total_tokens"],
+            prompt_tokens=self.sums["prompt_tokens"],
+            completion_tokens=self.sums["completion_tokens"],
+            cost_micros=self.sums["cost_micros"],
+            latency_sum_ms=self.sums["latency_ms"],
+        )
+        aggregate.latency_quantiles = _histogram_quantiles(self.latencies, {0.95, *quantiles})
+        return aggregate
+
+
+def _histogram_quantiles(histogram: Counter[int], quantiles: Iterable[float]) -> dict[float, float | None]:
+    if not histogram:
+        return {q: None for q in quantiles}
+    values = np.array(sorted(histogram), dtype=np.int64)
+    cumulative = np.cumsum([histogram[value] for value in values.tolist()])
+    total = int(cumulative[-1])
+    return {
+        q: float(values[int(np.searchsorted(cumulative, nearest_rank(total, q), side="left"))]) for q in quantiles
+    }
+
+
+def _read(path: Path, columns: Sequence[str], window: Window, day: date) -> pa.Table:
+    table = pq.read_table(path, columns=[*columns, "timestamp"], memory_map=True, use_threads=False)
+    day_start = datetime.combine(day, time.min, tzinfo=UTC)
+    if window.from_ts <= day_start and day_start + timedelta(days=1) <= window.to_ts:
+        return table
+    timestamps = table.column("timestamp")
+    mask = pc.and_(
+        pc.greater_equal(timestamps, pa.scalar(window.from_ts, type=timestamps.type)),
+        pc.less(timestamps, pa.scalar(window.to_ts, type=timestamps.type)),
+    )
+    return table.filter(mask)
+
+
+def _group_rows(table: pa.Table, keys: list[str], aggregations: list[tuple[Any, str]]) -> list[dict[str, Any]]:
+    if keys:
+        rows: list[dict[str, Any]] = table.group_by(keys, use_threads=False).aggregate(aggregations).to_pylist()
+        return rows
+    row: dict[str, Any] = {}
+    for column, function in aggregations:
+        name = "count_all" if function == "count_all" else f"{column}_{function}"
+        row[name] = table.num_rows if function == "count_all" else pc.sum(table.column(column)).as_py() or 0
+    return [row]
+
+
+class OfflineAnalytics:
+    """``AnalyticsService`` outputs computed from Parquet partitions written by ``ParquetExporter``.
+
+    Partitions are pruned by tenant and day from their paths, memory-mapped, and reduced with
+    Arrow hash aggregations on a thread pool (Arrow and NumPy release the GIL). Latency
+    quantiles are exact: each partition contributes a ``latency_ms -> count`` histogram, and
+    histograms merge by addition.
+    """
+
+    def __init__(self, root: Path, workers: int | None = None) -> None:
+        self.root = Path(root)
+        self.workers = workers or os.cpu_count() or 1
+
+    def summary(
+        self,
+        tenant_id: str,
+        from_ts: datetime,
+        to_ts: datetime,
+        quantiles: Sequence[float] = (),
+    ) -> dict[str, object]:
+        window = Window.normalize(from_ts, to_ts)
+        partials = self._collect_llm(tenant_id, window, (), by_day=True)
+        total = _Partial()
+        for partial in partials.values():
+            total.merge(partial)
+        days = {key: partial.aggregate(()) for key, partial in partials.items()}
+        aggregate = total.aggregate(quantiles)
+        aggregate.revenue_micros = sum(self._collect_revenue(tenant_id, window, by_feature=False, by_day=False).values())
+        return _summary_result(tenant_id, window, aggregate, days, quantiles)
+
+    def by_model(
+        self,
+        tenant_id: str,
+        from_ts: datetime,
+        to_ts: datetime,
+        granularity: Granularity = "total",
+        quantiles: Sequence[float] = (),
+    ) -> list[dict[str, Any]]:
+        window = Window.normalize(from_ts, to_ts)
+        partials = self._collect_llm(tenant_id, window, ("provider", "model"), granularity == "day")
+        return _by_model_rows({key: partial.aggregate(quantiles) for key, partial in partials.items()}, quantiles)
+
+    def by_feature(
+        self,
+        tenant_id: str,
+        from_ts: datetime,
+        to_ts: datetime,
+        granularity: Granularity = "total",
+        quantiles: Sequence[float] = (),
+    ) -> list[dict[str, object]]:
+        window = Window.normalize(from_ts, to_ts)
+        partials = self._collect_llm(tenant_id, window, ("feature",), granularity == "day")
+        buckets = {key: partial.aggregate(quantiles) for key, partial in partials.items()}
+        for key, amount in self._collect_revenue(tenant_id, window, by_feature=True, by_day=granularity == "day").items():
+            buckets.setdefault(key, _Aggregate()).revenue_micros += amount
+        return _by_feature_rows(buckets, quantiles)
+
+    def _partitions(self, table: str, tenant_id: str, window: Window) -> list[tuple[date, Path]]:
+        first, last = window.from_ts.date(), (window.to_ts - timedelta(microseconds=1)).date()
+        return [
+            (day, path)
+            for _, day, path in iter_partitions(self.root, table, tenant_id)
+            if first <= day <= last
+        ]
+
+    def _map(self, func: Callable[[date, Path], T], partitions: list[tuple[date, Path]]) -> list[T]:
+        if self.workers <= 1 or len(partitions) <= 1:
+            return [func(day, path) for day, path in partitions]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(lambda item: func(*item), partitions))
+
+    def _collect_llm(
+        self, tenant_id: str, window: Window, group_by: tuple[str, ...], by_day: bool
+    ) -> dict[BucketKey, _Partial]:
+        keys = list(group_by)
+
+        def scan(day: date, path: Path) -> dict[BucketKey, _Partial]:
+            table = _read(path, [*keys, *LLM_READ_COLUMNS], window, day)
+            if table.num_rows == 0:
+                return {}
+            errors = pc.cast(pc.not_equal(pc.utf8_lower(table.column("status")), "success"), pa.int64())
+            table = table.append_column("errors", errors)
+            day_key = day.isoformat() if by_day else ""
+            partials: dict[BucketKey, _Partial] = {}
+            sums = [(column, "sum") for column in LLM_SUM_COLUMNS]
+            for row in _group_rows(table, keys, [*sums, ([], "count_all")]):
+                partial = partials.setdefault((*(str(row[key]) for key in keys), day_key), _Partial())
+                partial.sums["requests"] += int(row["count_all"])
+                for column in LLM_SUM_COLUMNS:
+                    partial.sums[column] += int(row[f"{column}_sum"] or 0)
+            histogram = table.group_by([*keys, "latency_ms"], use_threads=False).aggregate([([], "count_all")])
+            for row in histogram.to_pylist():
+                key = (*(str(row[name]) for name in keys), day_key)
+                partials[key].latencies[int(row["latency_ms"])] += int(row["count_all"])
+            return partials
+
+        merged: dict[BucketKey, _Partial] = {}
+        for partials in self._map(scan, self._partitions(LLM_TABLE, tenant_id, window)):
+            for key, partial in partials.items():
+                merged.setdefault(key, _Partial()).merge(partial)
+        return merged
+
+    def _collect_revenue(
+        self, tenant_id: str, window: Window, by_feature: bool, by_day: bool
+    ) -> dict[BucketKey, int]:
+        keys = ["feature"] if by_feature else []
+
+        def scan(day: date, path: Path) -> dict[BucketKey, int]:
+            table = _read(path, [*keys, "amount_micros"], window, day)
+            if table.num_rows == 0:
+                return {}
+            day_key = day.isoformat() if by_day else ""
+            return {
+                (*(str(row[key]) for key in keys), day_key): int(row["amount_micros_sum"] or 0)
+                for row in _group_rows(table, keys, [("amount_micros", "sum")])
+            }
+
+        totals: Counter[BucketKey] = Counter()
+        for amounts in self._map(scan, self._partitions(REVENUE_TABLE, tenant_id, window)):
+            totals.update(amounts)
+        return dict(totals)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from llm_revenue_analyzer.analytics.service import Window
+from llm_revenue_analyzer.observability.metrics import record_metrics_cache
+
+
+@dataclass(frozen=True, slots=True)
+class MetricsCacheKey:
+    endpoint: str
+    tenant_id: str
+    window: Window
+    granularity: str = "total"
+    params: Hashable = ()
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class MetricsResultCache:
+    """Byte-bounded LRU of ``/metrics/*`` results, invalidated per tenant as events land.
+
+    Windows reaching now or later expire after ``ttl_seconds`` and windows that ended in the past
+    after ``past_ttl_seconds``, so writes made by other processes (late events, repricing, rollup
+    rebuilds, retention) show up within that time. An event ingested by this process evicts every
+    cached window of its tenant that contains its timestamp right away.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, past_ttl_seconds: float = 300.0) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.past_ttl_seconds = past_ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[MetricsCacheKey, _Entry] = OrderedDict()
+        self._by_tenant: dict[str, set[MetricsCacheKey]] = {}
+        self._generations: dict[str, int] = {}
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def generation(self, tenant_id: str) -> int:
+        with self._lock:
+            return self._generations.get(tenant_id, 0)
+
+    def get(self, key: MetricsCacheKey) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        record_metrics_cache(key.endpoint, hit=entry is not None, size_bytes=self._bytes)
+        return None if entry is None else entry.value
+
+    def put(self, key: MetricsCacheKey, value: Any, generation: int, now: datetime | None = None) -> None:
+        """Cache ``value`` unless the tenant was invalidated since ``generation`` was read."""
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        current = key.window.to_ts > (now or datetime.now(UTC))
+        expires_at = time.monotonic() + (self.ttl_seconds if current else self.past_ttl_seconds)
+        with self._lock:
+            if self._generations.get(key.tenant_id, 0) != generation:
+                return
+            self._remove(key)
+            self._entries[key] = _Entry(value, size, expires_at)
+            self._by_tenant.setdefault(key.tenant_id, set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tenant_id: str, timestamps: Iterable[datetime]) -> None:
+        points = [ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC) for ts in timestamps]
+        with self._lock:
+            self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+            stale = [
+                key
+                for key in self._by_tenant.get(tenant_id, ())
+                if any(key.window.from_ts <= ts < key.window.to_ts for ts in points)
+            ]
+            for key in stale:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for tenant_id in self._by_tenant:
+                self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+            self._entries.clear()
+            self._by_tenant.clear()
+            self._bytes = 0
+
+    def _remove(self, key: MetricsCacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        keys = self._by_tenant.get(key.tenant_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_tenant[key.tenant_id]
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
-from math import ceil
-from statistics import mean
-from typing import Any, Literal
+from typing import Any, Literal, Protocol
 
 from sqlalchemy.orm import Session
 
-from llm_revenue_analyzer.store.repos import LLMEventRepo, RevenueEventRepo
+from llm_revenue_analyzer.core.money import micros_to_float, to_micros
+from llm_revenue_analyzer.core.sketch import LatencySketch, nearest_rank
+from llm_revenue_analyzer.store.repos import (
+    LLM_ANALYTICS_COLUMNS,
+    LLMEventRepo,
+    RevenueEventRepo,
+    RollupRepo,
+    TenantScope,
+    hour_ceil,
+    hour_floor,
+    is_error_status,
+)
 
 Granularity = Literal["total", "day"]
+AnalyticsEngine = Literal["python", "rollup", "sql"]
+BucketKey = tuple[str, ...]
+SummaryOrder = Literal["cost_usd", "margin_usd", "error_rate"]
 
 
 @dataclass(frozen=True)
@@ -34,63 +48,280 @@ def _to_utc(value: datetime) -> datetime:
     return value.astimezone(UTC)
 
 
-def _decimal(value: Any) -> Decimal:
-    if isinstance(value, Decimal):
-        return value
-    return Decimal(str(value))
+def _quantile_key(q: float) -> str:
+    return f"p{q * 100:g}"
 
 
-def _quantize_money(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.000001"))
+def _exact_quantiles(values: list[int], quantiles: Iterable[float]) -> dict[float, float | None]:
+    ordered = sorted(values)
+    return {q: float(ordered[nearest_rank(len(ordered), q) - 1]) if ordered else None for q in quantiles}
 
 
-def _p95(values: list[int]) -> float | None:
-    if not values:
-        return None
-    ordered = sorted(values)
-    index = max(0, ceil(0.95 * len(ordered)) - 1)
-    return float(ordered[index])
+def _day_key(value: datetime) -> str:
+    return _to_utc(value).date().isoformat()
+
+
+def _day_value(value: datetime | date | str) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+class _Totals(Protocol):
+    requests: int
+    errors: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost_micros: int
+    latency_sum_ms: int
+
+
+@dataclass
+class _Aggregate:
+    requests: int = 0
+    errors: int = 0
+    tokens: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_micros: int = 0
+    revenue_micros: int = 0
+    latency_sum_ms: int = 0
+    latencies: list[int] = field(default_factory=list)
+    sketch: LatencySketch | None = None
+    latency_quantiles: dict[float, float | None] = field(default_factory=dict)
+
+    def add_event(self, row: Sequence[Any]) -> None:
+        """Add one ``LLMEventRepo.window_rows`` row (``LLM_ANALYTICS_COLUMNS`` order)."""
+        *_, status, prompt_tokens, completion_tokens, total_tokens, cost_micros, latency_ms = row
+        self.requests += 1
+        self.errors += int(is_error_status(status))
+        self.tokens += total_tokens
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.cost_micros += cost_micros
+        self.latency_sum_ms += latency_ms
+        self.latencies.append(latency_ms)
+
+    def add_totals(self, totals: _Totals) -> None:
+        self.requests += int(totals.requests)
+        self.errors += int(totals.errors)
+        self.tokens += int(totals.total_tokens)
+        self.prompt_tokens += int(totals.prompt_tokens)
+        self.completion_tokens += int(totals.completion_tokens)
+        self.cost_micros += int(totals.cost_micros)
+        self.latency_sum_ms += int(totals.latency_sum_ms)
+
+    def merge(self, other: _Aggregate) -> None:
+        self.requests += other.requests
+        self.errors += other.errors
+        self.tokens += other.tokens
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost_micros += other.cost_micros
+        self.revenue_micros += other.revenue_micros
+        self.latency_sum_ms += other.latency_sum_ms
+        self.latencies.extend(other.latencies)
+        if other.sketch is not None:
+            self.sketch = (self.sketch or LatencySketch()).merge(other.sketch)
+
+    def quantile_values(self, quantiles: Iterable[float]) -> dict[float, float | None]:
+        if self.sketch is not None:
+            sketch = self.sketch.copy() if self.latencies else self.sketch
+            for latency in self.latencies:
+                sketch.add(latency)
+            return {q: sketch.quantile(q) for q in quantiles}
+        if self.latencies:
+            return _exact_quantiles(self.latencies, quantiles)
+        return {q: self.latency_quantiles.get(q) for q in quantiles}
+
+    def metrics(self, quantiles: Sequence[float] = ()) -> dict[str, Any]:
+        values = self.quantile_values({0.95, *quantiles})
+        result: dict[str, Any] = {
+            "requests": self.requests,
+            "tokens": self.tokens,
+            "cost_usd": micros_to_float(self.cost_micros),
+            "error_rate": (self.errors / self.requests) if self.requests else 0.0,
+            "avg_latency_ms": (self.latency_sum_ms / self.requests) if self.requests else None,
+            "p95_latency_ms": values[0.95],
+        }
+        if quantiles:
+            result["latency_quantiles_ms"] = {_quantile_key(q): values[q] for q in quantiles}
+        return result
+
+    def revenue_metrics(self) -> dict[str, Any]:
+        return {
+            "revenue_usd": micros_to_float(self.revenue_micros),
+            "margin_usd": micros_to_float(self.revenue_micros - self.cost_micros),
+        }
+
+
+def _bucket_key(source: Any, timestamp: datetime, group_by: tuple[str, ...], by_day: bool) -> BucketKey:
+    return (*(str(getattr(source, name)) for name in group_by), _day_key(timestamp) if by_day else "")
+
+
+def _add_event_rows(
+    buckets: defaultdict[BucketKey, _Aggregate],
+    rows: Iterable[Sequence[Any]],
+    group_by: tuple[str, ...],
+    by_day: bool,
+) -> None:
+    positions = [LLM_ANALYTICS_COLUMNS.index(name) for name in group_by]
+    stamp = LLM_ANALYTICS_COLUMNS.index("timestamp")
+    for row in rows:
+        buckets[(*(str(row[i]) for i in positions), _day_key(row[stamp]) if by_day else "")].add_event(row)
+
+
+def _merged(aggregates: Iterable[_Aggregate]) -> _Aggregate:
+    total = _Aggregate()
+    for aggregate in aggregates:
+        total.merge(aggregate)
+        # Window quantiles from the sql engine sit on the one day bucket that holds their rank.
+        total.latency_quantiles.update(aggregate.latency_quantiles)
+    return total
+
+
+def _summary_result(
+    tenant_id: str,
+    window: Window,
+    total: _Aggregate,
+    days: dict[BucketKey, _Aggregate],
+    quantiles: Sequence[float],
+) -> dict[str, object]:
+    metrics = total.metrics(quantiles)
+    return {
+        "tenant_id": tenant_id,
+        "from": window.from_ts,
+        "to": window.to_ts,
+        "requests": total.requests,
+        "tokens": total.tokens,
+        "prompt_tokens": total.prompt_tokens,
+        "completion_tokens": total.completion_tokens,
+        "cost_usd": metrics["cost_usd"],
+        **total.revenue_metrics(),
+        "error_rate": metrics["error_rate"],
+        "avg_latency_ms": metrics["avg_latency_ms"],
+        "p95_latency_ms": metrics["p95_latency_ms"],
+        **({"latency_quantiles_ms": metrics["latency_quantiles_ms"]} if quantiles else {}),
+        "daily": [
+            {"day": day, "cost_usd": micros_to_float(days[(day,)].cost_micros)}
+            for (day,) in sorted(days)
+        ],
+    }
+
+
+def _order_value(aggregate: _Aggregate, order_by: SummaryOrder) -> int | float:
+    if order_by == "margin_usd":
+        return aggregate.revenue_micros - aggregate.cost_micros
+    if order_by == "error_rate":
+        return aggregate.errors / aggregate.requests if aggregate.requests else 0.0
+    return aggregate.cost_micros
+
+
+def _by_model_rows(buckets: dict[BucketKey, _Aggregate], quantiles: Sequence[float]) -> list[dict[str, Any]]:
+    result = [
+        {"provider": provider, "model": model, "day": day or None, **aggregate.metrics(quantiles)}
+        for (provider, model, day), aggregate in buckets.items()
+    ]
+    result.sort(key=lambda row: ((row.get("day") or ""), -float(row["cost_usd"]), str(row["model"])))
+    return result
+
+
+def _by_feature_rows(buckets: dict[BucketKey, _Aggregate], quantiles: Sequence[float]) -> list[dict[str, object]]:
+    result: list[dict[str, Any]] = [
+        {"feature": feature, "day": day or None, **aggregate.metrics(quantiles), **aggregate.revenue_metrics()}
+        for (feature, day), aggregate in buckets.items()
+    ]
+    result.sort(key=lambda row: ((row.get("day") or ""), -float(row["cost_usd"]), str(row["feature"])))
+    return result
+
+
+def _split_window(
+    window: Window, horizon: datetime | None = None
+) -> tuple[list[tuple[datetime, datetime]], tuple[datetime, datetime] | None]:
+    inner_start, inner_end = hour_ceil(window.from_ts), hour_floor(window.to_ts)
+    # Raw rows before the retention horizon are gone; widen those edges to whole rollup hours.
+    if horizon is not None and window.from_ts < horizon:
+        inner_start = hour_floor(window.from_ts)
+        if window.to_ts <= horizon:
+            inner_end = hour_ceil(window.to_ts)
+    if inner_start >= inner_end:
+        return [(window.from_ts, window.to_ts)], None
+    edges = [(start, end) for start, end in ((window.from_ts, inner_start), (inner_end, window.to_ts)) if start < end]
+    return edges, (inner_start, inner_end)
 
 
 class AnalyticsService:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, engine: AnalyticsEngine = "python") -> None:
         self.session = session
+        self.engine = engine
         self.llm_repo = LLMEventRepo(session)
         self.revenue_repo = RevenueEventRepo(session)
+        self.rollup_repo = RollupRepo(session)
+        self._horizon: datetime | None = None
+        self._horizon_loaded = False
+
+    @property
+    def raw_horizon(self) -> datetime | None:
+        if not self._horizon_loaded:
+            self._horizon = self.llm_repo.raw_horizon()
+            self._horizon_loaded = True
+        return self._horizon
+
+    def _engine_for(self, window: Window) -> AnalyticsEngine:
+        """Windows reaching before the retention horizon can only be answered from rollups."""
+        horizon = self.raw_horizon
+        if self.engine != "rollup" and horizon is not None and window.from_ts < horizon:
+            return "rollup"
+        return self.engine
 
-    def summary(self, tenant_id: str, from_ts: datetime, to_ts: datetime) -> dict[str, object]:
+    def summary(
+        self,
+        tenant_id: str,
+        from_ts: datetime,
+        to_ts: datetime,
+        quantiles: Sequence[float] = (),
+    ) -> dict[str, object]:
         window = Window.normalize(from_ts, to_ts)
-        llm_events = self.llm_repo.list_for_window(tenant_id, window.from_ts, window.to_ts)
-        revenue_events = self.revenue_repo.list_for_window(tenant_id, window.from_ts, window.to_ts)
+        return self._summary_aggregated(self._engine_for(window), tenant_id, window, quantiles)
 
-        requests = len(llm_events)
-        errors = sum(1 for e in llm_events if e.status.lower() != "success")
-        total_cost = sum((e.cost_usd for e in llm_events), Decimal("0"))
-        total_revenue = sum((e.amount_usd for e in revenue_events), Decimal("0"))
-        latency_values = [e.latency_ms for e in llm_events]
+    def summaries(
+        self,
+        tenant_ids: Sequence[str] | None,
+        from_ts: datetime,
+        to_ts: datetime,
+        quantiles: Sequence[float] = (),
+        order_by: SummaryOrder = "cost_usd",
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[dict[str, object]]]:
+        """Summaries for many tenants (``None`` = every tenant active in the window) in one grouped pass.
 
-        return {
-            "tenant_id": tenant_id,
-            "from": window.from_ts,
-            "to": window.to_ts,
-            "requests": requests,
-            "tokens": sum(e.total_tokens for e in llm_events),
-            "prompt_tokens": sum(e.prompt_tokens for e in llm_events),
-            "completion_tokens": sum(e.completion_tokens for e in llm_events),
-            "cost_usd": float(_quantize_money(total_cost)),
-            "revenue_usd": float(_quantize_money(total_revenue)),
-            "margin_usd": float(_quantize_money(total_revenue - total_cost)),
-            "error_rate": (errors / requests) if requests else 0.0,
-            "avg_latency_ms": float(mean(latency_values)) if latency_values else None,
-            "p95_latency_ms": _p95(latency_values),
-            "daily": [
-                {
-                    "day": day.isoformat(),
-                    "cost_usd": float(_quantize_money(cost)),
-                }
-                for day, cost in self.llm_repo.list_daily_costs(tenant_id, window.from_ts, window.to_ts)
-            ],
-        }
+        Returns the number of tenants and the requested page of summaries, ordered by ``order_by``.
+        """
+        window = Window.normalize(from_ts, to_ts)
+        engine = self._engine_for(window)
+        scope: TenantScope = list(dict.fromkeys(tenant_ids)) if tenant_ids is not None else None
+        buckets = self._collect(engine, scope, window, ("tenant_id",), True, quantiles, window_quantiles=True)
+        days: defaultdict[str, dict[BucketKey, _Aggregate]] = defaultdict(dict)
+        for (tenant_id, day), aggregate in buckets.items():
+            days[tenant_id][(day,)] = aggregate
+        totals = {tenant_id: _merged(tenant_days.values()) for tenant_id, tenant_days in days.items()}
+        for tenant_id, revenue in self.revenue_repo.sums_by_tenant(scope, window.from_ts, window.to_ts).items():
+            totals.setdefault(tenant_id, _Aggregate()).revenue_micros = to_micros(revenue)
+        for tenant_id in scope or ():
+            totals.setdefault(tenant_id, _Aggregate())
+
+        ordered = sorted(totals, key=lambda tenant_id: tenant_id)
+        ordered.sort(key=lambda tenant_id: _order_value(totals[tenant_id], order_by), reverse=descending)
+        page = ordered[offset : offset + limit]
+        return len(ordered), [
+            _summary_result(tenant_id, window, totals[tenant_id], days.get(tenant_id, {}), quantiles)
+            for tenant_id in page
+        ]
 
     def by_model(
         self,
@@ -98,49 +329,10 @@ class AnalyticsService:
         from_ts: datetime,
         to_ts: datetime,
         granularity: Granularity = "total",
+        quantiles: Sequence[float] = (),
     ) -> list[dict[str, Any]]:
         window = Window.normalize(from_ts, to_ts)
-        llm_events = self.llm_repo.list_for_window(tenant_id, window.from_ts, window.to_ts)
-        buckets: dict[tuple[str, ...], dict[str, Any]] = {}
-        for e in llm_events:
-            day_key = e.timestamp.astimezone(UTC).date().isoformat() if granularity == "day" else None
-            key = (e.provider, e.model, day_key or "")
-            if key not in buckets:
-                buckets[key] = {
-                    "provider": e.provider,
-                    "model": e.model,
-                    "day": day_key,
-                    "requests": 0,
-                    "errors": 0,
-                    "tokens": 0,
-                    "cost_usd": Decimal("0"),
-                    "latencies": [],
-                }
-            b = buckets[key]
-            b["requests"] = int(b["requests"]) + 1
-            b["errors"] = int(b["errors"]) + (0 if e.status.lower() == "success" else 1)
-            b["tokens"] = int(b["tokens"]) + e.total_tokens
-            b["cost_usd"] = _decimal(b["cost_usd"]) + e.cost_usd
-            cast_latencies = b["latencies"]
-            if isinstance(cast_latencies, list):
-                cast_latencies.append(e.latency_ms)
-
-        result: list[dict[str, Any]] = []
-        for bucket in buckets.values():
-            latencies = bucket.pop("latencies")
-            errors = int(bucket.pop("errors"))
-            requests = int(bucket["requests"])
-            result.append(
-                {
-                    **bucket,
-                    "cost_usd": float(_quantize_money(_decimal(bucket["cost_usd"]))),
-                    "error_rate": (errors / requests) if requests else 0.0,
-                    "avg_latency_ms": float(mean(latencies)) if latencies else None,
-                    "p95_latency_ms": _p95(latencies),
-                }
-            )
-        result.sort(key=lambda row: ((row.get("day") or ""), -float(row["cost_usd"]), str(row["model"])))
-        return result
+        return self._by_model_aggregated(self._engine_for(window), tenant_id, window, granularity, quantiles)
 
     def by_feature(
         self,
@@ -148,72 +340,144 @@ class AnalyticsService:
         from_ts: datetime,
         to_ts: datetime,
         granularity: Granularity = "total",
+        quantiles: Sequence[float] = (),
     ) -> list[dict[str, object]]:
         window = Window.normalize(from_ts, to_ts)
-        llm_events = self.llm_repo.list_for_window(tenant_id, window.from_ts, window.to_ts)
-        revenue_events = self.revenue_repo.list_for_window(tenant_id, window.from_ts, window.to_ts)
-
-        buckets: dict[tuple[str, ...], dict[str, Any]] = {}
-
-        def ensure_bucket(feature: str, day: str | None) -> dict[str, Any]:
-            key = (feature, day or "")
-            if key not in buckets:
-                buckets[key] = {
-                    "feature": feature,
-                    "day": day,
-                    "requests": 0,
-                    "errors": 0,
-                    "tokens": 0,
-                    "cost_usd": Decimal("0"),
-                    "revenue_usd": Decimal("0"),
-                    "latencies": [],
-                }
-            return buckets[key]
-
-        for e in llm_events:
-            day_key = e.timestamp.astimezone(UTC).date().isoformat() if granularity == "day" else None
-            b = ensure_bucket(e.feature, day_key)
-            b["requests"] = int(b["requests"]) + 1
-            b["errors"] = int(b["errors"]) + (0 if e.status.lower() == "success" else 1)
-            b["tokens"] = int(b["tokens"]) + e.total_tokens
-            b["cost_usd"] = _decimal(b["cost_usd"]) + e.cost_usd
-            latencies = b["latencies"]
-            if isinstance(latencies, list):
-                latencies.append(e.latency_ms)
-
-        for revenue_event in revenue_events:
-            feature = str((revenue_event.metadata_json or {}).get("feature", "unattributed"))
-            day_key = (
-                revenue_event.timestamp.astimezone(UTC).date().isoformat()
-                if granularity == "day"
-                else None
-            )
-            b = ensure_bucket(feature, day_key)
-            b["revenue_usd"] = _decimal(b["revenue_usd"]) + revenue_event.amount_usd
-
-        result: list[dict[str, Any]] = []
-        for bucket in buckets.values():
-            latencies = bucket.pop("latencies")
-            errors = int(bucket.pop("errors"))
-            requests = int(bucket["requests"])
-            cost = _decimal(bucket["cost_usd"])
-            revenue = _decimal(bucket["revenue_usd"])
-            result.append(
-                {
-                    **bucket,
-                    "cost_usd": float(_quantize_money(cost)),
-                    "revenue_usd": float(_quantize_money(revenue)),
-                    "margin_usd": float(_quantize_money(revenue - cost)),
-                    "error_rate": (errors / requests) if requests else 0.0,
-                    "avg_latency_ms": float(mean(latencies)) if latencies else None,
-                    "p95_latency_ms": _p95(latencies),
-                }
-            )
-        result.sort(key=lambda row: ((row.get("day") or ""), -float(row["cost_usd"]), str(row["feature"])))
-        return result
+        return self._by_feature_aggregated(self._engine_for(window), tenant_id, window, granularity, quantiles)
 
     def cost_history(self, tenant_id: str, days: int, until: datetime | None = None) -> list[tuple[date, Decimal]]:
         anchor = _to_utc(until or datetime.now(UTC))
         start = (anchor - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
         end = (anchor + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         return self.llm_repo.list_daily_costs(tenant_id, start, end)
+
+    def _collect(
+        self,
+        engine: AnalyticsEngine,
+        tenant_id: TenantScope,
+        window: Window,
+        group_by: tuple[str, ...],
+        by_day: bool,
+        quantiles: Sequence[float] = (),
+        window_quantiles: bool = False,
+    ) -> dict[BucketKey, _Aggregate]:
+        """Buckets per ``group_by`` (and day).
+
+        With ``window_quantiles`` the sql engine ranks latencies over the whole window of each
+        ``group_by`` bucket rather than per day, so merging the day buckets yields the window values.
+        """
+        if engine == "sql":
+            return self._collect_sql(tenant_id, window, group_by, by_day, quantiles, window_quantiles)
+        if engine == "python":
+            return self._collect_raw(tenant_id, window, group_by, by_day)
+        return self._collect_rollup(tenant_id, window, group_by, by_day)
+
+    def _collect_raw(
+        self,
+        tenant_id: TenantScope,
+        window: Window,
+        group_by: tuple[str, ...],
+        by_day: bool,
+    ) -> dict[BucketKey, _Aggregate]:
+        buckets: defaultdict[BucketKey, _Aggregate] = defaultdict(_Aggregate)
+        _add_event_rows(buckets, self.llm_repo.window_rows(tenant_id, window.from_ts, window.to_ts), group_by, by_day)
+        return dict(buckets)
+
+    def _collect_rollup(
+        self,
+        tenant_id: TenantScope,
+        window: Window,
+        group_by: tuple[str, ...],
+        by_day: bool,
+    ) -> dict[BucketKey, _Aggregate]:
+        buckets: defaultdict[BucketKey, _Aggregate] = defaultdict(_Aggregate)
+        edges, inner = _split_window(window, self.raw_horizon)
+        for start, end in edges:
+            _add_event_rows(buckets, self.llm_repo.window_rows(tenant_id, start, end), group_by, by_day)
+        if inner is not None:
+            for rollup in self.rollup_repo.window_rows(tenant_id, *inner):
+                buckets[_bucket_key(rollup, rollup.bucket_start, group_by, by_day)].add_totals(rollup)
+            for row in self.rollup_repo.latency_bins(tenant_id, *inner, group_by=group_by, by_day=by_day):
+                key = (*(str(getattr(row, name)) for name in group_by), _day_value(row.day) if by_day else "")
+                bucket = buckets[key]
+                if bucket.sketch is None:
+                    bucket.sketch = LatencySketch()
+                bucket.sketch.add_bin(row.bin, int(row.bin_count))
+        return dict(buckets)
+
+    def _collect_sql(
+        self,
+        tenant_id: TenantScope,
+        window: Window,
+        group_by: tuple[str, ...],
+        by_day: bool,
+        quantiles: Sequence[float] = (),
+        window_quantiles: bool = False,
+    ) -> dict[BucketKey, _Aggregate]:
+        percentiles = sorted({0.95, *quantiles})
+        rows = self.llm_repo.aggregate_window(
+            tenant_id,
+            window.from_ts,
+            window.to_ts,
+            group_by=group_by,
+            by_day=by_day,
+            percentiles=percentiles,
+            percentiles_by_day=not window_quantiles,
+        )
+        buckets: dict[BucketKey, _Aggregate] = {}
+        for row in rows:
+            aggregate = _Aggregate()
+            aggregate.add_totals(row)
+            values = ((q, getattr(row, f"p_{i}")) for i, q in enumerate(percentiles))
+            aggregate.latency_quantiles = {q: float(value) for q, value in values if value is not None}
+            key = (*(str(getattr(row, name)) for name in group_by), _day_value(row.day) if by_day else "")
+            buckets[key] = aggregate
+        return buckets
+
+    def _add_feature_revenue(
+        self,
+        buckets: dict[BucketKey, _Aggregate],
+        tenant_id: str,
+        window: Window,
+        granularity: Granularity,
+    ) -> None:
+        for feature, day, amount_usd in self.revenue_repo.sum_by_feature(
+            tenant_id, window.from_ts, window.to_ts, by_day=granularity == "day"
+        ):
+            day_key = day.isoformat() if day is not None else ""
+            buckets.setdefault((feature, day_key), _Aggregate()).revenue_micros += to_micros(amount_usd)
+
+    def _summary_aggregated(
+        self,
+        engine: AnalyticsEngine,
+        tenant_id: str,
+        window: Window,
+        quantiles: Sequence[float],
+    ) -> dict[str, object]:
+        days = self._collect(engine, tenant_id, window, (), True, quantiles, window_quantiles=True)
+        total = _merged(days.values())
+        total.revenue_micros = to_micros(self.revenue_repo.sum_for_window(tenant_id, window.from_ts, window.to_ts))
+        return _summary_result(tenant_id, window, total, days, quantiles)
+
+    def _by_model_aggregated(
+        self,
+        engine: AnalyticsEngine,
+        tenant_id: str,
+        window: Window,
+        granularity: Granularity,
+        quantiles: Sequence[float],
+    ) -> list[dict[str, Any]]:
+        buckets = self._collect(engine, tenant_id, window, ("provider", "model"), granularity == "day", quantiles)
+        return _by_model_rows(buckets, quantiles)
+
+    def _by_feature_aggregated(
+        self,
+        engine: AnalyticsEngine,
+        tenant_id: str,
+        window: Window,
+        granularity: Granularity,
+        quantiles: Sequence[float],
+    ) -> list[dict[str, object]]:
+        buckets = self._collect(engine, tenant_id, window, ("feature",), granularity == "day", quantiles)
+        self._add_feature_revenue(buckets, tenant_id, window, granularity)
+        return _by_feature_rows(buckets, quantiles)
@@ -1,22 +1,168 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from llm_revenue_analyzer.analytics import AnomalyQueue, DailyCostSeries, MetricsResultCache
+from llm_revenue_analyzer.api.ingest_buffer import IngestBuffer
 from llm_revenue_analyzer.api.middleware import request_id_middleware
 from llm_revenue_analyzer.api.routes_budgets import router as budgets_router
 from llm_revenue_analyzer.api.routes_events import router as events_router
+from llm_revenue_analyzer.api.routes_events import write_buffered_llm_events
+from llm_revenue_analyzer.api.routes_export import router as export_router
 from llm_revenue_analyzer.api.routes_metrics import router as analytics_router
 from llm_revenue_analyzer.api.routes_system import router as system_router
+from llm_revenue_analyzer.api.schemas import LLMEventIn
+from llm_revenue_analyzer.budgets import SpendLedger
 from llm_revenue_analyzer.core.logging import configure_logging
 from llm_revenue_analyzer.core.settings import Settings, get_settings
+from llm_revenue_analyzer.core.tasks import PeriodicTask
 from llm_revenue_analyzer.observability.metrics import instrument_request
+from llm_revenue_analyzer.pricing import CostCalculator, PricingCatalogWatcher
+from llm_revenue_analyzer.store.db import dispose_async_engine, get_engine, get_session_factory
+from llm_revenue_analyzer.store.dedup import RecentRequestCache
+from llm_revenue_analyzer.store.partitions import PartitionManager
+from llm_revenue_analyzer.store.retention import RetentionJob
+from llm_revenue_analyzer.store.rollup_compactor import RollupCompactor
+
+
+def _background_tasks(app: FastAPI, settings: Settings) -> list[PeriodicTask]:
+    tasks: list[PeriodicTask] = []
+    watcher: PricingCatalogWatcher = app.state.pricing_watcher
+    if settings.pricing_reload_seconds > 0:
+        tasks.append(PeriodicTask("pricing-reload", settings.pricing_reload_seconds, watcher.refresh))
+
+    ledger: SpendLedger | None = app.state.spend_ledger
+    if ledger is not None and settings.budget_ledger_reconcile_seconds > 0:
+
+        def reconcile_ledger() -> None:
+            with get_session_factory(settings)() as session:
+                ledger.reconcile(session)
+
+        tasks.append(PeriodicTask("spend-ledger-reconcile", settings.budget_ledger_reconcile_seconds, reconcile_ledger))
+
+    series: DailyCostSeries | None = app.state.daily_cost_series
+    if series is not None and settings.anomaly_series_reconcile_seconds > 0:
+
+        def reconcile_series() -> None:
+            with get_session_factory(settings)() as session:
+                series.reconcile(session)
+
+        tasks.append(PeriodicTask("daily-cost-reconcile", settings.anomaly_series_reconcile_seconds, reconcile_series))
+
+    if settings.is_postgres and settings.llm_partition_maintenance_seconds > 0:
+        partitions = PartitionManager.from_settings(get_engine(settings), settings)
+        tasks.append(PeriodicTask("llm-partitions", settings.llm_partition_maintenance_seconds, partitions.run))
+
+    if settings.llm_raw_retention_days > 0 and settings.llm_raw_retention_seconds > 0:
+        retention = RetentionJob.from_settings(settings)
+        tasks.append(PeriodicTask("llm-retention", settings.llm_raw_retention_seconds, retention.run))
+
+    compactor: RollupCompactor | None = app.state.rollup_compactor
+    if compactor is not None:
+        tasks.append(PeriodicTask("rollup-compactor", settings.rollup_compact_seconds, compactor.run, run_on_stop=True))
+
+    queue: AnomalyQueue | None = app.state.anomaly_queue
+    if queue is not None:
+
+        def run_anomaly_checks() -> None:
+            with get_session_factory(settings)() as session:
+                queue.process(session, settings.anomaly_multiplier, settings.anomaly_lookback_days, series=series)
+
+        tasks.append(
+            PeriodicTask(
+                "anomaly-checks",
+                settings.anomaly_check_interval_seconds,
+                run_anomaly_checks,
+                run_on_stop=True,
+            )
+        )
+    return tasks
+
+
+def _ingest_buffer(app: FastAPI, settings: Settings) -> IngestBuffer | None:
+    if settings.ingest_mode != "buffered":
+        return None
+    session_factory = get_session_factory(settings)
+
+    def flush(payloads: list[LLMEventIn]) -> None:
+        with session_factory() as session:
+            write_buffered_llm_events(
+                session,
+                payloads,
+                CostCalculator(app.state.pricing_watcher.current),
+                settings,
+                app.state.spend_ledger,
+                app.state.anomaly_queue,
+                app.state.daily_cost_series,
+                app.state.recent_requests,
+                app.state.metrics_cache,
+                app.state.rollup_compactor,
+            )
+
+    return IngestBuffer(
+        flush,
+        capacity=settings.ingest_buffer_capacity,
+        flush_events=settings.ingest_buffer_flush_events,
+        flush_interval_seconds=settings.ingest_buffer_flush_ms / 1000,
+    )
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
     active_settings = settings or get_settings()
     configure_logging(active_settings.log_level)
 
-    app = FastAPI(title=active_settings.app_name, version=active_settings.version)
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        _ = app.state.pricing_watcher.current
+        tasks = _background_tasks(app, active_settings)
+        buffer: IngestBuffer | None = app.state.ingest_buffer
+        for task in tasks:
+            task.start()
+        if buffer is not None:
+            buffer.start()
+        try:
+            yield
+        finally:
+            # Drain buffered events first so their anomaly checks still reach the running queue.
+            if buffer is not None:
+                buffer.stop()
+            for task in tasks:
+                task.stop()
+            if active_settings.db_mode == "async":
+                await dispose_async_engine()
+
+    app = FastAPI(title=active_settings.app_name, version=active_settings.version, lifespan=lifespan)
+    app.state.settings = active_settings
+    app.state.pricing_watcher = PricingCatalogWatcher(active_settings.pricing_path)
+    app.state.spend_ledger = SpendLedger(active_settings.budget_ledger_hard_limit_margin) if active_settings.budget_ledger_enabled else None
+    app.state.anomaly_queue = AnomalyQueue() if active_settings.anomaly_check_interval_seconds > 0 else None
+    app.state.daily_cost_series = (
+        DailyCostSeries(active_settings.anomaly_lookback_days + 1) if active_settings.anomaly_series_enabled else None
+    )
+    app.state.recent_requests = (
+        RecentRequestCache(active_settings.ingest_dedup_cache_size) if active_settings.ingest_dedup_cache_size > 0 else None
+    )
+    app.state.metrics_cache = (
+        MetricsResultCache(
+            active_settings.metrics_cache_max_bytes,
+            active_settings.metrics_cache_ttl_seconds,
+            active_settings.metrics_cache_past_ttl_seconds,
+        )
+        if active_settings.metrics_cache_max_bytes > 0
+        else None
+    )
+    app.state.rollup_compactor = (
+        RollupCompactor(
+            active_settings,
+            on_rebuilt=app.state.metrics_cache.invalidate if app.state.metrics_cache is not None else None,
+        )
+        if active_settings.rollup_mode == "deferred"
+        else None
+    )
+    app.state.ingest_buffer = _ingest_buffer(app, active_settings)
     app.middleware("http")(request_id_middleware)
     app.middleware("http")(instrument_request)
 
@@ -26,6 +172,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
 
     app.include_router(system_router)
     app.include_router(events_router)
+    app.include_router(export_router)
     app.include_router(budgets_router)
     app.include_router(analytics_router)
     return app
@@ -1,14 +1,30 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Callable
 from functools import lru_cache
 from pathlib import Path
+from typing import Concatenate, ParamSpec, TypeVar
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from llm_revenue_analyzer.analytics import AnomalyQueue, DailyCostSeries, MetricsResultCache
+from llm_revenue_analyzer.api.ingest_buffer import IngestBuffer
+from llm_revenue_analyzer.budgets import SpendLedger
 from llm_revenue_analyzer.core.settings import Settings, get_settings
-from llm_revenue_analyzer.pricing import CostCalculator, PricingCatalog
-from llm_revenue_analyzer.store.db import get_db_session
+from llm_revenue_analyzer.pricing import CostCalculator, PricingCatalog, PricingCatalogWatcher
+from llm_revenue_analyzer.store.db import (
+    get_async_session_factory,
+    get_db_session,
+    get_session_factory,
+)
+from llm_revenue_analyzer.store.dedup import RecentRequestCache
+from llm_revenue_analyzer.store.rollup_compactor import RollupCompactor
+
+P = ParamSpec("P")
+T = TypeVar("T")
 
 
 @lru_cache(maxsize=4)
@@ -16,7 +32,10 @@ def _load_pricing_catalog(pricing_path: str) -> PricingCatalog:
     return PricingCatalog.from_yaml(Path(pricing_path))
 
 
-def get_pricing_catalog(settings: Settings = Depends(get_settings)) -> PricingCatalog:
+def get_pricing_catalog(request: Request, settings: Settings = Depends(get_settings)) -> PricingCatalog:
+    watcher: PricingCatalogWatcher | None = getattr(request.app.state, "pricing_watcher", None)
+    if watcher is not None:
+        return watcher.current
     return _load_pricing_catalog(str(settings.pricing_path))
 
 
@@ -26,3 +45,98 @@ def get_cost_calculator(catalog: PricingCatalog = Depends(get_pricing_catalog))
 
 def get_session(session: Session = Depends(get_db_session)) -> Session:
     return session
+
+
+class SessionRunner:
+    """Runs sync repo/service code for a request.
+
+    ``run`` uses a worker thread in sync mode and the AsyncSession greenlet in async mode, where
+    every statement awaits the async driver on the event loop; it suits handlers that mostly wait
+    on the database. ``run_cpu`` is for handlers that spend their time in Python (analytics
+    aggregation, batch pricing): it always uses a worker thread, with its own sync session in
+    async mode, so the event loop keeps serving other requests meanwhile.
+    """
+
+    def __init__(self, session: Session | AsyncSession, settings: Settings) -> None:
+        self.session = session
+        self.settings = settings
+
+    async def run(self, func: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await self.session.run_sync(func, *args, **kwargs)
+        return await run_in_threadpool(func, self.session, *args, **kwargs)
+
+    async def run_cpu(self, func: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if isinstance(self.session, AsyncSession):
+            return await ScopedSessionRunner(self.settings).run_threaded(func, *args, **kwargs)
+        return await run_in_threadpool(func, self.session, *args, **kwargs)
+
+
+class ScopedSessionRunner:
+    """Opens a short-lived session per ``run`` call, for work that outlives the request dependencies."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+
+    async def run(self, func: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs) -> T:
+        if self.settings.db_mode == "async":
+            async with get_async_session_factory(self.settings)() as async_session:
+                return await async_session.run_sync(func, *args, **kwargs)
+        return await self.run_threaded(func, *args, **kwargs)
+
+    async def run_threaded(self, func: Callable[Concatenate[Session, P], T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run on a worker thread with a sync session, whatever the DB mode."""
+
+        def call() -> T:
+            with get_session_factory(self.settings)() as session:
+                return func(session, *args, **kwargs)
+
+        return await run_in_threadpool(call)
+
+
+async def get_db(request: Request) -> AsyncIterator[SessionRunner]:
+    settings: Settings = request.app.state.settings
+    if settings.db_mode == "async":
+        async with get_async_session_factory(settings)() as async_session:
+            yield SessionRunner(async_session, settings)
+        return
+    session = get_session_factory(settings)()
+    try:
+        yield SessionRunner(session, settings)
+    finally:
+        await run_in_threadpool(session.close)
+
+
+def get_spend_ledger(request: Request) -> SpendLedger | None:
+    ledger: SpendLedger | None = getattr(request.app.state, "spend_ledger", None)
+    return ledger
+
+
+def get_anomaly_queue(request: Request) -> AnomalyQueue | None:
+    queue: AnomalyQueue | None = getattr(request.app.state, "anomaly_queue", None)
+    return queue
+
+
+def get_daily_cost_series(request: Request) -> DailyCostSeries | None:
+    series: DailyCostSeries | None = getattr(request.app.state, "daily_cost_series", None)
+    return series
+
+
+def get_recent_requests(request: Request) -> RecentRequestCache | None:
+    recent: RecentRequestCache | None = getattr(request.app.state, "recent_requests", None)
+    return recent
+
+
+def get_ingest_buffer(request: Request) -> IngestBuffer | None:
+    buffer: IngestBuffer | None = getattr(request.app.state, "ingest_buffer", None)
+    return buffer
+
+
+def get_metrics_cache(request: Request) -> MetricsResultCache | None:
+    cache: MetricsResultCache | None = getattr(request.app.state, "metrics_cache", None)
+    return cache
+
+
+def get_rollup_compactor(request: Request) -> RollupCompactor | None:
+    compactor: RollupCompactor | None = getattr(request.app.state, "rollup_compactor", None)
+    return compactor
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from uuid import uuid4
+
+from llm_revenue_analyzer.api.schemas import LLMEventIn
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.observability.metrics import record_ingest_buffer
+
+logger = get_logger(__name__)
+
+RequestKey = tuple[str, str]
+
+
+class IngestBufferFull(Exception):
+    pass
+
+
+@dataclass
+class _Queued:
+    payload: LLMEventIn
+    provisional_id: str
+    attempts: int = 0
+
+    @property
+    def key(self) -> RequestKey:
+        return self.payload.tenant_id, self.payload.request_id
+
+
+class IngestBuffer:
+    """Bounded write-behind queue of accepted LLM events, drained by one writer thread.
+
+    The writer hands ``flush`` up to ``flush_events`` events at a time, as soon as that many are
+    queued or ``flush_interval_seconds`` after the previous flush, so each flush is one
+    multi-row insert and one commit. A failed flush is retried up to ``max_attempts`` times.
+    ``stop`` drains the queue before returning.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[LLMEventIn]], object],
+        capacity: int,
+        flush_events: int,
+        flush_interval_seconds: float,
+        max_attempts: int = 3,
+    ) -> None:
+        self.flush = flush
+        self.capacity = capacity
+        self.flush_events = max(1, flush_events)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._space = threading.Condition(self._lock)
+        self._items: deque[_Queued] = deque()
+        self._keys: dict[RequestKey, str] = {}
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="ingest-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        with self._lock:
+            self._stopping = True
+            self._ready.notify()
+            self._space.notify_all()
+        if self._thread is None:
+            self._run()
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def put(self, payload: LLMEventIn, timeout: float = 0.0) -> tuple[str, bool]:
+        """Queue ``payload`` and return ``(provisional_id, duplicate)``.
+
+        An event whose ``(tenant_id, request_id)`` is still queued is not queued again. When the
+        buffer is full, waits up to ``timeout`` seconds for space and then raises ``IngestBufferFull``.
+        """
+        key = (payload.tenant_id, payload.request_id)
+        with self._lock:
+            queued_id = self._keys.get(key)
+            if queued_id is not None:
+                return queued_id, True
+            has_space = self._space.wait_for(lambda: len(self._items) < self.capacity or self._stopping, timeout)
+            if self._stopping or not has_space:
+                raise IngestBufferFull(f"Ingest buffer is full ({self.capacity} events)")
+            queued_id = self._keys.get(key)
+            if queued_id is not None:
+                return queued_id, True
+            item = _Queued(payload, uuid4().hex)
+            self._items.append(item)
+            self._keys[key] = item.provisional_id
+            if len(self._items) >= self.flush_events:
+                self._ready.notify()
+            return item.provisional_id, False
+
+    def _take(self) -> list[_Queued] | None:
+        with self._lock:
+            if not self._stopping and len(self._items) < self.flush_events:
+                self._ready.wait(self.flush_interval_seconds)
+            if self._stopping and not self._items:
+                return None
+            batch = [self._items.popleft() for _ in range(min(len(self._items), self.flush_events))]
+            self._space.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while (batch := self._take()) is not None:
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: list[_Queued]) -> None:
+        try:
+            self.flush([item.payload for item in batch])
+        except Exception:
+            logger.exception("ingest_buffer_flush_failed", extra={"extra": {"events": len(batch)}})
+            for item in batch:
+                item.attempts += 1
+            retry = [item for item in batch if item.attempts < self.max_attempts]
+            dropped = [item for item in batch if item.attempts >= self.max_attempts]
+            with self._lock:
+                self._items.extendleft(reversed(retry))
+                self._release(dropped)
+            if dropped:
+                logger.error("ingest_buffer_events_dropped", extra={"extra": {"events": len(dropped)}})
+            record_ingest_buffer(len(self), dropped=len(dropped))
+            if not self._stopping:
+                time.sleep(self.flush_interval_seconds)
+            return
+        with self._lock:
+            self._release(batch)
+        record_ingest_buffer(len(self), flushed=len(batch))
+
+    def _release(self, items: list[_Queued]) -> None:
+        for item in items:
+            if self._keys.get(item.key) == item.provisional_id:
+                del self._keys[item.key]
@@ -5,20 +5,19 @@ from decimal import Decimal
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from llm_revenue_analyzer.api.deps import get_session
+from llm_revenue_analyzer.api.deps import SessionRunner, get_db, get_spend_ledger
 from llm_revenue_analyzer.api.schemas import (
     BudgetSetRequest,
     BudgetSetResponse,
     BudgetStatusResponse,
 )
-from llm_revenue_analyzer.budgets import BudgetService
+from llm_revenue_analyzer.budgets import BudgetService, SpendLedger
 from llm_revenue_analyzer.store.repos import TenantRepo
 
 router = APIRouter(prefix="/budgets", tags=["budgets"])
 
 
-@router.post("/set", response_model=BudgetSetResponse)
-def set_budget(payload: BudgetSetRequest, session: Session = Depends(get_session)) -> BudgetSetResponse:
+def _set_budget(session: Session, payload: BudgetSetRequest) -> BudgetSetResponse:
     tenant_repo = TenantRepo(session)
     tenant_repo.ensure(payload.tenant_id)
     service = BudgetService(session)
@@ -38,8 +37,16 @@ def set_budget(payload: BudgetSetRequest, session: Session = Depends(get_session
     )
 
 
+@router.post("/set", response_model=BudgetSetResponse)
+async def set_budget(payload: BudgetSetRequest, db: SessionRunner = Depends(get_db)) -> BudgetSetResponse:
+    return await db.run(_set_budget, payload)
+
+
 @router.get("/status", response_model=BudgetStatusResponse)
-def budget_status(tenant_id: str, session: Session = Depends(get_session)) -> BudgetStatusResponse:
-    service = BudgetService(session)
-    data = service.get_status(tenant_id)
+async def budget_status(
+    tenant_id: str,
+    db: SessionRunner = Depends(get_db),
+    ledger: SpendLedger | None = Depends(get_spend_ledger),
+) -> BudgetStatusResponse:
+    data = await db.run(lambda session: BudgetService(session, ledger=ledger).get_status(tenant_id))
     return BudgetStatusResponse.model_validate(data)
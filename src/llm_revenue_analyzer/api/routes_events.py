@@ -1,63 +1,275 @@
 from __future__ import annotations
 
+import json
+from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from llm_revenue_analyzer.analytics import AnomalyDetector
-from llm_revenue_analyzer.api.deps import get_cost_calculator, get_session
+from llm_revenue_analyzer.analytics import (
+    AnomalyDetector,
+    AnomalyQueue,
+    DailyCostSeries,
+    MetricsResultCache,
+)
+from llm_revenue_analyzer.api.deps import (
+    SessionRunner,
+    get_anomaly_queue,
+    get_cost_calculator,
+    get_daily_cost_series,
+    get_db,
+    get_ingest_buffer,
+    get_metrics_cache,
+    get_recent_requests,
+    get_rollup_compactor,
+    get_spend_ledger,
+)
+from llm_revenue_analyzer.api.ingest_buffer import IngestBuffer, IngestBufferFull
 from llm_revenue_analyzer.api.schemas import (
+    LLMBatchIngestResponse,
+    LLMBatchItemResult,
     LLMEventIn,
     LLMIngestResponse,
+    LLMQueuedResponse,
     RevenueEventIn,
     RevenueIngestResponse,
 )
-from llm_revenue_analyzer.budgets import BudgetService
+from llm_revenue_analyzer.budgets import BudgetEvaluation, BudgetService, SpendLedger
 from llm_revenue_analyzer.core.logging import get_logger
 from llm_revenue_analyzer.core.settings import Settings, get_settings
-from llm_revenue_analyzer.observability.metrics import record_llm_ingest, record_revenue_ingest
+from llm_revenue_analyzer.observability.metrics import (
+    record_llm_duplicates,
+    record_llm_ingest,
+    record_revenue_ingest,
+)
 from llm_revenue_analyzer.pricing import CostCalculator, PricingError, PricingNotFound
-from llm_revenue_analyzer.store.models import LLMEvent, RevenueEvent
-from llm_revenue_analyzer.store.repos import TenantRepo
+from llm_revenue_analyzer.store.dedup import RecentEvent, RecentRequestCache
+from llm_revenue_analyzer.store.models import RevenueEvent, revenue_feature
+from llm_revenue_analyzer.store.repos import BudgetRepo, LLMEventRepo, RollupRepo, TenantRepo
+from llm_revenue_analyzer.store.rollup_compactor import RollupCompactor
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/events", tags=["events"])
 
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+DUPLICATE_STATUS = "duplicate"
+
+
+@dataclass
+class _BatchEntry:
+    index: int
+    payload: LLMEventIn
+    cost_usd: Decimal
+    computed: bool
+    evaluation: BudgetEvaluation | None = None
+
+    def result(self, event_id: int | None = None, error: str | None = None) -> LLMBatchItemResult:
+        return LLMBatchItemResult(
+            index=self.index,
+            accepted=event_id is not None,
+            request_id=self.payload.request_id,
+            event_id=event_id,
+            cost_usd=float(self.cost_usd),
+            cost_source="computed" if self.computed else "supplied",
+            guardrail_status=self.evaluation.status if self.evaluation else None,
+            warning=self.evaluation.warning if self.evaluation and event_id is not None else None,
+            error=error,
+        )
+
 
-@router.post("/llm", response_model=LLMIngestResponse)
-def ingest_llm_event(
+def _duplicate_item(index: int, request_id: str, original: RecentEvent) -> LLMBatchItemResult:
+    return LLMBatchItemResult(
+        index=index,
+        accepted=True,
+        request_id=request_id,
+        event_id=original.event_id,
+        cost_usd=float(original.cost_usd),
+        cost_source="computed" if original.cost_source == "computed" else "supplied",
+        guardrail_status=DUPLICATE_STATUS,
+        duplicate=True,
+    )
+
+
+def _remember_duplicate(entry: _BatchEntry, original: RecentEvent, recent: RecentRequestCache | None) -> LLMBatchItemResult:
+    if recent is not None:
+        recent.put(entry.payload.tenant_id, entry.payload.request_id, original)
+    return _duplicate_item(entry.index, entry.payload.request_id, original)
+
+
+def _llm_event_values(
     payload: LLMEventIn,
+    cost_usd: Decimal,
+    computed: bool,
+    pricing_version: str,
+) -> dict[str, Any]:
+    return {
+        "timestamp": payload.timestamp,
+        "tenant_id": payload.tenant_id,
+        "user_id": payload.user_id,
+        "request_id": payload.request_id,
+        "model": payload.model,
+        "provider": payload.provider,
+        "prompt_tokens": payload.prompt_tokens,
+        "completion_tokens": payload.completion_tokens,
+        "total_tokens": payload.total_tokens or (payload.prompt_tokens + payload.completion_tokens),
+        "latency_ms": payload.latency_ms,
+        "status": payload.status,
+        "cost_usd": cost_usd,
+        "cost_source": "computed" if computed else "supplied",
+        "pricing_version": pricing_version if computed else None,
+        "feature": payload.feature,
+        "metadata_json": payload.metadata_json,
+    }
+
+
+def _duplicate_response(payload: LLMEventIn, original: RecentEvent) -> LLMIngestResponse:
+    computed = original.cost_source == "computed"
+    return LLMIngestResponse(
+        event_id=original.event_id,
+        request_id=payload.request_id,
+        cost_usd=float(original.cost_usd),
+        cost_source="computed" if computed else "supplied",
+        pricing_version=original.pricing_version if computed else None,
+        guardrail_status=DUPLICATE_STATUS,
+        duplicate=True,
+    )
+
+
+def _stored_duplicate(
+    session: Session,
+    payload: LLMEventIn,
+    recent: RecentRequestCache | None,
+) -> LLMIngestResponse | None:
+    row = LLMEventRepo(session).find_by_request_ids(payload.tenant_id, [payload.request_id]).get(payload.request_id)
+    if row is None:
+        return None
+    original = RecentEvent.from_row(row)
+    if recent is not None:
+        recent.put(payload.tenant_id, payload.request_id, original)
+    record_llm_duplicates()
+    return _duplicate_response(payload, original)
+
+
+def _price_event(payload: LLMEventIn, cost_calculator: CostCalculator) -> tuple[Decimal, bool]:
+    if payload.cost_usd is not None:
+        return Decimal(str(payload.cost_usd)), False
+    try:
+        cost_usd = cost_calculator.compute_cost_usd(
+            provider=payload.provider,
+            model=payload.model,
+            prompt_tokens=payload.prompt_tokens,
+            completion_tokens=payload.completion_tokens,
+            at=payload.timestamp,
+        )
+    except PricingNotFound as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except PricingError as exc:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    return cost_usd, True
+
+
+async def _read_llm_batch(
     request: Request,
-    session: Session = Depends(get_session),
-    cost_calculator: CostCalculator = Depends(get_cost_calculator),
     settings: Settings = Depends(get_settings),
+) -> list[LLMEventIn | str]:
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        if content_type in NDJSON_CONTENT_TYPES:
+            raw_items: Any = [json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+        else:
+            raw_items = json.loads(body or b"[]")
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid batch body: {exc}") from exc
+    if not isinstance(raw_items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Batch body must be a JSON array")
+    if len(raw_items) > settings.ingest_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.ingest_batch_max_items} items",
+        )
+
+    items: list[LLMEventIn | str] = []
+    for raw in raw_items:
+        try:
+            items.append(LLMEventIn.model_validate(raw))
+        except ValidationError as exc:
+            items.append("; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()))
+    return items
+
+
+def _check_anomalies_inline(
+    session: Session,
+    settings: Settings,
+    cost_series: DailyCostSeries | None,
+    latest_by_tenant: dict[str, datetime],
+) -> list[str]:
+    """Run spike checks for just-committed events; returns the warnings.
+
+    Runs after the events are committed and added to ``cost_series``, so a series loaded from the
+    database and one updated in memory both include them exactly once.
+    """
+    detector = AnomalyDetector(
+        session=session,
+        multiplier=settings.anomaly_multiplier,
+        lookback_days=settings.anomaly_lookback_days,
+        series=cost_series,
+    )
+    warnings: list[str] = []
+    for tenant_id, latest in latest_by_tenant.items():
+        try:
+            anomaly = detector.check_daily_cost_spike(tenant_id, now=latest)
+            session.commit()
+        except Exception:
+            session.rollback()
+            logger.exception("anomaly_check_failed", extra={"extra": {"tenant_id": tenant_id}})
+            continue
+        if anomaly.message:
+            warnings.append(anomaly.message)
+    return warnings
+
+
+def _ingest_llm_event(
+    session: Session,
+    payload: LLMEventIn,
+    cost_calculator: CostCalculator,
+    settings: Settings,
+    ledger: SpendLedger | None,
+    anomaly_queue: AnomalyQueue | None,
+    cost_series: DailyCostSeries | None,
+    recent: RecentRequestCache | None = None,
+    metrics_cache: MetricsResultCache | None = None,
+    rollup_compactor: RollupCompactor | None = None,
 ) -> LLMIngestResponse:
-    _ = request
+    if recent is not None and (original := recent.get(payload.tenant_id, payload.request_id)) is not None:
+        record_llm_duplicates()
+        return _duplicate_response(payload, original)
     tenant_repo = TenantRepo(session)
-    budget_service = BudgetService(session)
+    budget_service = BudgetService(session, ledger=ledger)
 
     try:
-        computed = payload.cost_usd is None
-        try:
-            cost_usd = (
-                cost_calculator.compute_cost_usd(
-                    provider=payload.provider,
-                    model=payload.model,
-                    prompt_tokens=payload.prompt_tokens,
-                    completion_tokens=payload.completion_tokens,
-                )
-                if computed
-                else Decimal(str(payload.cost_usd))
-            )
-        except PricingNotFound as exc:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-        except PricingError as exc:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
-
+        cost_usd, computed = _price_event(payload, cost_calculator)
         tenant_repo.ensure(payload.tenant_id)
+        event_repo = LLMEventRepo(session)
+        if not event_repo.request_id_unique():
+            # ON CONFLICT cannot catch a retry with another timestamp here; look it up first.
+            event_repo.lock_request_ids([(payload.tenant_id, payload.request_id)])
+            duplicate = _stored_duplicate(session, payload, recent)
+            if duplicate is not None:
+                session.rollback()
+                return duplicate
         evaluation = budget_service.evaluate_llm_cost(payload.tenant_id, cost_usd, now=payload.timestamp)
         if not evaluation.allowed:
+            # A retry of an event stored before the budget ran out still gets its original.
+            duplicate = _stored_duplicate(session, payload, recent)
+            if duplicate is not None:
+                session.rollback()
+                return duplicate
             session.commit()
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -69,32 +281,39 @@ def ingest_llm_event(
                 },
             )
 
-        event = LLMEvent(
-            timestamp=payload.timestamp,
-            tenant_id=payload.tenant_id,
-            user_id=payload.user_id,
-            request_id=payload.request_id,
-            model=payload.model,
-            provider=payload.provider,
-            prompt_tokens=payload.prompt_tokens,
-            completion_tokens=payload.completion_tokens,
-            total_tokens=payload.total_tokens or (payload.prompt_tokens + payload.completion_tokens),
-            latency_ms=payload.latency_ms,
-            status=payload.status,
-            cost_usd=cost_usd,
-            feature=payload.feature,
-            metadata_json=payload.metadata_json,
-        )
-        session.add(event)
-        session.flush()
-
-        anomaly = AnomalyDetector(
-            session=session,
-            multiplier=settings.anomaly_multiplier,
-            lookback_days=settings.anomaly_lookback_days,
-        ).check_daily_cost_spike(payload.tenant_id, now=payload.timestamp)
+        values = _llm_event_values(payload, cost_usd, computed, cost_calculator.catalog.version)
+        event_id = event_repo.insert_new([values]).get((payload.tenant_id, payload.request_id))
+        if event_id is None:
+            session.rollback()
+            duplicate = _stored_duplicate(session, payload, recent)
+            if duplicate is None:
+                raise RuntimeError(f"request_id {payload.request_id!r} conflicted but no stored event was found")
+            return duplicate
+        if rollup_compactor is None or rollup_compactor.applies_inline(payload.timestamp):
+            RollupRepo(session).apply([values])
+        budget_service.record_llm_cost(payload.tenant_id, cost_usd, payload.timestamp)
 
         session.commit()
+        if rollup_compactor is not None:
+            rollup_compactor.mark(payload.tenant_id, [payload.timestamp])
+        if recent is not None:
+            recent.put(
+                payload.tenant_id,
+                payload.request_id,
+                RecentEvent(event_id, cost_usd, values["cost_source"], values["pricing_version"]),
+            )
+        if cost_series is not None:
+            cost_series.add(payload.tenant_id, payload.timestamp, cost_usd)
+        if metrics_cache is not None:
+            metrics_cache.invalidate(payload.tenant_id, [payload.timestamp])
+        anomaly_warning: str | None = None
+        if anomaly_queue is not None:
+            anomaly_queue.submit(payload.tenant_id, payload.timestamp)
+        else:
+            anomaly_warning = next(
+                iter(_check_anomalies_inline(session, settings, cost_series, {payload.tenant_id: payload.timestamp})),
+                None,
+            )
         record_llm_ingest(float(cost_usd))
         logger.info(
             "llm_event_ingested",
@@ -102,20 +321,21 @@ def ingest_llm_event(
                 "extra": {
                     "tenant_id": payload.tenant_id,
                     "request_id": payload.request_id,
-                    "event_id": event.id,
+                    "event_id": event_id,
                     "cost_usd": float(cost_usd),
                     "guardrail_status": evaluation.status,
                 }
             },
         )
         return LLMIngestResponse(
-            event_id=event.id,
+            event_id=event_id,
             request_id=payload.request_id,
             cost_usd=float(cost_usd),
             cost_source="computed" if computed else "supplied",
+            pricing_version=cost_calculator.catalog.version if computed else None,
             guardrail_status=evaluation.status,
             warning=evaluation.warning,
-            anomaly_warning=anomaly.message,
+            anomaly_warning=anomaly_warning,
         )
     except HTTPException:
         session.rollback()
@@ -129,10 +349,332 @@ def ingest_llm_event(
         raise
 
 
-@router.post("/revenue", response_model=RevenueIngestResponse)
-def ingest_revenue_event(
-    payload: RevenueEventIn,
-    session: Session = Depends(get_session),
+def _screen_for_buffer(
+    session: Session,
+    payload: LLMEventIn,
+    cost_calculator: CostCalculator,
+    recent: RecentRequestCache | None,
+) -> LLMIngestResponse | tuple[Decimal, bool] | None:
+    """Price an event for the write-behind buffer.
+
+    Returns a response for a known duplicate, ``None`` when the tenant has a hard budget limit
+    (enforced exactly on the synchronous path), or the event's ``(cost_usd, computed)``.
+    """
+    if recent is not None and (original := recent.get(payload.tenant_id, payload.request_id)) is not None:
+        record_llm_duplicates()
+        return _duplicate_response(payload, original)
+    priced = _price_event(payload, cost_calculator)
+    budget = BudgetRepo(session).get(payload.tenant_id)
+    session.rollback()
+    if budget is not None and budget.hard_limit:
+        return None
+    return priced
+
+
+async def _enqueue_llm_event(
+    buffer: IngestBuffer,
+    payload: LLMEventIn,
+    cost_usd: Decimal,
+    computed: bool,
+    catalog_version: str,
+    settings: Settings,
+) -> LLMQueuedResponse:
+    try:
+        provisional_id, duplicate = buffer.put(payload)
+    except IngestBufferFull:
+        try:
+            provisional_id, duplicate = await run_in_threadpool(
+                buffer.put, payload, settings.ingest_buffer_put_timeout_seconds
+            )
+        except IngestBufferFull as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc),
+                headers={"Retry-After": "1"},
+            ) from exc
+    if duplicate:
+        record_llm_duplicates()
+    return LLMQueuedResponse(
+        provisional_id=provisional_id,
+        request_id=payload.request_id,
+        cost_usd=float(cost_usd),
+        cost_source="computed" if computed else "supplied",
+        pricing_version=catalog_version if computed else None,
+        duplicate=duplicate,
+    )
+
+
+@router.post("/llm", response_model=LLMIngestResponse | LLMQueuedResponse)
+async def ingest_llm_event(
+    payload: LLMEventIn,
+    response: Response,
+    db: SessionRunner = Depends(get_db),
+    cost_calculator: CostCalculator = Depends(get_cost_calculator),
+    settings: Settings = Depends(get_settings),
+    ledger: SpendLedger | None = Depends(get_spend_ledger),
+    anomaly_queue: AnomalyQueue | None = Depends(get_anomaly_queue),
+    cost_series: DailyCostSeries | None = Depends(get_daily_cost_series),
+    recent: RecentRequestCache | None = Depends(get_recent_requests),
+    metrics_cache: MetricsResultCache | None = Depends(get_metrics_cache),
+    rollup_compactor: RollupCompactor | None = Depends(get_rollup_compactor),
+    buffer: IngestBuffer | None = Depends(get_ingest_buffer),
+) -> LLMIngestResponse | LLMQueuedResponse:
+    if buffer is not None:
+        screened = await db.run(_screen_for_buffer, payload, cost_calculator, recent)
+        if isinstance(screened, LLMIngestResponse):
+            return screened
+        if screened is not None:
+            response.status_code = status.HTTP_202_ACCEPTED
+            return await _enqueue_llm_event(buffer, payload, *screened, cost_calculator.catalog.version, settings)
+    return await db.run(
+        _ingest_llm_event,
+        payload,
+        cost_calculator,
+        settings,
+        ledger,
+        anomaly_queue,
+        cost_series,
+        recent,
+        metrics_cache,
+        rollup_compactor,
+    )
+
+
+def _ingest_llm_batch(
+    session: Session,
+    items: list[LLMEventIn | str],
+    cost_calculator: CostCalculator,
+    settings: Settings,
+    ledger: SpendLedger | None,
+    anomaly_queue: AnomalyQueue | None,
+    cost_series: DailyCostSeries | None,
+    recent: RecentRequestCache | None = None,
+    metrics_cache: MetricsResultCache | None = None,
+    rollup_compactor: RollupCompactor | None = None,
+) -> LLMBatchIngestResponse:
+    results: dict[int, LLMBatchItemResult] = {}
+    by_tenant: dict[str, list[_BatchEntry]] = {}
+    first_index: dict[tuple[str, str], int] = {}
+    repeats: dict[int, int] = {}
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            results[index] = LLMBatchItemResult(index=index, accepted=False, error=item)
+            continue
+        key = (item.tenant_id, item.request_id)
+        if key in first_index:
+            repeats[index] = first_index[key]
+            continue
+        first_index[key] = index
+        if recent is not None and (original := recent.get(*key)) is not None:
+            results[index] = _duplicate_item(index, item.request_id, original)
+            continue
+        computed = item.cost_usd is None
+        try:
+            cost_usd = (
+                cost_calculator.compute_cost_usd(
+                    provider=item.provider,
+                    model=item.model,
+                    prompt_tokens=item.prompt_tokens,
+                    completion_tokens=item.completion_tokens,
+                    at=item.timestamp,
+                )
+                if computed
+                else Decimal(str(item.cost_usd))
+            )
+        except PricingNotFound as exc:
+            results[index] = LLMBatchItemResult(index=index, accepted=False, request_id=item.request_id, error=str(exc))
+            continue
+        except PricingError as exc:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+        by_tenant.setdefault(item.tenant_id, []).append(_BatchEntry(index, item, cost_usd, computed))
+
+    tenant_repo = TenantRepo(session)
+    event_repo = LLMEventRepo(session)
+    budget_service = BudgetService(session, ledger=ledger)
+    accepted: list[_BatchEntry] = []
+    stored: list[tuple[_BatchEntry, RecentEvent]] = []
+    conflicted: list[_BatchEntry] = []
+    try:
+        # Same order as the single-event path: tenant rows, then request id locks, then budget rows.
+        # Tenants go in sorted order, so concurrent batches listing them differently cannot deadlock.
+        tenant_ids = sorted(by_tenant)
+        for tenant_id in tenant_ids:
+            tenant_repo.ensure(tenant_id)
+        if not event_repo.request_id_unique():
+            event_repo.lock_request_ids(
+                (tenant_id, entry.payload.request_id) for tenant_id, entries in by_tenant.items() for entry in entries
+            )
+        for tenant_id in tenant_ids:
+            entries = by_tenant[tenant_id]
+            request_ids = [entry.payload.request_id for entry in entries]
+            existing = event_repo.find_by_request_ids(tenant_id, request_ids)
+            fresh: list[_BatchEntry] = []
+            for entry in entries:
+                row = existing.get(entry.payload.request_id)
+                if row is None:
+                    fresh.append(entry)
+                else:
+                    results[entry.index] = _remember_duplicate(entry, RecentEvent.from_row(row), recent)
+            evaluations = budget_service.evaluate_llm_batch(
+                tenant_id, [(entry.cost_usd, entry.payload.timestamp) for entry in fresh]
+            )
+            for entry, evaluation in zip(fresh, evaluations, strict=True):
+                entry.evaluation = evaluation
+                if evaluation.allowed:
+                    accepted.append(entry)
+                else:
+                    results[entry.index] = entry.result(error=evaluation.warning or "Hard budget limit exceeded")
+
+        rows = [_llm_event_values(entry.payload, entry.cost_usd, entry.computed, cost_calculator.catalog.version) for entry in accepted]
+        event_ids = event_repo.insert_new(rows)
+        stored_rows: list[dict[str, Any]] = []
+        for entry, values in zip(accepted, rows, strict=True):
+            event_id = event_ids.get((entry.payload.tenant_id, entry.payload.request_id))
+            if event_id is None:
+                # Lost a race with a concurrent insert of the same request_id.
+                conflicted.append(entry)
+                continue
+            stored.append((entry, RecentEvent(event_id, entry.cost_usd, values["cost_source"], values["pricing_version"])))
+            stored_rows.append(values)
+            budget_service.record_llm_cost(entry.payload.tenant_id, entry.cost_usd, entry.payload.timestamp)
+            results[entry.index] = entry.result(event_id=event_id)
+        if rollup_compactor is not None:
+            stored_rows = [row for row in stored_rows if rollup_compactor.applies_inline(row["timestamp"])]
+        RollupRepo(session).apply(stored_rows)
+
+        session.commit()
+        for entry, original in stored:
+            if rollup_compactor is not None:
+                rollup_compactor.mark(entry.payload.tenant_id, [entry.payload.timestamp])
+            if recent is not None:
+                recent.put(entry.payload.tenant_id, entry.payload.request_id, original)
+            if cost_series is not None:
+                cost_series.add(entry.payload.tenant_id, entry.payload.timestamp, entry.cost_usd)
+            if anomaly_queue is not None:
+                anomaly_queue.submit(entry.payload.tenant_id, entry.payload.timestamp)
+            if metrics_cache is not None:
+                metrics_cache.invalidate(entry.payload.tenant_id, [entry.payload.timestamp])
+        anomaly_warnings: list[str] = []
+        if anomaly_queue is None:
+            latest_by_tenant: dict[str, datetime] = {}
+            for entry, _ in stored:
+                tenant_id, timestamp = entry.payload.tenant_id, entry.payload.timestamp
+                latest_by_tenant[tenant_id] = max(latest_by_tenant.get(tenant_id, timestamp), timestamp)
+            anomaly_warnings = _check_anomalies_inline(session, settings, cost_series, latest_by_tenant)
+        for entry in conflicted:
+            row = event_repo.find_by_request_ids(entry.payload.tenant_id, [entry.payload.request_id]).get(
+                entry.payload.request_id
+            )
+            results[entry.index] = (
+                _remember_duplicate(entry, RecentEvent.from_row(row), recent)
+                if row is not None
+                else entry.result(error="Conflicting request_id was not found")
+            )
+    except Exception:
+        session.rollback()
+        logger.exception("llm_batch_ingest_failed", extra={"extra": {"items": len(items)}})
+        raise
+
+    for index, original_index in repeats.items():
+        first = results[original_index]
+        update: dict[str, Any] = {"index": index, "duplicate": first.accepted}
+        if first.accepted:
+            update.update(guardrail_status=DUPLICATE_STATUS, warning=None)
+        results[index] = first.model_copy(update=update)
+    duplicates = sum(1 for result in results.values() if result.duplicate)
+    if duplicates:
+        record_llm_duplicates(duplicates)
+
+    total_cost = sum((entry.cost_usd for entry, _ in stored), Decimal("0"))
+    if stored:
+        record_llm_ingest(float(total_cost), count=len(stored))
+    accepted_count = sum(1 for result in results.values() if result.accepted)
+    logger.info(
+        "llm_batch_ingested",
+        extra={
+            "extra": {
+                "items": len(items),
+                "accepted": accepted_count,
+                "duplicates": duplicates,
+                "tenants": len(by_tenant),
+                "cost_usd": float(total_cost),
+            }
+        },
+    )
+    return LLMBatchIngestResponse(
+        accepted=accepted_count,
+        rejected=len(items) - accepted_count,
+        duplicates=duplicates,
+        results=[results[index] for index in range(len(items))],
+        pricing_version=cost_calculator.catalog.version,
+        anomaly_warnings=anomaly_warnings,
+    )
+
+
+def write_buffered_llm_events(
+    session: Session,
+    payloads: list[LLMEventIn],
+    cost_calculator: CostCalculator,
+    settings: Settings,
+    ledger: SpendLedger | None,
+    anomaly_queue: AnomalyQueue | None,
+    cost_series: DailyCostSeries | None,
+    recent: RecentRequestCache | None,
+    metrics_cache: MetricsResultCache | None,
+    rollup_compactor: RollupCompactor | None = None,
+) -> LLMBatchIngestResponse:
+    """Group-commit events drained from the ingest buffer through the batch ingest path."""
+    items: list[LLMEventIn | str] = list(payloads)
+    result = _ingest_llm_batch(
+        session,
+        items,
+        cost_calculator,
+        settings,
+        ledger,
+        anomaly_queue,
+        cost_series,
+        recent,
+        metrics_cache,
+        rollup_compactor,
+    )
+    rejected = [item for item in result.results if not item.accepted]
+    if rejected:
+        logger.warning(
+            "buffered_llm_events_rejected",
+            extra={"extra": {"rejected": [(item.request_id, item.error) for item in rejected]}},
+        )
+    return result
+
+
+@router.post("/llm/batch", response_model=LLMBatchIngestResponse)
+async def ingest_llm_batch(
+    items: list[LLMEventIn | str] = Depends(_read_llm_batch),
+    db: SessionRunner = Depends(get_db),
+    cost_calculator: CostCalculator = Depends(get_cost_calculator),
+    settings: Settings = Depends(get_settings),
+    ledger: SpendLedger | None = Depends(get_spend_ledger),
+    anomaly_queue: AnomalyQueue | None = Depends(get_anomaly_queue),
+    cost_series: DailyCostSeries | None = Depends(get_daily_cost_series),
+    recent: RecentRequestCache | None = Depends(get_recent_requests),
+    metrics_cache: MetricsResultCache | None = Depends(get_metrics_cache),
+    rollup_compactor: RollupCompactor | None = Depends(get_rollup_compactor),
+) -> LLMBatchIngestResponse:
+    return await db.run_cpu(
+        _ingest_llm_batch,
+        items,
+        cost_calculator,
+        settings,
+        ledger,
+        anomaly_queue,
+        cost_series,
+        recent,
+        metrics_cache,
+        rollup_compactor,
+    )
+
+
+def _ingest_revenue_event(
+    session: Session, payload: RevenueEventIn, metrics_cache: MetricsResultCache | None = None
 ) -> RevenueIngestResponse:
     tenant_repo = TenantRepo(session)
     try:
@@ -144,14 +686,26 @@ def ingest_revenue_event(
             amount_usd=Decimal(str(payload.amount_usd)),
             currency=payload.currency,
             source=payload.source,
+            feature=payload.feature or revenue_feature(payload.metadata_json),
             metadata_json=payload.metadata_json,
         )
         session.add(event)
         session.flush()
         session.commit()
+        if metrics_cache is not None:
+            metrics_cache.invalidate(payload.tenant_id, [payload.timestamp])
         record_revenue_ingest(float(event.amount_usd))
         return RevenueIngestResponse(event_id=event.id)
     except Exception:
         session.rollback()
         logger.exception("revenue_event_ingest_failed", extra={"extra": {"tenant_id": payload.tenant_id}})
         raise
+
+
+@router.post("/revenue", response_model=RevenueIngestResponse)
+async def ingest_revenue_event(
+    payload: RevenueEventIn,
+    db: SessionRunner = Depends(get_db),
+    metrics_cache: MetricsResultCache | None = Depends(get_metrics_cache),
+) -> RevenueIngestResponse:
+    return await db.run(_ingest_revenue_event, payload, metrics_cache)
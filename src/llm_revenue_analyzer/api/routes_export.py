@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from llm_revenue_analyzer.api.deps import ScopedSessionRunner
+from llm_revenue_analyzer.core.settings import Settings
+from llm_revenue_analyzer.store.repos import (
+    LLM_EXPORT_COLUMNS,
+    REVENUE_EXPORT_COLUMNS,
+    ExportKey,
+    LLMEventRepo,
+    RevenueEventRepo,
+    as_utc,
+)
+
+router = APIRouter(prefix="/events", tags=["export"])
+
+ExportFormat = Literal["ndjson", "csv"]
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def encode_resume_token(key: ExportKey) -> str:
+    tenant_id, timestamp, event_id = key
+    raw = json.dumps([tenant_id, as_utc(timestamp).isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_resume_token(token: str) -> ExportKey:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        tenant_id, timestamp, event_id = json.loads(raw)
+        return str(tenant_id), as_utc(datetime.fromisoformat(timestamp)), int(event_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invalid resume_token") from exc
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return as_utc(value).isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, dict | list):
+        return json.dumps(value, separators=(",", ":"), sort_keys=True)
+    return "" if value is None else value
+
+
+def _encode_rows(rows: Sequence[Row[Any]], columns: Sequence[str], fmt: ExportFormat) -> str:
+    records = []
+    for row in rows:
+        record = {name: _export_value(value) for name, value in zip(columns, row, strict=True)}
+        record["resume_token"] = encode_resume_token((row.tenant_id, row.timestamp, row.id))
+        records.append(record)
+    if fmt == "ndjson":
+        return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([_csv_value(value) for value in record.values()] for record in records)
+    return buffer.getvalue()
+
+
+def _stream_export(
+    settings: Settings,
+    repo_type: type[LLMEventRepo] | type[RevenueEventRepo],
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    from_ts: datetime,
+    to_ts: datetime,
+    tenant_id: str | None,
+    resume_token: str | None,
+    filename: str,
+) -> StreamingResponse:
+    after = decode_resume_token(resume_token) if resume_token else None
+    page_size = max(settings.export_page_size, 1)
+    db = ScopedSessionRunner(settings)
+
+    def fetch_page(session: Session, after: ExportKey | None) -> Sequence[Row[Any]]:
+        return repo_type(session).export_page(from_ts, to_ts, after, page_size, tenant_id=tenant_id)
+
+    async def body() -> AsyncIterator[str]:
+        cursor = after
+        if fmt == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator="\n").writerow([*columns, "resume_token"])
+            yield buffer.getvalue()
+        while True:
+            # Each page runs in its own short session, so memory stays bounded by the page size
+            # and no connection or snapshot is held while the client reads.
+            rows = await db.run(fetch_page, cursor)
+            if not rows:
+                return
+            yield _encode_rows(rows, columns, fmt)
+            if len(rows) < page_size:
+                return
+            last = rows[-1]
+            cursor = (last.tenant_id, last.timestamp, last.id)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+@router.get("/llm/export")
+async def export_llm_events(
+    request: Request,
+    from_ts: datetime = Query(alias="from"),
+    to_ts: datetime = Query(alias="to"),
+    tenant_id: str | None = None,
+    format: ExportFormat = "ndjson",
+    resume_token: str | None = None,
+) -> StreamingResponse:
+    return _stream_export(
+        request.app.state.settings,
+        LLMEventRepo,
+        LLM_EXPORT_COLUMNS,
+        format,
+        from_ts,
+        to_ts,
+        tenant_id,
+        resume_token,
+        "llm_events",
+    )
+
+
+@router.get("/revenue/export")
+async def export_revenue_events(
+    request: Request,
+    from_ts: datetime = Query(alias="from"),
+    to_ts: datetime = Query(alias="to"),
+    tenant_id: str | None = None,
+    format: ExportFormat = "ndjson",
+    resume_token: str | None = None,
+) -> StreamingResponse:
+    return _stream_export(
+        request.app.state.settings,
+        RevenueEventRepo,
+        REVENUE_EXPORT_COLUMNS,
+        format,
+        from_ts,
+        to_ts,
+        tenant_id,
+        resume_token,
+        "revenue_events",
+    )
@@ -1,56 +1,202 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from llm_revenue_analyzer.analytics import AnalyticsService
-from llm_revenue_analyzer.api.deps import get_session
-from llm_revenue_analyzer.api.schemas import BreakdownResponse, SummaryMetricsResponse
+from llm_revenue_analyzer.analytics import AnalyticsService, MetricsCacheKey, MetricsResultCache
+from llm_revenue_analyzer.analytics.service import SummaryOrder, Window
+from llm_revenue_analyzer.api.deps import SessionRunner, get_db, get_metrics_cache
+from llm_revenue_analyzer.api.schemas import (
+    BreakdownResponse,
+    SummaryMetricsResponse,
+    TenantSummariesResponse,
+)
+from llm_revenue_analyzer.core.settings import Settings, get_settings
 
 router = APIRouter(prefix="/metrics", tags=["analytics"])
 
 
+def parse_quantiles(
+    quantiles: str | None = Query(default=None, description="Comma-separated quantiles, e.g. 0.5,0.9,0.99"),
+) -> list[float]:
+    if not quantiles:
+        return []
+    try:
+        values = [float(part) for part in quantiles.split(",") if part.strip()]
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    if any(not 0 < q <= 1 for q in values):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="quantiles must be in (0, 1]",
+        )
+    return list(dict.fromkeys(values))
+
+
+def parse_tenant_ids(
+    tenant_ids: str | None = Query(default=None, description="Comma-separated tenant ids; all tenants when omitted"),
+) -> list[str] | None:
+    if tenant_ids is None:
+        return None
+    return [part.strip() for part in tenant_ids.split(",") if part.strip()]
+
+
+async def _cached(
+    db: SessionRunner,
+    cache: MetricsResultCache | None,
+    endpoint: str,
+    tenant_id: str,
+    from_ts: datetime,
+    to_ts: datetime,
+    granularity: str,
+    quantiles: list[float],
+    compute: Callable[[Session], Any],
+) -> Any:
+    try:
+        window = Window.normalize(from_ts, to_ts)
+    except ValueError:
+        cache = None
+    if cache is None:
+        return await db.run_cpu(compute)
+    key = MetricsCacheKey(endpoint, tenant_id, window, granularity, tuple(quantiles))
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    generation = cache.generation(tenant_id)
+    value = await db.run_cpu(compute)
+    cache.put(key, value, generation)
+    return value
+
+
 @router.get("/summary", response_model=SummaryMetricsResponse)
-def metrics_summary(
+async def metrics_summary(
     tenant_id: str,
     from_ts: datetime = Query(alias="from"),
     to_ts: datetime = Query(alias="to"),
-    session: Session = Depends(get_session),
+    db: SessionRunner = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+    quantiles: list[float] = Depends(parse_quantiles),
+    cache: MetricsResultCache | None = Depends(get_metrics_cache),
 ) -> SummaryMetricsResponse:
-    data = AnalyticsService(session).summary(tenant_id=tenant_id, from_ts=from_ts, to_ts=to_ts)
+    data = await _cached(
+        db,
+        cache,
+        "summary",
+        tenant_id,
+        from_ts,
+        to_ts,
+        "total",
+        quantiles,
+        lambda session: AnalyticsService(session, engine=settings.analytics_engine).summary(
+            tenant_id=tenant_id, from_ts=from_ts, to_ts=to_ts, quantiles=quantiles
+        )
+    )
     return SummaryMetricsResponse.model_validate(data)
 
 
+@router.get("/summary/all", response_model=TenantSummariesResponse)
+async def metrics_summary_all(
+    from_ts: datetime = Query(alias="from"),
+    to_ts: datetime = Query(alias="to"),
+    order_by: SummaryOrder = "cost_usd",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(default=50, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    tenant_ids: list[str] | None = Depends(parse_tenant_ids),
+    db: SessionRunner = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+    quantiles: list[float] = Depends(parse_quantiles),
+) -> TenantSummariesResponse:
+    total, rows = await db.run_cpu(
+        lambda session: AnalyticsService(session, engine=settings.analytics_engine).summaries(
+            tenant_ids,
+            from_ts,
+            to_ts,
+            quantiles=quantiles,
+            order_by=order_by,
+            descending=order == "desc",
+            limit=limit,
+            offset=offset,
+        )
+    )
+    return TenantSummariesResponse.model_validate(
+        {
+            "from": from_ts,
+            "to": to_ts,
+            "order_by": order_by,
+            "order": order,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "rows": rows,
+        }
+    )
+
+
 @router.get("/by-model", response_model=BreakdownResponse)
-def metrics_by_model(
+async def metrics_by_model(
     tenant_id: str,
     from_ts: datetime = Query(alias="from"),
     to_ts: datetime = Query(alias="to"),
     granularity: Literal["total", "day"] = "total",
-    session: Session = Depends(get_session),
+    db: SessionRunner = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+    quantiles: list[float] = Depends(parse_quantiles),
+    cache: MetricsResultCache | None = Depends(get_metrics_cache),
 ) -> BreakdownResponse:
-    rows = AnalyticsService(session).by_model(tenant_id=tenant_id, from_ts=from_ts, to_ts=to_ts, granularity=granularity)
+    rows = await _cached(
+        db,
+        cache,
+        "by-model",
+        tenant_id,
+        from_ts,
+        to_ts,
+        granularity,
+        quantiles,
+        lambda session: AnalyticsService(session, engine=settings.analytics_engine).by_model(
+            tenant_id=tenant_id,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            granularity=granularity,
+            quantiles=quantiles,
+        )
+    )
     return BreakdownResponse.model_validate(
         {"tenant_id": tenant_id, "from": from_ts, "to": to_ts, "granularity": granularity, "rows": rows}
     )
 
 
 @router.get("/by-feature", response_model=BreakdownResponse)
-def metrics_by_feature(
+async def metrics_by_feature(
     tenant_id: str,
     from_ts: datetime = Query(alias="from"),
     to_ts: datetime = Query(alias="to"),
     granularity: Literal["total", "day"] = "total",
-    session: Session = Depends(get_session),
+    db: SessionRunner = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+    quantiles: list[float] = Depends(parse_quantiles),
+    cache: MetricsResultCache | None = Depends(get_metrics_cache),
 ) -> BreakdownResponse:
-    rows = AnalyticsService(session).by_feature(
-        tenant_id=tenant_id,
-        from_ts=from_ts,
-        to_ts=to_ts,
-        granularity=granularity,
+    rows = await _cached(
+        db,
+        cache,
+        "by-feature",
+        tenant_id,
+        from_ts,
+        to_ts,
+        granularity,
+        quantiles,
+        lambda session: AnalyticsService(session, engine=settings.analytics_engine).by_feature(
+            tenant_id=tenant_id,
+            from_ts=from_ts,
+            to_ts=to_ts,
+            granularity=granularity,
+            quantiles=quantiles,
+        )
     )
     return BreakdownResponse.model_validate(
         {"tenant_id": tenant_id, "from": from_ts, "to": to_ts, "granularity": granularity, "rows": rows}
@@ -3,9 +3,8 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Response
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
 
-from llm_revenue_analyzer.api.deps import get_session
+from llm_revenue_analyzer.api.deps import SessionRunner, get_db
 from llm_revenue_analyzer.api.schemas import HealthResponse, VersionResponse
 from llm_revenue_analyzer.core.settings import Settings, get_settings
 from llm_revenue_analyzer.observability.metrics import render_metrics_text
@@ -14,9 +13,9 @@ router = APIRouter(tags=["system"])
 
 
 @router.get("/health", response_model=HealthResponse)
-def health(session: Session = Depends(get_session)) -> HealthResponse:
+async def health(db: SessionRunner = Depends(get_db)) -> HealthResponse:
     try:
-        session.execute(text("SELECT 1"))
+        await db.run(lambda session: session.execute(text("SELECT 1")))
         return HealthResponse(status="ok", database="ok")
     except SQLAlchemyError:
         return HealthResponse(status="degraded", database="error")
@@ -43,6 +43,7 @@ class RevenueEventIn(APIModel):
     amount_usd: float = Field(gt=0)
     currency: str = Field(default="USD", min_length=3, max_length=16)
     source: str = Field(min_length=1, max_length=128)
+    feature: str | None = Field(default=None, min_length=1, max_length=128)
     metadata_json: dict[str, Any] | None = None
 
     @field_validator("currency")
@@ -57,9 +58,44 @@ class LLMIngestResponse(APIModel):
     request_id: str
     cost_usd: float
     cost_source: Literal["supplied", "computed"]
+    pricing_version: str | None = None
     guardrail_status: str
     warning: str | None = None
     anomaly_warning: str | None = None
+    duplicate: bool = False
+
+
+class LLMQueuedResponse(APIModel):
+    accepted: bool = True
+    queued: bool = True
+    provisional_id: str
+    request_id: str
+    cost_usd: float
+    cost_source: Literal["supplied", "computed"]
+    pricing_version: str | None = None
+    duplicate: bool = False
+
+
+class LLMBatchItemResult(APIModel):
+    index: int
+    accepted: bool
+    request_id: str | None = None
+    event_id: int | None = None
+    cost_usd: float | None = None
+    cost_source: Literal["supplied", "computed"] | None = None
+    guardrail_status: str | None = None
+    warning: str | None = None
+    error: str | None = None
+    duplicate: bool = False
+
+
+class LLMBatchIngestResponse(APIModel):
+    accepted: int
+    rejected: int
+    duplicates: int = 0
+    results: list[LLMBatchItemResult]
+    pricing_version: str
+    anomaly_warnings: list[str] = Field(default_factory=list)
 
 
 class RevenueIngestResponse(APIModel):
@@ -118,9 +154,21 @@ class SummaryMetricsResponse(APIModel):
     error_rate: float
     avg_latency_ms: float | None
     p95_latency_ms: float | None
+    latency_quantiles_ms: dict[str, float | None] | None = None
     daily: list[dict[str, Any]]
 
 
+class TenantSummariesResponse(APIModel):
+    from_: datetime = Field(alias="from")
+    to: datetime
+    order_by: str
+    order: str
+    total: int
+    limit: int
+    offset: int
+    rows: list[SummaryMetricsResponse]
+
+
 class BreakdownRow(APIModel):
     provider: str | None = None
     model: str | None = None
@@ -134,6 +182,7 @@ class BreakdownRow(APIModel):
     error_rate: float
     avg_latency_ms: float | None
     p95_latency_ms: float | None
+    latency_quantiles_ms: dict[str, float | None] | None = None
 
 
 class BreakdownResponse(APIModel):
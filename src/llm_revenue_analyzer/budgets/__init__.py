@@ -1,7 +1,8 @@
+from llm_revenue_analyzer.budgets.ledger import SpendLedger
 from llm_revenue_analyzer.budgets.service import (
     BudgetEvaluation,
     BudgetLimitExceeded,
     BudgetService,
 )
 
-__all__ = ["BudgetService", "BudgetEvaluation", "BudgetLimitExceeded"]
+__all__ = ["BudgetService", "BudgetEvaluation", "BudgetLimitExceeded", "SpendLedger"]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.core.money import micros_to_usd, to_micros
+from llm_revenue_analyzer.store.repos import LLMEventRepo, month_bounds
+
+logger = get_logger(__name__)
+
+LedgerKey = tuple[str, datetime]
+
+_PENDING_KEY = "spend_ledger_pending"
+
+
+class SpendLedger:
+    """Month-to-date LLM spend per tenant, held as integer micro-dollars.
+
+    The ledger only sees this process's commits. ``BudgetService`` re-reads the database for
+    hard-limited tenants whose projected spend is within ``hard_limit_margin`` of the budget.
+    """
+
+    def __init__(self, hard_limit_margin: float = 0.2) -> None:
+        self.hard_limit_margin = hard_limit_margin
+        self._lock = threading.Lock()
+        self._spend: dict[LedgerKey, int] = {}
+
+    @staticmethod
+    def _key(tenant_id: str, reference: datetime) -> LedgerKey:
+        month_start, _ = month_bounds(reference)
+        return tenant_id, month_start
+
+    def month_spend(self, session: Session, tenant_id: str, reference: datetime) -> Decimal:
+        return micros_to_usd(self.month_spend_micros(session, tenant_id, reference))
+
+    def month_spend_micros(self, session: Session, tenant_id: str, reference: datetime) -> int:
+        key = self._key(tenant_id, reference)
+        with self._lock:
+            committed = self._spend.get(key)
+        if committed is None:
+            seeded = LLMEventRepo(session).month_cost_micros(reference, tenant_id).get(tenant_id, 0)
+            with self._lock:
+                committed = self._spend.setdefault(key, seeded)
+        return committed + self._pending(session).get(key, 0)
+
+    def sync(self, session: Session, tenant_id: str, reference: datetime, total_micros: int) -> None:
+        """Replace the cached month total with ``total_micros`` read in ``session``'s transaction."""
+        key = self._key(tenant_id, reference)
+        with self._lock:
+            self._spend[key] = total_micros - self._pending(session).get(key, 0)
+
+    def record(self, session: Session, tenant_id: str, reference: datetime, cost_usd: Decimal) -> None:
+        pending = self._pending(session)
+        key = self._key(tenant_id, reference)
+        pending[key] = pending.get(key, 0) + to_micros(cost_usd)
+        if not session.info.get(self._listener_key):
+            event.listen(session, "after_commit", self._apply)
+            event.listen(session, "after_rollback", self._discard)
+            session.info[self._listener_key] = True
+
+    def reconcile(self, session: Session, now: datetime | None = None) -> int:
+        reference = (now or datetime.now(UTC)).astimezone(UTC)
+        current_month, _ = month_bounds(reference)
+        with self._lock:
+            stale = [key for key in self._spend if key[1] != current_month]
+            for key in stale:
+                del self._spend[key]
+            tenants = [tenant_id for tenant_id, _ in self._spend]
+        if not tenants:
+            return 0
+
+        totals = LLMEventRepo(session).month_cost_micros(reference)
+        drifted = 0
+        with self._lock:
+            for tenant_id in tenants:
+                key = (tenant_id, current_month)
+                actual = totals.get(tenant_id, 0)
+                if key in self._spend and self._spend[key] != actual:
+                    drifted += 1
+                    self._spend[key] = actual
+        if drifted or stale:
+            logger.info(
+                "spend_ledger_reconciled",
+                extra={"extra": {"tenants": len(tenants), "drifted": drifted, "evicted": len(stale)}},
+            )
+        return drifted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spend.clear()
+
+    @property
+    def _listener_key(self) -> str:
+        return f"spend_ledger_listener_{id(self)}"
+
+    def _pending(self, session: Session) -> dict[LedgerKey, int]:
+        pending: dict[int, dict[LedgerKey, int]] = session.info.setdefault(_PENDING_KEY, {})
+        return pending.setdefault(id(self), {})
+
+    def _apply(self, session: Session) -> None:
+        pending = self._pending(session)
+        with self._lock:
+            for key, delta in pending.items():
+                if key in self._spend:
+                    self._spend[key] += delta
+        pending.clear()
+
+    def _discard(self, session: Session) -> None:
+        self._pending(session).clear()
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
+from typing import Any
 
 from sqlalchemy.orm import Session
 
+from llm_revenue_analyzer.budgets.ledger import SpendLedger
+from llm_revenue_analyzer.core.money import micros_to_float, micros_to_usd, to_micros
 from llm_revenue_analyzer.store.models import Alert, Budget
-from llm_revenue_analyzer.store.repos import AlertRepo, BudgetRepo, LLMEventRepo, RevenueEventRepo
+from llm_revenue_analyzer.store.repos import (
+    AlertRepo,
+    BudgetRepo,
+    LLMEventRepo,
+    RevenueEventRepo,
+    month_bounds,
+)
 
 
 @dataclass(frozen=True)
@@ -28,8 +38,9 @@ class BudgetLimitExceeded(Exception):
 
 
 class BudgetService:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, ledger: SpendLedger | None = None) -> None:
         self.session = session
+        self.ledger = ledger
         self.budgets = BudgetRepo(session)
         self.llm_events = LLMEventRepo(session)
         self.revenue_events = RevenueEventRepo(session)
@@ -52,104 +63,197 @@ class BudgetService:
     def evaluate_llm_cost(self, tenant_id: str, new_cost_usd: Decimal, now: datetime | None = None) -> BudgetEvaluation:
         reference = (now or datetime.now(UTC)).astimezone(UTC)
         budget = self.budgets.get(tenant_id)
-        current_spend = self.llm_events.month_cost_sum(tenant_id, reference)
-        projected = current_spend + new_cost_usd
+        new_cost = to_micros(new_cost_usd)
+        current_spend = self._month_spend_micros(tenant_id, reference)
+        if self._near_hard_limit(budget, current_spend + new_cost):
+            current_spend = self._locked_month_spend(tenant_id, reference)
+        evaluation, alert = self._evaluate(tenant_id, budget, current_spend, new_cost)
+        if alert is not None:
+            self.alerts.create(**alert)
+        return evaluation
+
+    def evaluate_llm_batch(
+        self,
+        tenant_id: str,
+        items: Sequence[tuple[Decimal, datetime]],
+    ) -> list[BudgetEvaluation]:
+        budget = self.budgets.get(tenant_id)
+        month_spend: dict[datetime, int] = {}
+        admitted: dict[datetime, int] = {}
+        verified: set[datetime] = set()
+        alerts: dict[str, dict[str, Any]] = {}
+        evaluations: list[BudgetEvaluation] = []
+        for new_cost_usd, timestamp in items:
+            reference = timestamp.astimezone(UTC)
+            month_start, _ = month_bounds(reference)
+            if month_start not in month_spend:
+                month_spend[month_start] = self._month_spend_micros(tenant_id, reference)
+            new_cost = to_micros(new_cost_usd)
+            if month_start not in verified and self._near_hard_limit(budget, month_spend[month_start] + new_cost):
+                verified.add(month_start)
+                month_spend[month_start] = self._locked_month_spend(tenant_id, reference) + admitted.get(month_start, 0)
+            current_spend = month_spend[month_start]
+            evaluation, alert = self._evaluate(tenant_id, budget, current_spend, new_cost)
+            if alert is not None:
+                alerts.setdefault(alert["alert_type"], alert)
+            if evaluation.allowed:
+                month_spend[month_start] = current_spend + new_cost
+                admitted[month_start] = admitted.get(month_start, 0) + new_cost
+            evaluations.append(evaluation)
+        for alert in alerts.values():
+            self.alerts.create(**alert)
+        return evaluations
+
+    def month_spend(self, tenant_id: str, reference: datetime) -> Decimal:
+        return micros_to_usd(self._month_spend_micros(tenant_id, reference))
+
+    def _month_spend_micros(self, tenant_id: str, reference: datetime) -> int:
+        if self.ledger is None:
+            return self.llm_events.month_cost_micros(reference, tenant_id).get(tenant_id, 0)
+        return self.ledger.month_spend_micros(self.session, tenant_id, reference)
+
+    def _near_hard_limit(self, budget: Budget | None, projected_micros: int) -> bool:
+        if self.ledger is None or budget is None or not budget.hard_limit:
+            return False
+        return projected_micros >= to_micros(budget.monthly_budget_usd) * (1 - self.ledger.hard_limit_margin)
+
+    def _locked_month_spend(self, tenant_id: str, reference: datetime) -> int:
+        """Month spend from the database while holding the tenant's budget row lock.
+
+        Other workers' ledgers cannot see each other's commits, so near a hard limit the database
+        decides. The lock serializes these checks per tenant until the ingest transaction ends, so a
+        transaction that evaluates several tenants must visit them in sorted order (as batch ingest
+        does); otherwise two of them can each hold a budget row the other is waiting for.
+        """
+        self.budgets.lock(tenant_id)
+        total = self.llm_events.month_cost_micros(reference, tenant_id).get(tenant_id, 0)
+        if self.ledger is not None:
+            self.ledger.sync(self.session, tenant_id, reference, total)
+        return total
+
+    def record_llm_cost(self, tenant_id: str, cost_usd: Decimal, timestamp: datetime) -> None:
+        if self.ledger is not None:
+            self.ledger.record(self.session, tenant_id, timestamp.astimezone(UTC), cost_usd)
+
+    @staticmethod
+    def _evaluate(
+        tenant_id: str,
+        budget: Budget | None,
+        current_micros: int,
+        new_cost_micros: int,
+    ) -> tuple[BudgetEvaluation, dict[str, Any] | None]:
+        projected_micros = current_micros + new_cost_micros
+        projected = micros_to_float(projected_micros)
+        current_spend = micros_to_float(current_micros)
 
         if budget is None:
-            return BudgetEvaluation(
-                allowed=True,
-                status="no_budget",
-                warning=None,
-                projected_spend_usd=float(projected),
-                current_spend_usd=float(current_spend),
-                monthly_budget_usd=None,
-                soft_limit_pct=None,
+            return (
+                BudgetEvaluation(
+                    allowed=True,
+                    status="no_budget",
+                    warning=None,
+                    projected_spend_usd=projected,
+                    current_spend_usd=current_spend,
+                    monthly_budget_usd=None,
+                    soft_limit_pct=None,
+                ),
+                None,
             )
 
+        budget_micros = to_micros(budget.monthly_budget_usd)
         soft_threshold = budget.monthly_budget_usd * Decimal(str(budget.soft_limit_pct))
-        if projected > budget.monthly_budget_usd and budget.hard_limit:
+        if projected_micros > budget_micros and budget.hard_limit:
             message = (
-                f"Hard budget limit exceeded for tenant {tenant_id}: projected={float(projected):.4f} "
+                f"Hard budget limit exceeded for tenant {tenant_id}: projected={projected:.4f} "
                 f"budget={float(budget.monthly_budget_usd):.4f}"
             )
-            self.alerts.create(
-                tenant_id=tenant_id,
-                alert_type="budget_hard_limit",
-                severity="critical",
-                message=message,
-                metadata_json={
-                    "current_spend_usd": float(current_spend),
-                    "projected_spend_usd": float(projected),
+            alert = {
+                "tenant_id": tenant_id,
+                "alert_type": "budget_hard_limit",
+                "severity": "critical",
+                "message": message,
+                "metadata_json": {
+                    "current_spend_usd": current_spend,
+                    "projected_spend_usd": projected,
                     "monthly_budget_usd": float(budget.monthly_budget_usd),
                 },
-            )
-            return BudgetEvaluation(
-                allowed=False,
-                status="hard_limit_exceeded",
-                warning=message,
-                projected_spend_usd=float(projected),
-                current_spend_usd=float(current_spend),
-                monthly_budget_usd=float(budget.monthly_budget_usd),
-                soft_limit_pct=float(budget.soft_limit_pct),
+            }
+            return (
+                BudgetEvaluation(
+                    allowed=False,
+                    status="hard_limit_exceeded",
+                    warning=message,
+                    projected_spend_usd=projected,
+                    current_spend_usd=current_spend,
+                    monthly_budget_usd=float(budget.monthly_budget_usd),
+                    soft_limit_pct=float(budget.soft_limit_pct),
+                ),
+                alert,
             )
 
-        if projected >= soft_threshold:
+        if projected_micros >= budget_micros * Decimal(str(budget.soft_limit_pct)):
             message = (
-                f"Soft budget threshold reached for tenant {tenant_id}: projected={float(projected):.4f} "
+                f"Soft budget threshold reached for tenant {tenant_id}: projected={projected:.4f} "
                 f"soft_limit={float(soft_threshold):.4f}"
             )
-            self.alerts.create(
-                tenant_id=tenant_id,
-                alert_type="budget_soft_limit",
-                severity="warning",
-                message=message,
-                metadata_json={
-                    "current_spend_usd": float(current_spend),
-                    "projected_spend_usd": float(projected),
+            alert = {
+                "tenant_id": tenant_id,
+                "alert_type": "budget_soft_limit",
+                "severity": "warning",
+                "message": message,
+                "metadata_json": {
+                    "current_spend_usd": current_spend,
+                    "projected_spend_usd": projected,
                     "monthly_budget_usd": float(budget.monthly_budget_usd),
                     "soft_limit_pct": float(budget.soft_limit_pct),
                 },
+            }
+            return (
+                BudgetEvaluation(
+                    allowed=True,
+                    status="soft_limit_exceeded",
+                    warning=message,
+                    projected_spend_usd=projected,
+                    current_spend_usd=current_spend,
+                    monthly_budget_usd=float(budget.monthly_budget_usd),
+                    soft_limit_pct=float(budget.soft_limit_pct),
+                ),
+                alert,
             )
-            return BudgetEvaluation(
+
+        return (
+            BudgetEvaluation(
                 allowed=True,
-                status="soft_limit_exceeded",
-                warning=message,
-                projected_spend_usd=float(projected),
-                current_spend_usd=float(current_spend),
+                status="ok",
+                warning=None,
+                projected_spend_usd=projected,
+                current_spend_usd=current_spend,
                 monthly_budget_usd=float(budget.monthly_budget_usd),
                 soft_limit_pct=float(budget.soft_limit_pct),
-            )
-
-        return BudgetEvaluation(
-            allowed=True,
-            status="ok",
-            warning=None,
-            projected_spend_usd=float(projected),
-            current_spend_usd=float(current_spend),
-            monthly_budget_usd=float(budget.monthly_budget_usd),
-            soft_limit_pct=float(budget.soft_limit_pct),
+            ),
+            None,
         )
 
     def get_status(self, tenant_id: str, now: datetime | None = None) -> dict[str, object]:
         reference = (now or datetime.now(UTC)).astimezone(UTC)
         budget = self.budgets.get(tenant_id)
-        spend = self.llm_events.month_cost_sum(tenant_id, reference)
-        revenue = self.revenue_events.month_revenue_sum(tenant_id, reference)
+        spend = self._month_spend_micros(tenant_id, reference)
+        revenue = to_micros(self.revenue_events.month_revenue_sum(tenant_id, reference))
         if budget is None:
             return {
                 "tenant_id": tenant_id,
                 "status": "no_budget",
                 "month": reference.strftime("%Y-%m"),
                 "monthly_budget_usd": None,
-                "monthly_spend_usd": float(spend),
-                "monthly_revenue_usd": float(revenue),
+                "monthly_spend_usd": micros_to_float(spend),
+                "monthly_revenue_usd": micros_to_float(revenue),
                 "remaining_budget_usd": None,
                 "soft_limit_pct": None,
                 "hard_limit": None,
                 "alerts": [self._serialize_alert(a) for a in self.alerts.list_recent(tenant_id, limit=10)],
             }
 
-        budget_value = Decimal(budget.monthly_budget_usd)
+        budget_value = to_micros(budget.monthly_budget_usd)
         remaining = budget_value - spend
         soft_threshold = budget_value * Decimal(str(budget.soft_limit_pct))
         if spend > budget_value:
@@ -163,10 +267,10 @@ class BudgetService:
             "tenant_id": tenant_id,
             "status": status,
             "month": reference.strftime("%Y-%m"),
-            "monthly_budget_usd": float(budget_value),
-            "monthly_spend_usd": float(spend),
-            "monthly_revenue_usd": float(revenue),
-            "remaining_budget_usd": float(remaining),
+            "monthly_budget_usd": micros_to_float(budget_value),
+            "monthly_spend_usd": micros_to_float(spend),
+            "monthly_revenue_usd": micros_to_float(revenue),
+            "remaining_budget_usd": micros_to_float(remaining),
             "soft_limit_pct": float(budget.soft_limit_pct),
             "hard_limit": bool(budget.hard_limit),
             "alerts": [self._serialize_alert(a) for a in self.alerts.list_recent(tenant_id, limit=10)],
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+
+# Money columns are ``Numeric(14, 6)``, so one micro-dollar is the smallest stored amount and
+# every stored value (and every sum of them) is an exact integer number of micros.
+MICROS_PER_USD = 1_000_000
+_MICRO = Decimal("0.000001")
+
+
+def to_micros(value: Decimal | int | float | str | None) -> int:
+    """Integer micro-dollars; values with more than six decimals round half up like the columns."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * MICROS_PER_USD
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return int(amount.quantize(_MICRO, rounding=ROUND_HALF_UP).scaleb(6))
+
+
+def micros_to_usd(micros: int) -> Decimal:
+    return Decimal(int(micros)).scaleb(-6)
+
+
+def micros_to_float(micros: int) -> float:
+    # int / int is correctly rounded, so this equals ``float(micros_to_usd(micros))``.
+    return micros / MICROS_PER_USD
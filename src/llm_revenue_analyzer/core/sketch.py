@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+
+
+def latency_bin(value: float) -> int:
+    if value < 1:
+        return 0
+    return math.ceil(math.log(value) / _LOG_GAMMA) + 1
+
+
+def bin_value(index: int) -> float:
+    if index <= 0:
+        return 0.0
+    return 2 * GAMMA ** (index - 1) / (GAMMA + 1)
+
+
+def nearest_rank(count: int, q: float) -> int:
+    return max(1, math.ceil(q * count))
+
+
+class LatencySketch:
+    """Mergeable log-bucketed quantile sketch (DDSketch-style).
+
+    Values are counted in bins whose bounds grow by ``GAMMA``; any reported quantile is within
+    ``RELATIVE_ACCURACY`` (1%) of the exact nearest-rank value. Values below 1 ms share bin 0.
+    """
+
+    __slots__ = ("bins", "count")
+
+    def __init__(self, bins: Mapping[int, int] | None = None) -> None:
+        self.bins: dict[int, int] = dict(bins or {})
+        self.count = sum(self.bins.values())
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> LatencySketch:
+        sketch = cls()
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.add_bin(latency_bin(value), count)
+
+    def add_bin(self, index: int, count: int) -> None:
+        self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: LatencySketch) -> LatencySketch:
+        for index, count in other.bins.items():
+            self.add_bin(index, count)
+        return self
+
+    def copy(self) -> LatencySketch:
+        return LatencySketch(self.bins)
+
+    def quantile(self, q: float) -> float | None:
+        if self.count <= 0:
+            return None
+        rank = nearest_rank(self.count, q)
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= rank:
+                return bin_value(index)
+        return bin_value(max(self.bins))
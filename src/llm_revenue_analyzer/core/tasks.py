@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+from llm_revenue_analyzer.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        func: Callable[[], object],
+        run_on_stop: bool = False,
+    ) -> None:
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_on_stop = run_on_stop
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is None:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+        if self.run_on_stop:
+            self._run_once()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self._run_once()
+
+    def _run_once(self) -> None:
+        try:
+            self.func()
+        except Exception:
+            logger.exception("periodic_task_failed", extra={"extra": {"task": self.name}})
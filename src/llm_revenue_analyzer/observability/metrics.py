@@ -8,6 +8,7 @@ from fastapi import Request, Response
 from prometheus_client import (
     CONTENT_TYPE_LATEST,
     Counter,
+    Gauge,
     Histogram,
     generate_latest,
     make_asgi_app,
@@ -28,6 +29,28 @@ EVENTS_INGESTED = Counter(
     "Business events ingested",
     ["event_type"],
 )
+LLM_DUPLICATES = Counter(
+    "lra_llm_duplicate_events_total",
+    "LLM events dropped as retries of an already stored request_id",
+)
+INGEST_BUFFER_DEPTH = Gauge(
+    "lra_ingest_buffer_depth",
+    "LLM events queued in the write-behind ingest buffer",
+)
+INGEST_BUFFER_EVENTS = Counter(
+    "lra_ingest_buffer_events_total",
+    "LLM events leaving the write-behind ingest buffer",
+    ["outcome"],
+)
+METRICS_CACHE_REQUESTS = Counter(
+    "lra_metrics_cache_requests_total",
+    "Metrics endpoint lookups in the response cache",
+    ["endpoint", "outcome"],
+)
+METRICS_CACHE_BYTES = Gauge(
+    "lra_metrics_cache_bytes",
+    "Approximate size of cached metrics responses",
+)
 LLM_COST_TOTAL = Counter(
     "lra_llm_cost_usd_total",
     "Total ingested LLM cost in USD",
@@ -36,6 +59,32 @@ REVENUE_TOTAL = Counter(
     "lra_revenue_usd_total",
     "Total ingested revenue in USD",
 )
+DB_POOL_SIZE = Gauge(
+    "lra_db_pool_size",
+    "Configured persistent connections in the database pool",
+    ["pool"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "lra_db_pool_checked_out",
+    "Database connections currently checked out",
+    ["pool"],
+)
+DB_POOL_OVERFLOW = Gauge(
+    "lra_db_pool_overflow",
+    "Database connections open beyond the pool size",
+    ["pool"],
+)
+DB_POOL_WAIT = Histogram(
+    "lra_db_pool_checkout_wait_seconds",
+    "Time spent obtaining a database connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "lra_db_pool_timeouts_total",
+    "Connection checkouts that timed out waiting for the pool",
+    ["pool"],
+)
 
 
 def metrics_asgi_app() -> Any:
@@ -56,15 +105,49 @@ async def instrument_request(
     return response
 
 
-def record_llm_ingest(cost_usd: float) -> None:
-    EVENTS_INGESTED.labels(event_type="llm").inc()
+def record_llm_ingest(cost_usd: float, count: int = 1) -> None:
+    EVENTS_INGESTED.labels(event_type="llm").inc(count)
     LLM_COST_TOTAL.inc(cost_usd)
 
 
+def record_llm_duplicates(count: int = 1) -> None:
+    LLM_DUPLICATES.inc(count)
+
+
+def record_ingest_buffer(depth: int, flushed: int = 0, dropped: int = 0) -> None:
+    INGEST_BUFFER_DEPTH.set(depth)
+    if flushed:
+        INGEST_BUFFER_EVENTS.labels(outcome="flushed").inc(flushed)
+    if dropped:
+        INGEST_BUFFER_EVENTS.labels(outcome="dropped").inc(dropped)
+
+
+def record_metrics_cache(endpoint: str, hit: bool, size_bytes: int) -> None:
+    METRICS_CACHE_REQUESTS.labels(endpoint=endpoint, outcome="hit" if hit else "miss").inc()
+    METRICS_CACHE_BYTES.set(size_bytes)
+
+
 def record_revenue_ingest(amount_usd: float) -> None:
     EVENTS_INGESTED.labels(event_type="revenue").inc()
     REVENUE_TOTAL.inc(amount_usd)
 
 
+def register_pool_gauges(
+    pool: str,
+    size: Callable[[], float],
+    checked_out: Callable[[], float],
+    overflow: Callable[[], float],
+) -> None:
+    DB_POOL_SIZE.labels(pool=pool).set_function(size)
+    DB_POOL_CHECKED_OUT.labels(pool=pool).set_function(checked_out)
+    DB_POOL_OVERFLOW.labels(pool=pool).set_function(lambda: max(overflow(), 0))
+
+
+def record_pool_checkout(pool: str, wait_seconds: float, timed_out: bool = False) -> None:
+    DB_POOL_WAIT.labels(pool=pool).observe(wait_seconds)
+    if timed_out:
+        DB_POOL_TIMEOUTS.labels(pool=pool).inc()
+
+
 def render_metrics_text() -> tuple[bytes, str]:
     return generate_latest(), CONTENT_TYPE_LATEST
@@ -4,5 +4,6 @@ from llm_revenue_analyzer.pricing.loader import (
     PricingError,
     PricingNotFound,
 )
+from llm_revenue_analyzer.pricing.watcher import PricingCatalogWatcher
 
-__all__ = ["PricingCatalog", "CostCalculator", "PricingError", "PricingNotFound"]
+__all__ = ["PricingCatalog", "PricingCatalogWatcher", "CostCalculator", "PricingError", "PricingNotFound"]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import numpy as np
+import numpy.typing as npt
+
+from llm_revenue_analyzer.core.money import micros_to_usd
+from llm_revenue_analyzer.pricing.loader import PricingCatalog, PricingError, PricingNotFound
+
+_INT64_MAX = np.iinfo(np.int64).max
+# Version lookups use a composite ``code << 40 | epoch_seconds`` key; entries without an
+# effective date sort first with seconds 0.
+_TS_BITS = 40
+_TS_MAX = (1 << _TS_BITS) - 1
+
+
+def _decimal_places(value: Decimal) -> int:
+    exponent = value.normalize().as_tuple().exponent
+    if not isinstance(exponent, int):
+        raise PricingError(f"price must be finite, got {value}")
+    return max(-exponent, 0)
+
+
+def epoch_seconds(timestamps: Sequence[datetime]) -> npt.NDArray[np.int64]:
+    return np.array(
+        [int((ts if ts.tzinfo else ts.replace(tzinfo=UTC)).timestamp()) for ts in timestamps], dtype=np.int64
+    )
+
+
+class BulkCostCalculator:
+    """Columnar pricing with exact integer arithmetic.
+
+    Prices are scaled to integers of ``10**-scale`` USD per 1k tokens, so
+    ``tokens * price`` is exact in units of ``10**-(scale + 3)`` USD and is then
+    rounded half-up to micro-dollars, matching ``CostCalculator.compute_cost_usd``.
+
+    Every effective-dated price is a row in the unit arrays, sorted by model code and
+    start time, so a batch of timestamps resolves with one ``searchsorted`` call.
+    Timestamps have one-second resolution.
+    """
+
+    def __init__(self, catalog: PricingCatalog) -> None:
+        versions = catalog.versions()
+        self.keys: list[tuple[str, str]] = sorted(versions)
+        self._codes = {key: code for code, key in enumerate(self.keys)}
+        entries = [(code, entry) for code, key in enumerate(self.keys) for entry in versions[key]]
+        self.scale = max(
+            (
+                _decimal_places(price)
+                for _, pricing in entries
+                for price in (pricing.input_per_1k_tokens, pricing.output_per_1k_tokens)
+            ),
+            default=0,
+        )
+        factor = Decimal(10) ** self.scale
+        self.version_codes = np.array([code for code, _ in entries], dtype=np.int64)
+        self.version_keys = (self.version_codes << _TS_BITS) | np.array(
+            [
+                0 if entry.effective_from is None else min(max(int(entry.effective_from.timestamp()), 1), _TS_MAX)
+                for _, entry in entries
+            ],
+            dtype=np.int64,
+        )
+        self.input_units = np.array([int(entry.input_per_1k_tokens * factor) for _, entry in entries], dtype=np.int64)
+        self.output_units = np.array([int(entry.output_per_1k_tokens * factor) for _, entry in entries], dtype=np.int64)
+        self._latest = np.searchsorted(self.version_keys, (np.arange(len(self.keys)) + 1) << _TS_BITS) - 1
+        exponent = self.scale + 3 - 6
+        self._divisor = 10**exponent if exponent > 0 else 1
+        self._multiplier = 10**-exponent if exponent < 0 else 1
+
+    def code(self, provider: str, model: str) -> int:
+        return self._codes.get((provider.lower(), model.lower()), -1)
+
+    def encode(self, providers: Sequence[str], models: Sequence[str]) -> npt.NDArray[np.int64]:
+        if len(providers) != len(models):
+            raise ValueError("providers and models must have the same length")
+        cache: dict[tuple[str, str], int] = {}
+        codes = np.empty(len(providers), dtype=np.int64)
+        for index, pair in enumerate(zip(providers, models, strict=True)):
+            code = cache.get(pair)
+            if code is None:
+                code = cache[pair] = self.code(*pair)
+            codes[index] = code
+        return codes
+
+    def compute_micros(
+        self,
+        codes: npt.ArrayLike,
+        prompt_tokens: npt.ArrayLike,
+        completion_tokens: npt.ArrayLike,
+        timestamps: npt.ArrayLike | None = None,
+    ) -> npt.NDArray[np.int64]:
+        """Micro-dollar costs; ``timestamps`` are epoch seconds, omitted means latest prices."""
+        code_array = np.asarray(codes, dtype=np.int64)
+        prompt = np.asarray(prompt_tokens, dtype=np.int64)
+        completion = np.asarray(completion_tokens, dtype=np.int64)
+        if not code_array.shape == prompt.shape == completion.shape:
+            raise ValueError("codes, prompt_tokens and completion_tokens must have the same shape")
+        if code_array.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        unknown = (code_array < 0) | (code_array >= len(self.keys))
+        if unknown.any():
+            raise PricingNotFound(f"No pricing configured for {int(unknown.sum())} rows (first at index {int(unknown.argmax())})")
+        if (prompt < 0).any() or (completion < 0).any():
+            raise ValueError("token counts must be non-negative")
+
+        rows = self._version_rows(code_array, timestamps)
+        input_units = self.input_units[rows]
+        output_units = self.output_units[rows]
+        bound = int(prompt.max()) * int(self.input_units.max(initial=0)) + int(completion.max()) * int(
+            self.output_units.max(initial=0)
+        )
+        if bound * self._multiplier + self._divisor // 2 > _INT64_MAX:
+            return self._compute_micros_exact(input_units, output_units, prompt, completion)
+
+        units = prompt * input_units + completion * output_units
+        if self._divisor > 1:
+            return (units + self._divisor // 2) // self._divisor
+        return units * self._multiplier
+
+    def compute_cost_usd(
+        self,
+        providers: Sequence[str],
+        models: Sequence[str],
+        prompt_tokens: npt.ArrayLike,
+        completion_tokens: npt.ArrayLike,
+        timestamps: Sequence[datetime] | None = None,
+    ) -> list[Decimal]:
+        micros = self.compute_micros(
+            self.encode(providers, models),
+            prompt_tokens,
+            completion_tokens,
+            None if timestamps is None else epoch_seconds(timestamps),
+        )
+        return [micros_to_usd(value) for value in micros.tolist()]
+
+    def _version_rows(
+        self, code_array: npt.NDArray[np.int64], timestamps: npt.ArrayLike | None
+    ) -> npt.NDArray[np.intp]:
+        if timestamps is None:
+            return self._latest[code_array]
+        seconds = np.asarray(timestamps, dtype=np.int64)
+        if seconds.shape != code_array.shape:
+            raise ValueError("timestamps must have the same shape as codes")
+        query = (code_array << _TS_BITS) | np.clip(seconds, 1, _TS_MAX)
+        rows = np.searchsorted(self.version_keys, query, side="right") - 1
+        missing = (rows < 0) | (self.version_codes[np.maximum(rows, 0)] != code_array)
+        if missing.any():
+            raise PricingNotFound(
+                f"No pricing effective for {int(missing.sum())} rows (first at index {int(missing.argmax())})"
+            )
+        return rows
+
+    def _compute_micros_exact(
+        self,
+        input_units: npt.NDArray[np.int64],
+        output_units: npt.NDArray[np.int64],
+        prompt: npt.NDArray[np.int64],
+        completion: npt.NDArray[np.int64],
+    ) -> npt.NDArray[np.int64]:
+        units = prompt.astype(object) * input_units.astype(object) + completion.astype(object) * output_units.astype(
+            object
+        )
+        micros = (units + self._divisor // 2) // self._divisor * self._multiplier
+        if micros.size and max(micros) > _INT64_MAX:
+            raise PricingError("cost exceeds the int64 micro-dollar range")
+        return micros.astype(np.int64)
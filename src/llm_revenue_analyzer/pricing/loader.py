@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
+from datetime import UTC, date, datetime, time
 from decimal import ROUND_HALF_UP, Decimal
 from pathlib import Path
+from typing import Any
 
 import yaml
 
@@ -22,25 +27,79 @@ class ModelPricing:
     input_per_1k_tokens: Decimal
     output_per_1k_tokens: Decimal
     currency: str = "USD"
+    effective_from: datetime | None = None
 
 
-class PricingCatalog:
-    def __init__(self, models: dict[tuple[str, str], ModelPricing]) -> None:
-        self._models = models
+ALWAYS = datetime.min.replace(tzinfo=UTC)
+
+
+def _effective_from(value: Any, label: str) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError as exc:
+            raise PricingError(f"{label}: invalid effective_from {value!r}") from exc
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=UTC)
+    if isinstance(value, date):
+        return datetime.combine(value, time.min, tzinfo=UTC)
+    raise PricingError(f"{label}: invalid effective_from {value!r}")
+
 
-    def get(self, provider: str, model: str) -> ModelPricing:
+class PricingCatalog:
+    def __init__(
+        self,
+        models: Mapping[tuple[str, str], ModelPricing | Sequence[ModelPricing]],
+        version: str = "unversioned",
+    ) -> None:
+        self._versions: dict[tuple[str, str], list[ModelPricing]] = {}
+        self._starts: dict[tuple[str, str], list[datetime]] = {}
+        for key, entries in models.items():
+            ordered = sorted(
+                [entries] if isinstance(entries, ModelPricing) else entries,
+                key=lambda entry: entry.effective_from or ALWAYS,
+            )
+            starts = [entry.effective_from or ALWAYS for entry in ordered]
+            if len(set(starts)) != len(starts):
+                raise PricingError(f"duplicate effective_from for {key[0]}/{key[1]}")
+            self._versions[key] = ordered
+            self._starts[key] = starts
+        self._models = {key: entries[-1] for key, entries in self._versions.items()}
+        self.version = version
+
+    def get(self, provider: str, model: str, at: datetime | None = None) -> ModelPricing:
         key = (provider.lower(), model.lower())
-        if key not in self._models:
+        if key not in self._versions:
             raise PricingNotFound(f"No pricing configured for provider={provider} model={model}")
-        return self._models[key]
+        if at is None:
+            return self._models[key]
+        at_utc = at if at.tzinfo else at.replace(tzinfo=UTC)
+        index = bisect_right(self._starts[key], at_utc) - 1
+        if index < 0:
+            raise PricingNotFound(
+                f"No pricing effective for provider={provider} model={model} at {at_utc.isoformat()}"
+            )
+        return self._versions[key][index]
+
+    def models(self) -> dict[tuple[str, str], ModelPricing]:
+        return dict(self._models)
+
+    def versions(self) -> dict[tuple[str, str], list[ModelPricing]]:
+        return {key: list(entries) for key, entries in self._versions.items()}
 
     @classmethod
     def from_yaml(cls, path: Path) -> PricingCatalog:
-        raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+        return cls.from_bytes(path.read_bytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> PricingCatalog:
+        raw = yaml.safe_load(data.decode("utf-8"))
         if not isinstance(raw, dict) or "providers" not in raw:
             raise PricingError("pricing.yaml must contain top-level 'providers'")
 
-        models: dict[tuple[str, str], ModelPricing] = {}
+        models: dict[tuple[str, str], list[ModelPricing]] = {}
         providers = raw.get("providers", {})
         if not isinstance(providers, dict):
             raise PricingError("'providers' must be a mapping")
@@ -54,14 +113,31 @@ class PricingCatalog:
             for model_name, model_data in provider_models.items():
                 if not isinstance(model_data, dict):
                     raise PricingError(f"model entry for {provider_name}/{model_name} must be a mapping")
-                models[(str(provider_name).lower(), str(model_name).lower())] = ModelPricing(
-                    provider=str(provider_name),
-                    model=str(model_name),
-                    input_per_1k_tokens=Decimal(str(model_data["input_per_1k_tokens"])),
-                    output_per_1k_tokens=Decimal(str(model_data["output_per_1k_tokens"])),
-                    currency=str(model_data.get("currency", "USD")),
-                )
-        return cls(models)
+                history = model_data.get("history", [])
+                if not isinstance(history, list):
+                    raise PricingError(f"model entry for {provider_name}/{model_name}.history must be a list")
+                models[(str(provider_name).lower(), str(model_name).lower())] = [
+                    _model_pricing(str(provider_name), str(model_name), entry, model_data)
+                    for entry in (model_data, *history)
+                ]
+        version = raw.get("version")
+        if version is None:
+            version = f"sha256:{hashlib.sha256(data).hexdigest()[:12]}"
+        return cls(models, version=str(version))
+
+
+def _model_pricing(provider: str, model: str, entry: Any, defaults: dict[str, Any]) -> ModelPricing:
+    label = f"model entry for {provider}/{model}"
+    if not isinstance(entry, dict):
+        raise PricingError(f"{label} history items must be mappings")
+    return ModelPricing(
+        provider=provider,
+        model=model,
+        input_per_1k_tokens=Decimal(str(entry["input_per_1k_tokens"])),
+        output_per_1k_tokens=Decimal(str(entry["output_per_1k_tokens"])),
+        currency=str(entry.get("currency", defaults.get("currency", "USD"))),
+        effective_from=_effective_from(entry.get("effective_from"), label),
+    )
 
 
 class CostCalculator:
@@ -74,8 +150,9 @@ class CostCalculator:
         model: str,
         prompt_tokens: int,
         completion_tokens: int,
+        at: datetime | None = None,
     ) -> Decimal:
-        pricing = self.catalog.get(provider=provider, model=model)
+        pricing = self.catalog.get(provider=provider, model=model, at=at)
         prompt_cost = (Decimal(prompt_tokens) / Decimal(1000)) * pricing.input_per_1k_tokens
         completion_cost = (Decimal(completion_tokens) / Decimal(1000)) * pricing.output_per_1k_tokens
         total = prompt_cost + completion_cost
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.core.money import micros_to_usd
+from llm_revenue_analyzer.core.settings import Settings
+from llm_revenue_analyzer.pricing.loader import CostCalculator, PricingCatalog, PricingNotFound
+from llm_revenue_analyzer.store.db import get_session_factory
+from llm_revenue_analyzer.store.repos import LLMEventRepo, RollupRepo
+
+if TYPE_CHECKING:
+    from llm_revenue_analyzer.pricing.bulk import BulkCostCalculator
+
+logger = get_logger(__name__)
+
+IdRange = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class RepriceScope:
+    from_ts: datetime
+    to_ts: datetime
+    tenant_id: str | None = None
+    include_legacy: bool = False
+
+
+@dataclass
+class RepriceStats:
+    scanned: int = 0
+    updated: int = 0
+    unpriced: int = 0
+    cost_delta_usd: Decimal = Decimal("0")
+    elapsed_seconds: float = 0.0
+    ranges: int = 0
+    skipped_ranges: int = 0
+    rollup_rows: int = 0
+
+    def merge(self, other: RepriceStats) -> None:
+        self.scanned += other.scanned
+        self.updated += other.updated
+        self.unpriced += other.unpriced
+        self.cost_delta_usd += other.cost_delta_usd
+        self.ranges += other.ranges
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.scanned / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def _bulk_calculator(catalog: PricingCatalog) -> BulkCostCalculator | None:
+    try:
+        from llm_revenue_analyzer.pricing.bulk import BulkCostCalculator
+    except ImportError:
+        return None
+    return BulkCostCalculator(catalog)
+
+
+def _price_rows(catalog: PricingCatalog, bulk: BulkCostCalculator | None, rows: Sequence[Row[Any]]) -> list[Decimal | None]:
+    if bulk is None:
+        calculator = CostCalculator(catalog)
+        prices: list[Decimal | None] = []
+        for row in rows:
+            try:
+                prices.append(
+                    calculator.compute_cost_usd(
+                        row.provider, row.model, row.prompt_tokens, row.completion_tokens, at=row.timestamp
+                    )
+                )
+            except PricingNotFound:
+                prices.append(None)
+        return prices
+
+    from llm_revenue_analyzer.pricing.bulk import epoch_seconds
+
+    codes = bulk.encode([row.provider for row in rows], [row.model for row in rows])
+    known = codes >= 0
+    known_rows = [row for row, ok in zip(rows, known.tolist(), strict=True) if ok]
+    try:
+        micros = bulk.compute_micros(
+            codes[known],
+            [row.prompt_tokens for row in known_rows],
+            [row.completion_tokens for row in known_rows],
+            epoch_seconds([row.timestamp for row in known_rows]),
+        ).tolist()
+    except PricingNotFound:
+        # Some rows predate their model's earliest price; resolve them individually.
+        return _price_rows(catalog, None, rows)
+    priced = iter(micros)
+    return [micros_to_usd(next(priced)) if ok else None for ok in known.tolist()]
+
+
+def reprice_range(
+    session: Session,
+    catalog: PricingCatalog,
+    scope: RepriceScope,
+    id_range: IdRange,
+    chunk_size: int,
+) -> RepriceStats:
+    repo = LLMEventRepo(session)
+    bulk = _bulk_calculator(catalog)
+    stats = RepriceStats(ranges=1)
+    start = perf_counter()
+    after_id, until_id = id_range[0] - 1, id_range[1]
+    while True:
+        rows = repo.list_computed_costs(
+            scope.from_ts,
+            scope.to_ts,
+            after_id=after_id,
+            until_id=until_id,
+            limit=chunk_size,
+            tenant_id=scope.tenant_id,
+            include_legacy=scope.include_legacy,
+        )
+        if not rows:
+            break
+        changes: list[dict[str, Any]] = []
+        for row, cost in zip(rows, _price_rows(catalog, bulk, rows), strict=True):
+            if cost is None:
+                stats.unpriced += 1
+            elif cost != row.cost_usd or row.pricing_version != catalog.version:
+                changes.append({"id": row.id, "timestamp": row.timestamp, "cost_usd": cost})
+                stats.cost_delta_usd += cost - row.cost_usd
+        stats.updated += repo.update_costs(changes, pricing_version=catalog.version)
+        stats.scanned += len(rows)
+        session.commit()
+        after_id = rows[-1].id
+    stats.elapsed_seconds = perf_counter() - start
+    return stats
+
+
+def _reprice_worker(
+    database_url: str,
+    pricing_file: str,
+    scope: RepriceScope,
+    id_range: IdRange,
+    chunk_size: int,
+) -> RepriceStats:
+    settings = Settings(database_url=database_url, pricing_file=pricing_file)
+    catalog = PricingCatalog.from_yaml(settings.pricing_path)
+    with get_session_factory(settings)() as session:
+        return reprice_range(session, catalog, scope, id_range, chunk_size)
+
+
+def split_id_range(low: int, high: int, span: int) -> list[IdRange]:
+    return [(start, min(start + span - 1, high)) for start in range(low, high + 1, span)]
+
+
+@dataclass
+class RepricingJob:
+    """Recompute stored LLM costs for a window from the current pricing catalog.
+
+    Work is split into contiguous id ranges processed with keyset pagination. Completed
+    ranges are recorded in ``checkpoint_path`` so an interrupted job resumes where it
+    stopped. Rollups for the window are rebuilt once all ranges are done.
+    """
+
+    settings: Settings
+    scope: RepriceScope
+    chunk_size: int = 5000
+    chunks_per_range: int = 20
+    workers: int = 1
+    checkpoint_path: Path | None = None
+    progress: Callable[[RepriceStats, int], None] | None = None
+    _done: set[IdRange] = field(default_factory=set, init=False)
+    _signature: str | None = field(default=None, init=False)
+
+    def signature(self) -> str:
+        if self._signature is None:
+            self._signature = self._compute_signature()
+        return self._signature
+
+    def _compute_signature(self) -> str:
+        digest = hashlib.sha256(self.settings.pricing_path.read_bytes()).hexdigest()
+        return "|".join(
+            [
+                self.scope.from_ts.isoformat(),
+                self.scope.to_ts.isoformat(),
+                self.scope.tenant_id or "*",
+                str(self.scope.include_legacy),
+                str(self.chunk_size * self.chunks_per_range),
+                digest,
+            ]
+        )
+
+    def run(self) -> RepriceStats:
+        start = perf_counter()
+        stats = RepriceStats()
+        with get_session_factory(self.settings)() as session:
+            bounds = LLMEventRepo(session).computed_cost_id_bounds(
+                self.scope.from_ts,
+                self.scope.to_ts,
+                tenant_id=self.scope.tenant_id,
+                include_legacy=self.scope.include_legacy,
+            )
+        ranges = split_id_range(*bounds, self.chunk_size * self.chunks_per_range) if bounds else []
+        self._load_checkpoint()
+        pending = [id_range for id_range in ranges if id_range not in self._done]
+        stats.skipped_ranges = len(ranges) - len(pending)
+
+        for range_stats, id_range in self._execute(pending):
+            stats.merge(range_stats)
+            self._done.add(id_range)
+            self._save_checkpoint()
+            stats.elapsed_seconds = perf_counter() - start
+            if self.progress is not None:
+                self.progress(stats, len(pending))
+
+        if stats.updated or stats.skipped_ranges:
+            with get_session_factory(self.settings)() as session:
+                stats.rollup_rows = RollupRepo(session).rebuild(
+                    self.scope.from_ts, self.scope.to_ts, tenant_id=self.scope.tenant_id
+                )
+                session.commit()
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+
+        stats.elapsed_seconds = perf_counter() - start
+        logger.info(
+            "llm_costs_repriced",
+            extra={
+                "extra": {
+                    "scanned": stats.scanned,
+                    "updated": stats.updated,
+                    "unpriced": stats.unpriced,
+                    "cost_delta_usd": float(stats.cost_delta_usd),
+                    "rows_per_second": round(stats.rows_per_second, 1),
+                    "ranges": stats.ranges,
+                    "skipped_ranges": stats.skipped_ranges,
+                }
+            },
+        )
+        return stats
+
+    def _execute(self, pending: list[IdRange]) -> Iterator[tuple[RepriceStats, IdRange]]:
+        if self.workers <= 1:
+            catalog = PricingCatalog.from_yaml(self.settings.pricing_path)
+            with get_session_factory(self.settings)() as session:
+                for id_range in pending:
+                    yield reprice_range(session, catalog, self.scope, id_range, self.chunk_size), id_range
+            return
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures: dict[Future[RepriceStats], IdRange] = {
+                pool.submit(
+                    _reprice_worker,
+                    self.settings.database_url,
+                    self.settings.pricing_file,
+                    self.scope,
+                    id_range,
+                    self.chunk_size,
+                ): id_range
+                for id_range in pending
+            }
+            for future in as_completed(futures):
+                yield future.result(), futures[future]
+
+    def _load_checkpoint(self) -> None:
+        self._done = set()
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return
+        data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        if data.get("signature") != self.signature():
+            logger.warning("reprice_checkpoint_ignored", extra={"extra": {"path": str(self.checkpoint_path)}})
+            return
+        self._done = {(int(low), int(high)) for low, high in data.get("done", [])}
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_path is None:
+            return
+        payload = {"signature": self.signature(), "done": sorted(self._done)}
+        tmp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, self.checkpoint_path)
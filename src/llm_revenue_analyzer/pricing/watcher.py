@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.pricing.loader import PricingCatalog
+
+logger = get_logger(__name__)
+
+FileStamp = tuple[int, int]
+
+
+class PricingCatalogWatcher:
+    """Holds the current pricing catalog and swaps in a new version when the YAML file changes."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp: FileStamp | None = None
+        self._catalog: PricingCatalog | None = None
+
+    @property
+    def current(self) -> PricingCatalog:
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._stamp = self._file_stamp()
+                    self._catalog = PricingCatalog.from_yaml(self.path)
+                catalog = self._catalog
+        return catalog
+
+    def refresh(self) -> bool:
+        active = self.current
+        with self._lock:
+            try:
+                stamp = self._file_stamp()
+            except OSError:
+                logger.exception("pricing_catalog_stat_failed", extra={"extra": {"path": str(self.path)}})
+                return False
+            if stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            try:
+                catalog = PricingCatalog.from_bytes(self.path.read_bytes())
+            except Exception:
+                logger.exception(
+                    "pricing_catalog_reload_failed",
+                    extra={"extra": {"path": str(self.path), "active_version": active.version}},
+                )
+                return False
+            if catalog.version == active.version:
+                return False
+            previous, self._catalog = active.version, catalog
+        logger.info(
+            "pricing_catalog_reloaded",
+            extra={"extra": {"path": str(self.path), "version": catalog.version, "previous_version": previous}},
+        )
+        return True
+
+    def _file_stamp(self) -> FileStamp:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import cast
+
+from llm_revenue_analyzer.analytics.bench import BENCH_ENDPOINTS, run_bench, seed_synthetic
+from llm_revenue_analyzer.analytics.service import AnalyticsEngine
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.store.db import create_all, get_session_factory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure statements, rows returned and wall time per analytics endpoint.")
+    parser.add_argument("--events", type=int, default=50_000, help="synthetic LLM events to generate")
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--days", type=int, default=14, help="window length ending now")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--engines", default="python,rollup,sql")
+    parser.add_argument("--endpoints", default=",".join(BENCH_ENDPOINTS))
+    parser.add_argument("--tenant", default=None, help="benchmark existing data of this tenant instead of seeding")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    to_ts = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1, minutes=7)
+    from_ts = to_ts - timedelta(days=args.days)
+    tenant_id = args.tenant
+    if tenant_id is None:
+        # Seed a throwaway SQLite database so the configured one is never written to.
+        workdir = Path(tempfile.mkdtemp(prefix="lra-bench-"))
+        settings = settings.model_copy(update={"database_url": f"sqlite+pysqlite:///{workdir / 'bench.db'}"})
+        create_all(settings)
+        with get_session_factory(settings)() as session:
+            tenant_id = seed_synthetic(session, args.tenants, args.events, from_ts, to_ts)[0]
+        print(f"seeded {args.events} events for {args.tenants} tenants into {workdir / 'bench.db'}")
+
+    results = run_bench(
+        settings,
+        tenant_id,
+        from_ts,
+        to_ts,
+        engines=cast(list[AnalyticsEngine], [engine for engine in args.engines.split(",") if engine]),
+        endpoints=[endpoint for endpoint in args.endpoints.split(",") if endpoint],
+        repeat=args.repeat,
+    )
+    print(f"tenant={tenant_id} window={from_ts.isoformat()}..{to_ts.isoformat()}")
+    print(f"{'endpoint':<12} {'engine':<7} {'statements':>10} {'rows_returned':>13} {'median_ms':>10}")
+    for result in results:
+        print(
+            f"{result.endpoint:<12} {result.engine:<7} {result.statements:>10} {result.rows_returned:>13} "
+            f"{result.median_ms:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from llm_revenue_analyzer.api.app import create_app
+from llm_revenue_analyzer.core.settings import Settings, get_settings
+from llm_revenue_analyzer.store.db import create_all, get_session_factory, reset_engine
+from llm_revenue_analyzer.store.models import LLMEvent, LLMHourlyRollup
+from llm_revenue_analyzer.store.repos import TenantRepo
+
+MODELS = [("openai", "gpt-4o-mini"), ("openai", "gpt-4.1-mini"), ("anthropic", "claude-3-5-haiku")]
+
+
+def _batches(args: argparse.Namespace, run_id: str) -> list[list[dict[str, Any]]]:
+    rng = random.Random(args.seed)
+    hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    events = [
+        {
+            "timestamp": (hour - timedelta(hours=rng.randrange(args.hours), seconds=rng.randrange(3600))).isoformat(),
+            "tenant_id": f"bench-tenant-{rng.randrange(args.tenants)}",
+            "user_id": f"user-{rng.randrange(100)}",
+            "request_id": f"{run_id}-{idx}",
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": rng.randint(10, 4_000),
+            "completion_tokens": rng.randint(10, 1_000),
+            "latency_ms": rng.randint(50, 5_000),
+            "status": "success" if rng.random() > 0.02 else "error",
+            "feature": rng.choice(["chat", "search", "summarize"]),
+        }
+        for idx in range(args.events)
+        for provider, model in [rng.choice(MODELS)]
+    ]
+    return [events[i : i + args.batch_size] for i in range(0, len(events), args.batch_size)]
+
+
+def _run(settings: Settings, batches: list[list[dict[str, Any]]], threads: int) -> tuple[float, float, int, int]:
+    create_all(settings)
+    with get_session_factory(settings)() as session:
+        # Tenants exist up front so the timed run measures ingest, not racing first inserts.
+        for tenant_id in sorted({event["tenant_id"] for batch in batches for event in batch}):
+            TenantRepo(session).ensure(tenant_id)
+        session.commit()
+    app = create_app(settings)
+    app.dependency_overrides[get_settings] = lambda: settings
+    try:
+        with TestClient(app) as client:
+
+            def post(batch: list[dict[str, Any]]) -> None:
+                response = client.post("/events/llm/batch", json=batch)
+                response.raise_for_status()
+
+            start = perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(post, batches))
+            ingest_s = perf_counter() - start
+            compactor = app.state.rollup_compactor
+            start = perf_counter()
+            if compactor is not None:
+                compactor.run()
+            compact_s = perf_counter() - start
+        with get_session_factory(settings)() as session:
+            events = session.scalar(select(func.count()).select_from(LLMEvent)) or 0
+            rolled_up = session.scalar(select(func.coalesce(func.sum(LLMHourlyRollup.requests), 0))) or 0
+        return ingest_s, compact_s, int(events), int(rolled_up)
+    finally:
+        reset_engine()
+        get_settings.cache_clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure batch ingest throughput with inline and deferred rollups.")
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent clients posting batches")
+    parser.add_argument("--tenants", type=int, default=4, help="few tenants and hours keep rollup rows contended")
+    parser.add_argument("--hours", type=int, default=2)
+    parser.add_argument("--modes", default="inline,deferred")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--database-url", default=None, help="scratch database to write to; defaults to a throwaway SQLite file per mode"
+    )
+    args = parser.parse_args()
+
+    base = get_settings().model_copy(update={"ingest_mode": "sync", "anomaly_check_interval_seconds": 3600})
+    print(f"events={args.events} batch_size={args.batch_size} threads={args.threads} tenants={args.tenants} hours={args.hours}")
+    print(f"{'mode':<9} {'ingest_s':>9} {'events/s':>9} {'compact_s':>10} {'stored':>8} {'rolled_up':>10}")
+    for mode in [mode for mode in args.modes.split(",") if mode]:
+        database_url = args.database_url
+        if database_url is None:
+            workdir = Path(tempfile.mkdtemp(prefix="lra-bench-ingest-"))
+            database_url = f"sqlite+pysqlite:///{workdir / 'bench.db'}"
+        settings = base.model_copy(update={"database_url": database_url, "rollup_mode": mode, "rollup_compact_seconds": 3600})
+        # Fresh request ids per mode so a shared --database-url does not turn the second run into retries.
+        batches = _batches(args, uuid.uuid4().hex[:8])
+        ingest_s, compact_s, stored, rolled_up = _run(settings, batches, args.threads)
+        print(
+            f"{mode:<9} {ingest_s:>9.2f} {args.events / ingest_s:>9.0f} {compact_s:>10.2f} {stored:>8} {rolled_up:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import random
+from time import perf_counter
+
+import numpy as np
+
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.pricing import CostCalculator, PricingCatalog
+from llm_revenue_analyzer.core.money import micros_to_usd
+from llm_revenue_analyzer.pricing.bulk import BulkCostCalculator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare scalar and vectorized LLM cost computation.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verify", type=int, default=100_000, help="rows to compare against the scalar path")
+    args = parser.parse_args()
+
+    catalog = PricingCatalog.from_yaml(get_settings().pricing_path)
+    scalar = CostCalculator(catalog)
+    bulk = BulkCostCalculator(catalog)
+    keys = [pricing for pricing in catalog.models().values()]
+
+    rng = random.Random(args.seed)
+    picks = [rng.choice(keys) for _ in range(args.rows)]
+    providers = [pricing.provider for pricing in picks]
+    models = [pricing.model for pricing in picks]
+    prompt = np.array([rng.randint(0, 20_000) for _ in range(args.rows)], dtype=np.int64)
+    completion = np.array([rng.randint(0, 4_000) for _ in range(args.rows)], dtype=np.int64)
+
+    start = perf_counter()
+    codes = bulk.encode(providers, models)
+    encode_s = perf_counter() - start
+    start = perf_counter()
+    micros = bulk.compute_micros(codes, prompt, completion)
+    bulk_s = perf_counter() - start
+
+    sample = min(args.verify, args.rows)
+    prompt_list, completion_list = prompt.tolist(), completion.tolist()
+    start = perf_counter()
+    expected = [
+        scalar.compute_cost_usd(providers[i], models[i], prompt_list[i], completion_list[i]) for i in range(sample)
+    ]
+    scalar_s = (perf_counter() - start) * args.rows / sample if sample else 0.0
+
+    mismatches = sum(1 for i in range(sample) if micros_to_usd(int(micros[i])) != expected[i])
+    print(f"rows={args.rows} catalog_models={len(bulk.keys)} price_scale=1e-{bulk.scale}")
+    print(f"scalar   {scalar_s:8.3f}s (extrapolated from {sample} rows)")
+    print(f"encode   {encode_s:8.3f}s")
+    print(f"vector   {bulk_s:8.3f}s  speedup x{scalar_s / bulk_s if bulk_s else float('inf'):.0f} (compute only)")
+    print(f"verified {sample} rows, mismatches={mismatches}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
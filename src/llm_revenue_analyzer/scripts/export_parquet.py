@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.store.parquet import ParquetExporter
+
+
+def _export(args: argparse.Namespace) -> None:
+    to_ts = args.to_ts or datetime.now(UTC)
+    from_ts = args.from_ts or to_ts - timedelta(days=args.days)
+    stats = ParquetExporter(get_settings(), args.root, page_size=args.page_size).export(
+        from_ts, to_ts, tenant_id=args.tenant_id
+    )
+    print(
+        f"Exported rows={stats.rows} partitions={stats.partitions} removed={stats.removed_partitions} "
+        f"elapsed={stats.elapsed_seconds:.2f}s root={args.root}"
+    )
+
+
+def _report(args: argparse.Namespace) -> None:
+    from llm_revenue_analyzer.analytics.offline import OfflineAnalytics
+
+    engine = OfflineAnalytics(args.root, workers=args.workers)
+    quantiles = [float(value) for value in args.quantiles.split(",")] if args.quantiles else []
+    result: object
+    if args.report == "summary":
+        result = engine.summary(args.tenant_id, args.from_ts, args.to_ts, quantiles)
+    elif args.report == "by-model":
+        result = engine.by_model(args.tenant_id, args.from_ts, args.to_ts, args.granularity, quantiles)
+    else:
+        result = engine.by_feature(args.tenant_id, args.from_ts, args.to_ts, args.granularity, quantiles)
+    print(json.dumps(result, indent=2, default=str))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export events to partitioned Parquet and run offline reports.")
+    parser.add_argument("--root", type=Path, default=Path("data/parquet"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write <root>/<table>/tenant_id=<t>/day=<d>/part-0.parquet")
+    export.add_argument("--days", type=int, default=1, help="export the last N days (default 1)")
+    export.add_argument("--from", dest="from_ts", type=datetime.fromisoformat, default=None)
+    export.add_argument("--to", dest="to_ts", type=datetime.fromisoformat, default=None)
+    export.add_argument("--tenant-id", default=None)
+    export.add_argument("--page-size", type=int, default=50_000)
+    export.set_defaults(func=_export)
+
+    report = commands.add_parser("report", help="compute analytics over exported files")
+    report.add_argument("report", choices=["summary", "by-model", "by-feature"])
+    report.add_argument("--tenant-id", required=True)
+    report.add_argument("--from", dest="from_ts", type=datetime.fromisoformat, required=True)
+    report.add_argument("--to", dest="to_ts", type=datetime.fromisoformat, required=True)
+    report.add_argument("--granularity", choices=["total", "day"], default="total")
+    report.add_argument("--quantiles", default="")
+    report.add_argument("--workers", type=int, default=None)
+    report.set_defaults(func=_report)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
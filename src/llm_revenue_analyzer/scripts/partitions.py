@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date
+
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.store.db import get_engine
+from llm_revenue_analyzer.store.partitions import PartitionManager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create future llm_events partitions and expire old ones.")
+    parser.add_argument("--today", type=date.fromisoformat, default=None, help="override the current UTC date")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    plan = PartitionManager.from_settings(get_engine(settings), settings).run(today=args.today)
+    print(f"created={[item.name for item in plan.create]}")
+    print(f"expired={[item.name for item in plan.expire]} archive={settings.llm_partition_archive}")
+
+
+if __name__ == "__main__":
+    main()
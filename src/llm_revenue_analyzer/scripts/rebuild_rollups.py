@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import argparse
+from datetime import UTC, datetime, timedelta
+
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.store.db import get_session_factory
+from llm_revenue_analyzer.store.repos import RollupRepo
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild hourly LLM rollups from raw events.")
+    parser.add_argument("--days", type=int, default=30, help="rebuild the last N days (default 30)")
+    parser.add_argument("--from", dest="from_ts", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--to", dest="to_ts", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--tenant-id", default=None)
+    args = parser.parse_args()
+
+    to_ts = args.to_ts or datetime.now(UTC) + timedelta(hours=1)
+    from_ts = args.from_ts or to_ts - timedelta(days=args.days)
+    session_factory = get_session_factory(get_settings())
+    with session_factory() as session:
+        rows = RollupRepo(session).rebuild(from_ts, to_ts, tenant_id=args.tenant_id)
+        session.commit()
+    print(f"Rebuilt rollups from={from_ts.isoformat()} to={to_ts.isoformat()} rows={rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.pricing.reprice import RepriceScope, RepriceStats, RepricingJob
+
+
+def _report(stats: RepriceStats, total: int) -> None:
+    print(
+        f"ranges {stats.ranges}/{total} scanned={stats.scanned} updated={stats.updated} "
+        f"rate={stats.rows_per_second:,.0f} rows/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute computed LLM event costs from data/pricing.yaml.")
+    parser.add_argument("--days", type=int, default=30, help="reprice the last N days (default 30)")
+    parser.add_argument("--from", dest="from_ts", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--to", dest="to_ts", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--tenant-id", default=None)
+    parser.add_argument("--include-legacy", action="store_true", help="also reprice rows with unknown cost source")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--checkpoint", type=Path, default=Path(".reprice-checkpoint.json"))
+    args = parser.parse_args()
+
+    to_ts = args.to_ts or (datetime.now(UTC) + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+    from_ts = args.from_ts or to_ts - timedelta(days=args.days)
+    job = RepricingJob(
+        settings=get_settings(),
+        scope=RepriceScope(from_ts, to_ts, tenant_id=args.tenant_id, include_legacy=args.include_legacy),
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        progress=_report,
+    )
+    stats = job.run()
+    print(
+        f"Repriced from={from_ts.isoformat()} to={to_ts.isoformat()} scanned={stats.scanned} "
+        f"updated={stats.updated} unpriced={stats.unpriced} delta_usd={stats.cost_delta_usd} "
+        f"resumed_ranges={stats.skipped_ranges} rollup_rows={stats.rollup_rows} "
+        f"elapsed={stats.elapsed_seconds:.2f}s rate={stats.rows_per_second:,.0f} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
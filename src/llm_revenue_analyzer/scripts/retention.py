@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import argparse
+
+from llm_revenue_analyzer.core.settings import get_settings
+from llm_revenue_analyzer.store.retention import RetentionJob
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fold old raw LLM events into hourly rollups and delete them.")
+    parser.add_argument("--days", type=int, default=None, help="keep raw events for N days (default from settings)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be reclaimed")
+    args = parser.parse_args()
+
+    job = RetentionJob.from_settings(get_settings())
+    if args.days is not None:
+        job.retention_days = args.days
+    if args.batch_size is not None:
+        job.batch_size = args.batch_size
+    report = job.run(dry_run=args.dry_run)
+    if report.cutoff is None:
+        print("Raw event retention is disabled (set LRA_LLM_RAW_RETENTION_DAYS or pass --days).")
+        return
+    print(
+        f"cutoff={report.cutoff.isoformat()} rows={report.rows} bytes~={report.bytes_estimate} "
+        f"hourly_rollup_rows={report.rollup_rows}"
+    )
+    if not report.dry_run:
+        print(f"deleted={report.deleted} batches={report.batches} elapsed={report.elapsed_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,17 @@ from llm_revenue_analyzer.budgets import BudgetService
 from llm_revenue_analyzer.core.settings import get_settings
 from llm_revenue_analyzer.pricing import CostCalculator, PricingCatalog
 from llm_revenue_analyzer.store.db import get_session_factory
-from llm_revenue_analyzer.store.models import Alert, Budget, LLMEvent, RevenueEvent, Tenant
-from llm_revenue_analyzer.store.repos import AlertRepo, TenantRepo
+from llm_revenue_analyzer.store.models import (
+    Alert,
+    Budget,
+    LLMEvent,
+    LLMHourlyRollup,
+    LLMRollupLatencyBin,
+    RetentionWatermark,
+    RevenueEvent,
+    Tenant,
+)
+from llm_revenue_analyzer.store.repos import AlertRepo, RollupRepo, TenantRepo
 
 TENANTS = [
     {"id": "tenant-alpha", "name": "Tenant Alpha", "budget": 0.35, "hard_limit": False, "soft": 0.8},
@@ -29,7 +38,16 @@ REVENUE_SOURCES = ["subscription", "usage", "enterprise-addon"]
 
 
 def _reset_tables(session) -> None:
-    for model in (Alert, LLMEvent, RevenueEvent, Budget, Tenant):
+    for model in (
+        Alert,
+        LLMRollupLatencyBin,
+        LLMHourlyRollup,
+        LLMEvent,
+        RetentionWatermark,
+        RevenueEvent,
+        Budget,
+        Tenant,
+    ):
         session.execute(delete(model))
     session.commit()
 
@@ -65,7 +83,7 @@ def _generate_llm_events(session, cost_calc: CostCalculator, seed: int, count: i
             provider, model = ("openai", "gpt-4.1")
             prompt_tokens *= 200
             completion_tokens *= 250
-        cost_usd = cost_calc.compute_cost_usd(provider, model, prompt_tokens, completion_tokens)
+        cost_usd = cost_calc.compute_cost_usd(provider, model, prompt_tokens, completion_tokens, at=ts)
         event = LLMEvent(
             timestamp=ts,
             tenant_id=tenant["id"],
@@ -79,11 +97,15 @@ def _generate_llm_events(session, cost_calc: CostCalculator, seed: int, count: i
             latency_ms=rng.randint(120, 4000),
             status="success" if rng.random() > 0.06 else "error",
             cost_usd=cost_usd,
+            cost_source="computed",
+            pricing_version=cost_calc.catalog.version,
             feature=feature,
             metadata_json={"seed": True, "day_offset": day_offset},
         )
         session.add(event)
         inserted += 1
+    session.flush()
+    RollupRepo(session).rebuild(now - timedelta(days=days), now + timedelta(days=1))
     session.commit()
     return inserted
 
@@ -108,6 +130,7 @@ def _generate_revenue_events(session, seed: int, count: int, days: int) -> int:
             amount_usd=Decimal(str(amount)),
             currency="USD",
             source=rng.choice(REVENUE_SOURCES),
+            feature=feature,
             metadata_json={"seed": True, "feature": feature},
         )
         session.add(event)
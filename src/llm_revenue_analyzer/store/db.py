@@ -1,30 +1,76 @@
 from __future__ import annotations
 
 from collections.abc import Generator
+from time import perf_counter
 from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy import exc as sa_exc
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, PoolProxiedConnection, QueuePool
 
 from llm_revenue_analyzer.core.settings import Settings, get_settings
+from llm_revenue_analyzer.observability.metrics import record_pool_checkout, register_pool_gauges
 from llm_revenue_analyzer.store.models import Base
 
 _engine: Engine | None = None
 _SessionLocal: sessionmaker[Session] | None = None
+_async_engine: AsyncEngine | None = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
 
 
-def _engine_kwargs(database_url: str) -> dict[str, Any]:
-    if database_url.startswith("sqlite"):
+class InstrumentedQueuePool(QueuePool):
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except sa_exc.TimeoutError:
+            record_pool_checkout(self.logging_name or "default", perf_counter() - start, timed_out=True)
+            raise
+        record_pool_checkout(self.logging_name or "default", perf_counter() - start)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_kwargs(settings: Settings, name: str, pool_class: type[Pool]) -> dict[str, Any]:
+    return {
+        "poolclass": pool_class,
+        "pool_logging_name": name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _engine_kwargs(settings: Settings) -> dict[str, Any]:
+    if settings.database_url.startswith("sqlite"):
         return {"future": True, "connect_args": {"check_same_thread": False}}
-    return {"future": True, "pool_pre_ping": True}
+    return {"future": True, **_pool_kwargs(settings, "sync", InstrumentedQueuePool)}
+
+
+def instrument_pool(pool: Pool) -> None:
+    if isinstance(pool, QueuePool):
+        register_pool_gauges(pool.logging_name or "default", pool.size, pool.checkedout, pool.overflow)
 
 
 def get_engine(settings: Settings | None = None) -> Engine:
     global _engine
     settings = settings or get_settings()
     if _engine is None:
-        _engine = create_engine(settings.database_url, **_engine_kwargs(settings.database_url))
+        _engine = create_engine(settings.database_url, **_engine_kwargs(settings))
+        instrument_pool(_engine.pool)
     return _engine
 
 
@@ -35,12 +81,42 @@ def get_session_factory(settings: Settings | None = None) -> sessionmaker[Sessio
     return _SessionLocal
 
 
+def get_async_engine(settings: Settings | None = None) -> AsyncEngine:
+    global _async_engine
+    settings = settings or get_settings()
+    if _async_engine is None:
+        url = settings.async_database_url
+        kwargs = {} if url.startswith("sqlite") else _pool_kwargs(settings, "async", InstrumentedAsyncQueuePool)
+        _async_engine = create_async_engine(url, **kwargs)
+        instrument_pool(_async_engine.sync_engine.pool)
+    return _async_engine
+
+
+def get_async_session_factory(settings: Settings | None = None) -> async_sessionmaker[AsyncSession]:
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(bind=get_async_engine(settings), autoflush=False)
+    return _AsyncSessionLocal
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _AsyncSessionLocal = None
+
+
 def reset_engine() -> None:
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _async_engine, _AsyncSessionLocal
     if _engine is not None:
         _engine.dispose()
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
     _engine = None
     _SessionLocal = None
+    _async_engine = None
+    _AsyncSessionLocal = None
 
 
 def create_all(settings: Settings | None = None) -> None:
@@ -54,3 +130,4 @@ def get_db_session() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
+
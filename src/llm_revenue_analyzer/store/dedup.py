@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+RequestKey = tuple[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class RecentEvent:
+    event_id: int
+    cost_usd: Decimal
+    cost_source: str
+    pricing_version: str | None
+
+    @classmethod
+    def from_row(cls, row: Any) -> RecentEvent:
+        return cls(row.id, Decimal(row.cost_usd), row.cost_source or "supplied", row.pricing_version)
+
+
+class RecentRequestCache:
+    """Bounded LRU of ``(tenant_id, request_id) -> RecentEvent`` for events already stored.
+
+    Only committed events are cached, so a hit is always a true duplicate. A miss says nothing;
+    the unique ``(tenant_id, request_id)`` index stays the source of truth.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._events: OrderedDict[RequestKey, RecentEvent] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def get(self, tenant_id: str, request_id: str) -> RecentEvent | None:
+        key = (tenant_id, request_id)
+        with self._lock:
+            event = self._events.get(key)
+            if event is not None:
+                self._events.move_to_end(key)
+            return event
+
+    def put(self, tenant_id: str, request_id: str, event: RecentEvent) -> None:
+        with self._lock:
+            self._events[(tenant_id, request_id)] = event
+            self._events.move_to_end((tenant_id, request_id))
+            while len(self._events) > self.capacity:
+                self._events.popitem(last=False)
@@ -4,7 +4,18 @@ from datetime import UTC, datetime
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -12,10 +23,22 @@ class Base(DeclarativeBase):
     pass
 
 
+UNATTRIBUTED_FEATURE = "unattributed"
+
+
 def utc_now() -> datetime:
     return datetime.now(UTC)
 
 
+def revenue_feature(metadata_json: dict[str, Any] | None) -> str:
+    value = (metadata_json or {}).get("feature")
+    return UNATTRIBUTED_FEATURE if value is None else str(value)[:128]
+
+
+def _default_revenue_feature(context: Any) -> str:
+    return revenue_feature(context.get_current_parameters().get("metadata_json"))
+
+
 class Tenant(Base):
     __tablename__ = "tenants"
 
@@ -42,10 +65,49 @@ class LLMEvent(Base):
     latency_ms: Mapped[int] = mapped_column(Integer, nullable=False)
     status: Mapped[str] = mapped_column(String(32), nullable=False)
     cost_usd: Mapped[Decimal] = mapped_column(Numeric(14, 6), nullable=False)
+    cost_source: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    pricing_version: Mapped[str | None] = mapped_column(String(64), nullable=True)
     feature: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     metadata_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
 
+class LLMHourlyRollup(Base):
+    __tablename__ = "llm_rollups_hourly"
+
+    tenant_id: Mapped[str] = mapped_column(ForeignKey("tenants.id"), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(128), primary_key=True)
+    model: Mapped[str] = mapped_column(String(128), primary_key=True)
+    feature: Mapped[str] = mapped_column(String(128), primary_key=True)
+    requests: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    errors: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    prompt_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cost_usd: Mapped[Decimal] = mapped_column(Numeric(20, 6), nullable=False, default=0)
+    latency_sum_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class LLMRollupLatencyBin(Base):
+    __tablename__ = "llm_rollup_latency_bins"
+
+    tenant_id: Mapped[str] = mapped_column(ForeignKey("tenants.id"), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    provider: Mapped[str] = mapped_column(String(128), primary_key=True)
+    model: Mapped[str] = mapped_column(String(128), primary_key=True)
+    feature: Mapped[str] = mapped_column(String(128), primary_key=True)
+    bin: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class RetentionWatermark(Base):
+    __tablename__ = "retention_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    purged_before: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utc_now, nullable=False)
+
+
 class RevenueEvent(Base):
     __tablename__ = "revenue_events"
 
@@ -56,6 +118,12 @@ class RevenueEvent(Base):
     amount_usd: Mapped[Decimal] = mapped_column(Numeric(14, 6), nullable=False)
     currency: Mapped[str] = mapped_column(String(16), nullable=False, default="USD")
     source: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    feature: Mapped[str] = mapped_column(
+        String(128),
+        nullable=False,
+        default=_default_revenue_feature,
+        server_default=UNATTRIBUTED_FEATURE,
+    )
     metadata_json: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
 
@@ -84,5 +152,14 @@ class Alert(Base):
 
 
 Index("ix_llm_events_tenant_timestamp", LLMEvent.tenant_id, LLMEvent.timestamp)
+# On a partitioned Postgres table migration 0009 adds ``timestamp`` to this index (the partition
+# key must be part of it); ingest then checks for stored request ids before inserting.
+Index("uq_llm_events_tenant_request", LLMEvent.tenant_id, LLMEvent.request_id, unique=True)
 Index("ix_revenue_events_tenant_timestamp", RevenueEvent.tenant_id, RevenueEvent.timestamp)
+Index(
+    "ix_revenue_events_tenant_feature_timestamp",
+    RevenueEvent.tenant_id,
+    RevenueEvent.feature,
+    RevenueEvent.timestamp,
+)
 Index("ix_alerts_tenant_created", Alert.tenant_id, Alert.created_at)
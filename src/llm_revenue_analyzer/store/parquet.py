@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from urllib.parse import quote, unquote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Row
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.core.money import to_micros
+from llm_revenue_analyzer.core.settings import Settings
+from llm_revenue_analyzer.store.db import get_session_factory
+from llm_revenue_analyzer.store.models import LLMEvent, RevenueEvent
+from llm_revenue_analyzer.store.repos import (
+    LLM_EXPORT_COLUMNS,
+    REVENUE_EXPORT_COLUMNS,
+    ExportKey,
+    as_utc,
+    keyset_page,
+)
+
+logger = get_logger(__name__)
+
+LLM_TABLE = "llm_events"
+REVENUE_TABLE = "revenue_events"
+PART_FILE = "part-0.parquet"
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+LLM_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("timestamp", TIMESTAMP),
+        ("user_id", pa.string()),
+        ("request_id", pa.string()),
+        ("provider", pa.string()),
+        ("model", pa.string()),
+        ("feature", pa.string()),
+        ("prompt_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("total_tokens", pa.int64()),
+        ("latency_ms", pa.int64()),
+        ("status", pa.string()),
+        ("cost_micros", pa.int64()),
+        ("cost_source", pa.string()),
+        ("pricing_version", pa.string()),
+        ("metadata_json", pa.string()),
+    ]
+)
+REVENUE_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("timestamp", TIMESTAMP),
+        ("user_id", pa.string()),
+        ("amount_micros", pa.int64()),
+        ("currency", pa.string()),
+        ("source", pa.string()),
+        ("feature", pa.string()),
+        ("metadata_json", pa.string()),
+    ]
+)
+
+
+def _json_text(value: Any) -> str | None:
+    return None if value is None else json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def partition_dir(root: Path, table: str, tenant_id: str, day: date) -> Path:
+    return root / table / f"tenant_id={quote(tenant_id, safe='')}" / f"day={day.isoformat()}"
+
+
+def iter_partitions(root: Path, table: str, tenant_id: str | None = None) -> Iterator[tuple[str, date, Path]]:
+    """Yield ``(tenant_id, day, file)`` for every exported partition of ``table``."""
+    base = root / table
+    if not base.is_dir():
+        return
+    tenant_dirs = (
+        [base / f"tenant_id={quote(tenant_id, safe='')}"] if tenant_id is not None else sorted(base.iterdir())
+    )
+    for tenant_dir in tenant_dirs:
+        if not tenant_dir.is_dir() or not tenant_dir.name.startswith("tenant_id="):
+            continue
+        tenant = unquote(tenant_dir.name.removeprefix("tenant_id="))
+        for day_dir in sorted(tenant_dir.iterdir()):
+            path = day_dir / PART_FILE
+            if day_dir.name.startswith("day=") and path.is_file():
+                yield tenant, date.fromisoformat(day_dir.name.removeprefix("day=")), path
+
+
+def _llm_columns(rows: Sequence[Row[Any]]) -> dict[str, list[Any]]:
+    return {
+        "id": [row.id for row in rows],
+        "timestamp": [as_utc(row.timestamp) for row in rows],
+        "user_id": [row.user_id for row in rows],
+        "request_id": [row.request_id for row in rows],
+        "provider": [row.provider for row in rows],
+        "model": [row.model for row in rows],
+        "feature": [row.feature for row in rows],
+        "prompt_tokens": [row.prompt_tokens for row in rows],
+        "completion_tokens": [row.completion_tokens for row in rows],
+        "total_tokens": [row.total_tokens for row in rows],
+        "latency_ms": [row.latency_ms for row in rows],
+        "status": [row.status for row in rows],
+        "cost_micros": [to_micros(row.cost_usd) for row in rows],
+        "cost_source": [row.cost_source for row in rows],
+        "pricing_version": [row.pricing_version for row in rows],
+        "metadata_json": [_json_text(row.metadata_json) for row in rows],
+    }
+
+
+def _revenue_columns(rows: Sequence[Row[Any]]) -> dict[str, list[Any]]:
+    return {
+        "id": [row.id for row in rows],
+        "timestamp": [as_utc(row.timestamp) for row in rows],
+        "user_id": [row.user_id for row in rows],
+        "amount_micros": [to_micros(row.amount_usd) for row in rows],
+        "currency": [row.currency for row in rows],
+        "source": [row.source for row in rows],
+        "feature": [row.feature for row in rows],
+        "metadata_json": [_json_text(row.metadata_json) for row in rows],
+    }
+
+
+@dataclass(frozen=True)
+class _ExportTable:
+    name: str
+    model: type[LLMEvent] | type[RevenueEvent]
+    columns: Sequence[str]
+    schema: pa.Schema
+    to_columns: Callable[[Sequence[Row[Any]]], dict[str, list[Any]]]
+
+
+EXPORT_TABLES = (
+    _ExportTable(LLM_TABLE, LLMEvent, LLM_EXPORT_COLUMNS, LLM_SCHEMA, _llm_columns),
+    _ExportTable(REVENUE_TABLE, RevenueEvent, REVENUE_EXPORT_COLUMNS, REVENUE_SCHEMA, _revenue_columns),
+)
+
+
+@dataclass
+class ParquetExportStats:
+    rows: int = 0
+    partitions: int = 0
+    removed_partitions: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class _PartitionWriter:
+    """Writes one ``(tenant, day)`` partition to a temp file and swaps it in on close."""
+
+    def __init__(self, directory: Path, schema: pa.Schema) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.tmp_path = directory / f".{PART_FILE}.tmp"
+        self.writer = pq.ParquetWriter(self.tmp_path, schema, compression="zstd")
+
+    def write(self, batch: pa.RecordBatch) -> None:
+        self.writer.write_batch(batch)
+
+    def close(self) -> None:
+        self.writer.close()
+        os.replace(self.tmp_path, self.directory / PART_FILE)
+
+    def abort(self) -> None:
+        self.writer.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+@dataclass
+class ParquetExporter:
+    """Export raw events to Parquet partitioned as ``<table>/tenant_id=<t>/day=<YYYY-MM-DD>``.
+
+    The window is widened to whole UTC days and every partition in it is rewritten, so
+    re-running an export for a day is idempotent. Rows are read with keyset pagination in
+    ``(tenant_id, timestamp, id)`` order, which keeps each partition contiguous; only one page
+    and one open writer are held in memory.
+    """
+
+    settings: Settings
+    root: Path
+    page_size: int = 50_000
+    _stats: ParquetExportStats = field(default_factory=ParquetExportStats, init=False)
+
+    def export(self, from_ts: datetime, to_ts: datetime, tenant_id: str | None = None) -> ParquetExportStats:
+        start = perf_counter()
+        first_day, end_day = as_utc(from_ts).date(), (as_utc(to_ts) - timedelta(microseconds=1)).date()
+        window = (
+            datetime.combine(first_day, time.min, tzinfo=UTC),
+            datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=UTC),
+        )
+        self._stats = ParquetExportStats()
+        for table in EXPORT_TABLES:
+            written = self._export_table(table, window, tenant_id)
+            self._remove_stale(table.name, first_day, end_day, tenant_id, written)
+        self._stats.elapsed_seconds = perf_counter() - start
+        logger.info(
+            "parquet_exported",
+            extra={
+                "extra": {
+                    "root": str(self.root),
+                    "rows": self._stats.rows,
+                    "partitions": self._stats.partitions,
+                    "removed_partitions": self._stats.removed_partitions,
+                    "elapsed_seconds": round(self._stats.elapsed_seconds, 3),
+                }
+            },
+        )
+        return self._stats
+
+    def _export_table(
+        self, table: _ExportTable, window: tuple[datetime, datetime], tenant_id: str | None
+    ) -> set[tuple[str, date]]:
+        written: set[tuple[str, date]] = set()
+        current: tuple[str, date] | None = None
+        writer: _PartitionWriter | None = None
+        after: ExportKey | None = None
+        try:
+            with get_session_factory(self.settings)() as session:
+                while True:
+                    rows = keyset_page(
+                        session, table.model, table.columns, *window, after, self.page_size, tenant_id
+                    )
+                    if not rows:
+                        break
+                    for key, group in _group_partitions(rows):
+                        if key != current:
+                            if writer is not None:
+                                writer.close()
+                            current = key
+                            writer = _PartitionWriter(partition_dir(self.root, table.name, *key), table.schema)
+                            written.add(key)
+                        assert writer is not None
+                        writer.write(pa.RecordBatch.from_pydict(table.to_columns(group), schema=table.schema))
+                    self._stats.rows += len(rows)
+                    last = rows[-1]
+                    after = (last.tenant_id, last.timestamp, last.id)
+                    session.rollback()
+        except BaseException:
+            if writer is not None:
+                writer.abort()
+            raise
+        if writer is not None:
+            writer.close()
+        self._stats.partitions += len(written)
+        return written
+
+    def _remove_stale(
+        self,
+        table: str,
+        first_day: date,
+        end_day: date,
+        tenant_id: str | None,
+        written: set[tuple[str, date]],
+    ) -> None:
+        for tenant, day, path in list(iter_partitions(self.root, table, tenant_id)):
+            if first_day <= day <= end_day and (tenant, day) not in written:
+                shutil.rmtree(path.parent)
+                self._stats.removed_partitions += 1
+
+
+def _group_partitions(rows: Sequence[Row[Any]]) -> Iterator[tuple[tuple[str, date], list[Row[Any]]]]:
+    key: tuple[str, date] | None = None
+    group: list[Row[Any]] = []
+    for row in rows:
+        row_key = (row.tenant_id, as_utc(row.timestamp).date())
+        if row_key != key:
+            if group and key is not None:
+                yield key, group
+            key, group = row_key, []
+        group.append(row)
+    if group and key is not None:
+        yield key, group
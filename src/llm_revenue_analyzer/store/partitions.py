@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
+
+from sqlalchemy import Connection, Engine, text
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.core.settings import Settings
+
+logger = get_logger(__name__)
+
+PartitionInterval = Literal["month", "day"]
+ArchiveMode = Literal["detach", "drop"]
+
+PARENT_TABLE = "llm_events"
+DEFAULT_PARTITION = "llm_events_default"
+_NAME_PATTERN = re.compile(r"^llm_events_p(\d{8})_(\d{8})$")
+# Arbitrary constant shared by every worker so only one runs maintenance at a time.
+_ADVISORY_LOCK_KEY = 0x11E7_E0E5
+
+
+@dataclass(frozen=True, order=True)
+class PartitionRange:
+    start: date
+    end: date
+
+    @property
+    def name(self) -> str:
+        return f"{PARENT_TABLE}_p{self.start:%Y%m%d}_{self.end:%Y%m%d}"
+
+    @classmethod
+    def from_name(cls, name: str) -> PartitionRange | None:
+        match = _NAME_PATTERN.match(name)
+        if match is None:
+            return None
+        start, end = (datetime.strptime(value, "%Y%m%d").date() for value in match.groups())
+        return cls(start, end)
+
+
+@dataclass
+class PartitionPlan:
+    create: list[PartitionRange] = field(default_factory=list)
+    expire: list[PartitionRange] = field(default_factory=list)
+
+
+def interval_floor(day: date, interval: PartitionInterval) -> date:
+    return day.replace(day=1) if interval == "month" else day
+
+
+def next_bound(day: date, interval: PartitionInterval) -> date:
+    if interval == "day":
+        return day + timedelta(days=1)
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def plan_partitions(
+    existing: Sequence[PartitionRange],
+    today: date,
+    interval: PartitionInterval,
+    premake: int,
+    retention_days: int,
+) -> PartitionPlan:
+    """Ranges to create so ``premake`` future intervals exist, and ranges past retention.
+
+    New ranges continue from the latest existing upper bound so coverage stays contiguous,
+    even across a change of ``interval``.
+    """
+    plan = PartitionPlan()
+    horizon = interval_floor(today, interval)
+    for _ in range(premake + 1):
+        horizon = next_bound(horizon, interval)
+    cursor = max((item.end for item in existing), default=interval_floor(today, interval))
+    while cursor < horizon:
+        end = next_bound(cursor, interval)
+        plan.create.append(PartitionRange(cursor, end))
+        cursor = end
+    if retention_days > 0:
+        cutoff = today - timedelta(days=retention_days)
+        plan.expire = sorted(item for item in existing if item.end <= cutoff)
+    return plan
+
+
+def _bound(day: date) -> str:
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+
+class PartitionManager:
+    """Maintains monthly/daily range partitions of ``llm_events`` on Postgres.
+
+    Does nothing unless ``llm_events`` is a partitioned table (migration
+    ``0007_llm_events_partitioned``). Rows that landed in the default partition are moved
+    into a new partition when its range is created.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        interval: PartitionInterval = "month",
+        premake: int = 3,
+        retention_days: int = 0,
+        archive: ArchiveMode = "detach",
+    ) -> None:
+        self.engine = engine
+        self.interval = interval
+        self.premake = premake
+        self.retention_days = retention_days
+        self.archive = archive
+
+    @classmethod
+    def from_settings(cls, engine: Engine, settings: Settings) -> PartitionManager:
+        return cls(
+            engine,
+            interval=settings.llm_partition_interval,
+            premake=settings.llm_partition_premake,
+            retention_days=settings.llm_partition_retention_days,
+            archive=settings.llm_partition_archive,
+        )
+
+    def run(self, today: date | None = None) -> PartitionPlan:
+        if self.engine.dialect.name != "postgresql":
+            return PartitionPlan()
+        with self.engine.connect() as conn:
+            if not self._is_partitioned(conn):
+                return PartitionPlan()
+            if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}).scalar():
+                return PartitionPlan()
+            try:
+                plan = plan_partitions(
+                    self.partitions(conn),
+                    today or datetime.now(UTC).date(),
+                    self.interval,
+                    self.premake,
+                    self.retention_days,
+                )
+                conn.commit()
+                for item in plan.create:
+                    self._create(conn, item)
+                for item in plan.expire:
+                    self._expire(conn, item)
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+                conn.commit()
+        if plan.create or plan.expire:
+            logger.info(
+                "llm_partitions_maintained",
+                extra={
+                    "extra": {
+                        "created": [item.name for item in plan.create],
+                        "expired": [item.name for item in plan.expire],
+                        "archive": self.archive,
+                    }
+                },
+            )
+        return plan
+
+    @staticmethod
+    def _is_partitioned(conn: Connection) -> bool:
+        kind = conn.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": PARENT_TABLE}
+        ).scalar()
+        return kind == "p"
+
+    @staticmethod
+    def partitions(conn: Connection) -> list[PartitionRange]:
+        names = conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table)"
+            ),
+            {"table": PARENT_TABLE},
+        ).scalars()
+        return sorted(item for item in map(PartitionRange.from_name, names) if item is not None)
+
+    def _create(self, conn: Connection, item: PartitionRange) -> None:
+        bounds = f"FOR VALUES FROM ({_bound(item.start)}) TO ({_bound(item.end)})"
+        in_range = f"timestamp >= {_bound(item.start)} AND timestamp < {_bound(item.end)}"
+        with conn.begin():
+            stray = conn.execute(text(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range} LIMIT 1")).first()
+            if stray is None:
+                conn.execute(text(f"CREATE TABLE {item.name} PARTITION OF {PARENT_TABLE} {bounds}"))
+                return
+            conn.execute(text(f"CREATE TABLE {item.name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            conn.execute(text(f"INSERT INTO {item.name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+            conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {item.name} {bounds}"))
+
+    def _expire(self, conn: Connection, item: PartitionRange) -> None:
+        with conn.begin():
+            conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {item.name}"))
+            if self.archive == "drop":
+                conn.execute(text(f"DROP TABLE {item.name}"))
+            # Raw rows before this bound are gone; readers fall back to hourly rollups there.
+            conn.execute(
+                text(
+                    "INSERT INTO retention_watermarks (name, purged_before, updated_at) "
+                    f"VALUES (:name, {_bound(item.end)}, now()) ON CONFLICT (name) DO UPDATE SET "
+                    "purged_before = GREATEST(retention_watermarks.purged_before, EXCLUDED.purged_before), "
+                    "updated_at = now()"
+                ),
+                {"name": PARENT_TABLE},
+            )
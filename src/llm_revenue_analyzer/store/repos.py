@@ -1,13 +1,124 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping, Sequence
 from datetime import UTC, date, datetime, time, timedelta
 from decimal import Decimal
 from typing import Any
-
-from sqlalchemy import Select, and_, func, select
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Engine,
+    Insert,
+    Row,
+    Select,
+    and_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from llm_revenue_analyzer.store.models import Alert, Budget, LLMEvent, RevenueEvent, Tenant
+from llm_revenue_analyzer.core.money import MICROS_PER_USD, micros_to_usd, to_micros
+from llm_revenue_analyzer.core.sketch import latency_bin
+from llm_revenue_analyzer.store.models import (
+    Alert,
+    Budget,
+    LLMEvent,
+    LLMHourlyRollup,
+    LLMRollupLatencyBin,
+    RetentionWatermark,
+    RevenueEvent,
+    Tenant,
+)
+
+ROLLUP_KEY_COLUMNS = ("tenant_id", "bucket_start", "provider", "model", "feature")
+ROLLUP_BIN_KEY_COLUMNS = (*ROLLUP_KEY_COLUMNS, "bin")
+ROLLUP_SUM_COLUMNS = (
+    "requests",
+    "errors",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cost_usd",
+    "latency_sum_ms",
+)
+# The only columns analytics reads; selected as plain rows instead of ORM instances. ``*_micros``
+# columns are the matching ``*_usd`` money column as integer micro-dollars.
+LLM_ANALYTICS_COLUMNS = (
+    "timestamp",
+    "tenant_id",
+    "provider",
+    "model",
+    "feature",
+    "status",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cost_micros",
+    "latency_ms",
+)
+ROLLUP_ANALYTICS_COLUMNS = (
+    *ROLLUP_KEY_COLUMNS,
+    "requests",
+    "errors",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "cost_micros",
+    "latency_sum_ms",
+)
+LLM_EXPORT_COLUMNS = (
+    "id",
+    "timestamp",
+    "tenant_id",
+    "user_id",
+    "request_id",
+    "provider",
+    "model",
+    "feature",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "latency_ms",
+    "status",
+    "cost_usd",
+    "cost_source",
+    "pricing_version",
+    "metadata_json",
+)
+REVENUE_EXPORT_COLUMNS = (
+    "id",
+    "timestamp",
+    "tenant_id",
+    "user_id",
+    "amount_usd",
+    "currency",
+    "source",
+    "feature",
+    "metadata_json",
+)
+
+ExportKey = tuple[str, datetime, int]
+WindowRange = tuple[datetime, datetime]
+# One tenant, a list of tenants, or every tenant (``None``).
+TenantScope = str | Sequence[str] | None
+
+LLM_EVENTS_WATERMARK = "llm_events"
+# Fixed-width columns of an llm_events row, for byte estimates where the database cannot report them.
+_LLM_FIXED_ROW_BYTES = 64
 
 
 def month_bounds(reference: datetime) -> tuple[datetime, datetime]:
@@ -26,6 +137,126 @@ def day_bounds(day: date) -> tuple[datetime, datetime]:
     return start, end
 
 
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _as_date(value: datetime | date | str) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def hour_floor(value: datetime) -> datetime:
+    return as_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def hour_ceil(value: datetime) -> datetime:
+    floor = hour_floor(value)
+    return floor if floor == as_utc(value) else floor + timedelta(hours=1)
+
+
+def hour_bucket_expr(dialect_name: str, column: Any) -> ColumnElement[Any]:
+    if dialect_name == "postgresql":
+        utc: ColumnElement[str] = literal_column("'UTC'")
+        return func.timezone(utc, func.date_trunc(literal_column("'hour'"), func.timezone(utc, column)))
+    if dialect_name == "sqlite":
+        return func.strftime(literal_column("'%Y-%m-%d %H:00:00.000000'"), column)
+    raise NotImplementedError(f"Unsupported dialect for rollups: {dialect_name}")
+
+
+def day_bucket_expr(dialect_name: str, column: Any) -> ColumnElement[Any]:
+    if dialect_name == "postgresql":
+        return func.date_trunc(literal_column("'day'"), func.timezone(literal_column("'UTC'"), column))
+    if dialect_name == "sqlite":
+        return func.strftime(literal_column("'%Y-%m-%d'"), column)
+    raise NotImplementedError(f"Unsupported dialect for day buckets: {dialect_name}")
+
+
+def upsert_insert(session: Session, table: Any) -> Insert:
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Unsupported dialect for upserts: {dialect_name}")
+
+
+# Per engine: whether an index on exactly (tenant_id, request_id) makes request ids unique.
+_REQUEST_ID_UNIQUE: WeakKeyDictionary[Engine, bool] = WeakKeyDictionary()
+
+
+def keyset_page(
+    session: Session,
+    model: type[LLMEvent] | type[RevenueEvent],
+    columns: Sequence[str],
+    from_ts: datetime,
+    to_ts: datetime,
+    after: ExportKey | None,
+    limit: int,
+    tenant_id: str | None = None,
+) -> Sequence[Row[Any]]:
+    """One page ordered by ``(tenant_id, timestamp, id)`` strictly after ``after``."""
+    stmt = select(*(getattr(model, name) for name in columns)).where(
+        model.timestamp >= from_ts, model.timestamp < to_ts
+    )
+    if tenant_id is not None:
+        stmt = stmt.where(model.tenant_id == tenant_id)
+    if after is not None:
+        after_tenant, after_ts, after_id = after
+        stmt = stmt.where(
+            or_(
+                model.tenant_id > after_tenant,
+                and_(
+                    model.tenant_id == after_tenant,
+                    or_(model.timestamp > after_ts, and_(model.timestamp == after_ts, model.id > after_id)),
+                ),
+            )
+        )
+    stmt = stmt.order_by(model.tenant_id, model.timestamp, model.id).limit(limit)
+    return session.execute(stmt).all()
+
+
+def tenant_filter(column: Any, scope: TenantScope) -> ColumnElement[bool]:
+    if scope is None:
+        return true()
+    if isinstance(scope, str):
+        return column == scope
+    return column.in_(list(scope))
+
+
+def micros_expr(column: Any) -> ColumnElement[int]:
+    """A ``Numeric(14, 6)`` money column as exact integer micro-dollars, computed in the database."""
+    return cast(func.round(column * MICROS_PER_USD), BigInteger)
+
+
+def analytics_columns(model: Any, names: Sequence[str]) -> list[ColumnElement[Any]]:
+    return [
+        micros_expr(getattr(model, name.removesuffix("_micros") + "_usd")).label(name)
+        if name.endswith("_micros")
+        else getattr(model, name)
+        for name in names
+    ]
+
+
+def is_error_status(status: str) -> bool:
+    return status.lower() != "success"
+
+
+def _error_flag(status: Any = LLMEvent.status) -> ColumnElement[int]:
+    return case((func.lower(status) != "success", 1), else_=0)
+
+
 class TenantRepo:
     def __init__(self, session: Session) -> None:
         self.session = session
@@ -56,41 +287,554 @@ class LLMEventRepo:
         self.session.flush()
         return event
 
-    def month_cost_sum(self, tenant_id: str, reference: datetime) -> Decimal:
-        start, end = month_bounds(reference)
-        stmt = select(func.coalesce(func.sum(LLMEvent.cost_usd), 0)).where(
-            and_(LLMEvent.tenant_id == tenant_id, LLMEvent.timestamp >= start, LLMEvent.timestamp < end)
+    def bulk_create(self, rows: Sequence[dict[str, Any]]) -> list[int]:
+        if not rows:
+            return []
+        stmt = insert(LLMEvent).returning(LLMEvent.id, sort_by_parameter_order=True)
+        return list(self.session.scalars(stmt, list(rows)))
+
+    def insert_new(self, rows: Sequence[Mapping[str, Any]]) -> dict[tuple[str, str], int]:
+        """Insert rows, skipping any whose ``(tenant_id, request_id)`` is already stored.
+
+        Returns the new ids keyed by ``(tenant_id, request_id)``; skipped rows are absent.
+        """
+        if not rows:
+            return {}
+        stmt: Any = upsert_insert(self.session, LLMEvent)
+        stmt = stmt.on_conflict_do_nothing().returning(LLMEvent.id, LLMEvent.tenant_id, LLMEvent.request_id)
+        # Key order, so concurrent inserts of overlapping keys wait on each other rather than deadlock.
+        ordered = sorted(rows, key=lambda row: (row["tenant_id"], row["request_id"]))
+        return {
+            (tenant_id, request_id): event_id
+            for event_id, tenant_id, request_id in self.session.execute(stmt, ordered)
+        }
+
+    def request_id_unique(self) -> bool:
+        """Whether the database alone keeps one row per ``(tenant_id, request_id)``.
+
+        A partitioned ``llm_events`` (migration 0007) can only have a unique index that also
+        includes ``timestamp``, so a retry with another timestamp would be inserted again.
+        """
+        bind = self.session.get_bind()
+        engine = bind if isinstance(bind, Engine) else bind.engine
+        unique = _REQUEST_ID_UNIQUE.get(engine)
+        if unique is None:
+            indexes = inspect(engine).get_indexes(LLMEvent.__tablename__)
+            unique = any(
+                index["unique"] and set(index["column_names"]) == {"tenant_id", "request_id"} for index in indexes
+            )
+            _REQUEST_ID_UNIQUE[engine] = unique
+        return unique
+
+    def lock_request_ids(self, keys: Iterable[tuple[str, str]]) -> None:
+        """Serialize concurrent ingest of the same ``(tenant_id, request_id)`` keys until the transaction ends.
+
+        Locks are taken in ``(tenant_id, request_id)`` order, so callers should pass every key of a
+        transaction at once; two batches sharing keys then wait on each other instead of deadlocking.
+        Postgres only.
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        for tenant_id, request_id in sorted(set(keys)):
+            self.session.execute(
+                select(func.pg_advisory_xact_lock(func.hashtextextended(f"{tenant_id}\x1f{request_id}", 0)))
+            )
+
+    def find_by_request_ids(self, tenant_id: str, request_ids: Sequence[str]) -> dict[str, Row[Any]]:
+        found: dict[str, Row[Any]] = {}
+        unique_ids = sorted(set(request_ids))
+        for offset in range(0, len(unique_ids), 1000):
+            stmt = select(
+                LLMEvent.id, LLMEvent.request_id, LLMEvent.cost_usd, LLMEvent.cost_source, LLMEvent.pricing_version
+            ).where(LLMEvent.tenant_id == tenant_id, LLMEvent.request_id.in_(unique_ids[offset : offset + 1000]))
+            for row in self.session.execute(stmt):
+                found.setdefault(row.request_id, row)
+        return found
+
+    def _cost_scope(
+        self,
+        from_ts: datetime,
+        to_ts: datetime,
+        tenant_id: str | None,
+        include_legacy: bool,
+    ) -> ColumnElement[bool]:
+        source = LLMEvent.cost_source == "computed"
+        if include_legacy:
+            source = or_(source, LLMEvent.cost_source.is_(None))
+        condition = and_(LLMEvent.timestamp >= from_ts, LLMEvent.timestamp < to_ts, source)
+        if tenant_id is not None:
+            condition = and_(condition, LLMEvent.tenant_id == tenant_id)
+        return condition
+
+    def computed_cost_id_bounds(
+        self,
+        from_ts: datetime,
+        to_ts: datetime,
+        tenant_id: str | None = None,
+        include_legacy: bool = False,
+    ) -> tuple[int, int] | None:
+        stmt = select(func.min(LLMEvent.id), func.max(LLMEvent.id)).where(
+            self._cost_scope(from_ts, to_ts, tenant_id, include_legacy)
         )
-        value = self.session.scalar(stmt)
-        return Decimal(value or 0)
+        low, high = self.session.execute(stmt).one()
+        return None if low is None else (int(low), int(high))
+
+    def list_computed_costs(
+        self,
+        from_ts: datetime,
+        to_ts: datetime,
+        after_id: int,
+        until_id: int,
+        limit: int,
+        tenant_id: str | None = None,
+        include_legacy: bool = False,
+    ) -> Sequence[Row[Any]]:
+        stmt = (
+            select(
+                LLMEvent.id,
+                LLMEvent.timestamp,
+                LLMEvent.provider,
+                LLMEvent.model,
+                LLMEvent.prompt_tokens,
+                LLMEvent.completion_tokens,
+                LLMEvent.cost_usd,
+                LLMEvent.pricing_version,
+            )
+            .where(
+                self._cost_scope(from_ts, to_ts, tenant_id, include_legacy),
+                LLMEvent.id > after_id,
+                LLMEvent.id <= until_id,
+            )
+            .order_by(LLMEvent.id)
+            .limit(limit)
+        )
+        return self.session.execute(stmt).all()
+
+    def update_costs(self, costs: Sequence[Mapping[str, Any]], pricing_version: str | None = None) -> int:
+        """Rewrite costs by ``(id, timestamp)``; the timestamp lets Postgres prune to one partition."""
+        if not costs:
+            return 0
+        stmt = (
+            update(LLMEvent)
+            .where(LLMEvent.id == bindparam("event_id"), LLMEvent.timestamp == bindparam("event_ts"))
+            .values(cost_usd=bindparam("new_cost"), pricing_version=bindparam("new_version"))
+        )
+        params = [
+            {
+                "event_id": row["id"],
+                "event_ts": row["timestamp"],
+                "new_cost": row["cost_usd"],
+                "new_version": pricing_version,
+            }
+            for row in costs
+        ]
+        self.session.connection().execute(stmt, params)
+        return len(costs)
+
+    def raw_horizon(self) -> datetime | None:
+        return RetentionRepo(self.session).get(LLM_EVENTS_WATERMARK)
+
+    def split_at_horizon(self, from_ts: datetime, to_ts: datetime) -> tuple[WindowRange | None, WindowRange | None]:
+        """Split a window into ``(rollup_range, raw_range)`` around the retention watermark.
+
+        Raw rows before the watermark have been deleted, so that part is answered from hourly
+        rollups at whole-hour resolution.
+        """
+        horizon = self.raw_horizon()
+        if horizon is None or from_ts >= horizon:
+            return None, (from_ts, to_ts)
+        if to_ts <= horizon:
+            return (hour_floor(from_ts), hour_ceil(to_ts)), None
+        return (hour_floor(from_ts), horizon), (horizon, to_ts)
+
+    def month_cost_sum(self, tenant_id: str, reference: datetime) -> Decimal:
+        return micros_to_usd(self.month_cost_micros(reference, tenant_id).get(tenant_id, 0))
+
+    def month_cost_sums(self, reference: datetime, tenant_id: str | None = None) -> dict[str, Decimal]:
+        return {tenant: micros_to_usd(total) for tenant, total in self.month_cost_micros(reference, tenant_id).items()}
+
+    def month_cost_micros(self, reference: datetime, tenant_id: str | None = None) -> dict[str, int]:
+        """Month-to-date LLM cost per tenant in integer micro-dollars."""
+        rollup_range, raw_range = self.split_at_horizon(*month_bounds(reference))
+        totals: dict[str, int] = {}
+        parts: list[tuple[Any, Any, Any, WindowRange | None]] = [
+            (LLMEvent.tenant_id, LLMEvent.cost_usd, LLMEvent.timestamp, raw_range),
+            (LLMHourlyRollup.tenant_id, LLMHourlyRollup.cost_usd, LLMHourlyRollup.bucket_start, rollup_range),
+        ]
+        for tenant_column, cost_column, time_column, window in parts:
+            if window is None:
+                continue
+            stmt = (
+                select(tenant_column, func.sum(micros_expr(cost_column)))
+                .where(and_(time_column >= window[0], time_column < window[1]))
+                .group_by(tenant_column)
+            )
+            if tenant_id is not None:
+                stmt = stmt.where(tenant_column == tenant_id)
+            for row_tenant, value in self.session.execute(stmt):
+                totals[row_tenant] = totals.get(row_tenant, 0) + int(value or 0)
+        return totals
 
     def list_for_window(
         self,
-        tenant_id: str,
+        tenant_id: TenantScope,
         from_ts: datetime,
         to_ts: datetime,
     ) -> list[LLMEvent]:
         stmt = (
             select(LLMEvent)
             .where(
-                and_(LLMEvent.tenant_id == tenant_id, LLMEvent.timestamp >= from_ts, LLMEvent.timestamp < to_ts)
+                and_(
+                    tenant_filter(LLMEvent.tenant_id, tenant_id),
+                    LLMEvent.timestamp >= from_ts,
+                    LLMEvent.timestamp < to_ts,
+                )
             )
             .order_by(LLMEvent.timestamp.asc())
         )
         return list(self.session.scalars(stmt))
 
+    def window_rows(self, tenant_id: TenantScope, from_ts: datetime, to_ts: datetime) -> list[Row[Any]]:
+        """``LLM_ANALYTICS_COLUMNS`` of the window, without identity-map tracking or JSON decoding."""
+        stmt = select(*analytics_columns(LLMEvent, LLM_ANALYTICS_COLUMNS)).where(
+            and_(
+                tenant_filter(LLMEvent.tenant_id, tenant_id),
+                LLMEvent.timestamp >= from_ts,
+                LLMEvent.timestamp < to_ts,
+            )
+        )
+        return list(self.session.execute(stmt))
+
+    def export_page(
+        self,
+        from_ts: datetime,
+        to_ts: datetime,
+        after: ExportKey | None,
+        limit: int,
+        tenant_id: str | None = None,
+    ) -> Sequence[Row[Any]]:
+        return keyset_page(self.session, LLMEvent, LLM_EXPORT_COLUMNS, from_ts, to_ts, after, limit, tenant_id)
+
+    def aggregate_window(
+        self,
+        tenant_id: TenantScope,
+        from_ts: datetime,
+        to_ts: datetime,
+        group_by: Sequence[str] = (),
+        by_day: bool = False,
+        percentiles: Sequence[float] = (),
+        percentiles_by_day: bool = True,
+    ) -> list[Row[Any]]:
+        """One row of totals per ``group_by`` (and UTC day) bucket.
+
+        ``p_<i>`` is the nearest-rank latency for ``percentiles[i]``, ranked in the database so raw
+        rows never leave it. With ``percentiles_by_day=False`` ranks span the whole window of each
+        ``group_by`` bucket; each value is then reported on the one day row holding that rank and is
+        ``NULL`` on the others.
+        """
+        inputs: dict[str, ColumnElement[Any]] = {
+            name: getattr(LLMEvent, name)
+            for name in dict.fromkeys(
+                (*group_by, "status", "prompt_tokens", "completion_tokens", "total_tokens", "latency_ms")
+            )
+        }
+        inputs["cost_micros"] = micros_expr(LLMEvent.cost_usd)
+        inputs["day"] = day_bucket_expr(self.session.get_bind().dialect.name, LLMEvent.timestamp)
+        window_filter = and_(
+            tenant_filter(LLMEvent.tenant_id, tenant_id),
+            LLMEvent.timestamp >= from_ts,
+            LLMEvent.timestamp < to_ts,
+        )
+        if percentiles:
+            partition = [inputs[name] for name in group_by]
+            if by_day and percentiles_by_day:
+                partition.append(inputs["day"])
+            ranked = (
+                select(
+                    *(column.label(name) for name, column in inputs.items()),
+                    func.row_number()
+                    .over(partition_by=partition or None, order_by=LLMEvent.latency_ms)
+                    .label("latency_rank"),
+                    func.count().over(partition_by=partition or None).label("ranked"),
+                )
+                .where(window_filter)
+                .subquery("ranked")
+            )
+            inputs = {name: ranked.c[name] for name in inputs}
+        keys = [inputs[name].label(name) for name in group_by]
+        if by_day:
+            keys.append(inputs["day"].label("day"))
+        measures: list[ColumnElement[Any]] = [
+            func.count().label("requests"),
+            func.sum(_error_flag(inputs["status"])).label("errors"),
+            func.sum(inputs["prompt_tokens"]).label("prompt_tokens"),
+            func.sum(inputs["completion_tokens"]).label("completion_tokens"),
+            func.sum(inputs["total_tokens"]).label("total_tokens"),
+            func.sum(inputs["cost_micros"]).label("cost_micros"),
+            func.sum(inputs["latency_ms"]).label("latency_sum_ms"),
+        ]
+        if not percentiles:
+            return list(self.session.execute(select(*keys, *measures).where(window_filter).group_by(*keys)))
+        for index, q in enumerate(percentiles):
+            # Nearest rank is ceil(q * n): the one rank r with r - 1 < q * n <= r.
+            target = literal(q) * ranked.c.ranked
+            at_rank = and_(ranked.c.latency_rank >= target, ranked.c.latency_rank - 1 < target)
+            measures.append(func.min(case((at_rank, ranked.c.latency_ms))).label(f"p_{index}"))
+        return list(self.session.execute(select(*keys, *measures).select_from(ranked).group_by(*keys)))
+
     def list_daily_costs(
         self,
         tenant_id: str,
         from_ts: datetime,
         to_ts: datetime,
     ) -> list[tuple[date, Decimal]]:
-        rows = self.list_for_window(tenant_id=tenant_id, from_ts=from_ts, to_ts=to_ts)
-        buckets: dict[date, Decimal] = {}
-        for row in rows:
-            key = row.timestamp.astimezone(UTC).date()
-            buckets[key] = buckets.get(key, Decimal("0")) + row.cost_usd
-        return sorted(buckets.items(), key=lambda item: item[0])
+        dialect_name = self.session.get_bind().dialect.name
+        rollup_range, raw_range = self.split_at_horizon(from_ts, to_ts)
+        totals: dict[date, int] = {}
+        parts: list[tuple[Any, Any, Any, WindowRange | None]] = [
+            (LLMEvent.tenant_id, LLMEvent.cost_usd, LLMEvent.timestamp, raw_range),
+            (LLMHourlyRollup.tenant_id, LLMHourlyRollup.cost_usd, LLMHourlyRollup.bucket_start, rollup_range),
+        ]
+        for tenant_column, cost_column, time_column, window in parts:
+            if window is None:
+                continue
+            day = day_bucket_expr(dialect_name, time_column)
+            stmt = (
+                select(day, func.sum(micros_expr(cost_column)))
+                .where(and_(tenant_column == tenant_id, time_column >= window[0], time_column < window[1]))
+                .group_by(day)
+            )
+            for value, total in self.session.execute(stmt):
+                key = _as_date(value)
+                totals[key] = totals.get(key, 0) + int(total or 0)
+        return [(day, micros_to_usd(total)) for day, total in sorted(totals.items())]
+
+    def raw_usage(self, before: datetime) -> tuple[int, int]:
+        """Row count and approximate bytes of raw events older than ``before``."""
+        if self.session.get_bind().dialect.name == "postgresql":
+            size: ColumnElement[Any] = func.pg_column_size(literal_column("llm_events.*"))
+        else:
+            variable = [
+                func.coalesce(func.length(column), 0)
+                for column in (
+                    LLMEvent.tenant_id,
+                    LLMEvent.user_id,
+                    LLMEvent.request_id,
+                    LLMEvent.model,
+                    LLMEvent.provider,
+                    LLMEvent.status,
+                    LLMEvent.feature,
+                    LLMEvent.cost_source,
+                    LLMEvent.pricing_version,
+                    LLMEvent.metadata_json,
+                )
+            ]
+            size = sum(variable[1:], variable[0]) + _LLM_FIXED_ROW_BYTES
+        stmt = select(func.count(), func.coalesce(func.sum(size), 0)).where(LLMEvent.timestamp < before)
+        rows, size_bytes = self.session.execute(stmt).one()
+        return int(rows), int(size_bytes)
+
+    def earliest_timestamp(self) -> datetime | None:
+        value = self.session.scalar(select(func.min(LLMEvent.timestamp)))
+        return None if value is None else as_utc(_as_datetime(value))
+
+    def delete_before(self, before: datetime, limit: int) -> int:
+        """Delete up to ``limit`` of the oldest raw events older than ``before``."""
+        oldest = (
+            select(LLMEvent.id).where(LLMEvent.timestamp < before).order_by(LLMEvent.timestamp).limit(limit)
+        )
+        stmt = delete(LLMEvent).where(LLMEvent.timestamp < before, LLMEvent.id.in_(oldest.scalar_subquery()))
+        result = self.session.execute(stmt, execution_options={"synchronize_session": False})
+        return int(getattr(result, "rowcount", 0) or 0)
+
+
+class RollupRepo:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def apply(self, events: Sequence[Mapping[str, Any]]) -> int:
+        deltas: dict[tuple[Any, ...], dict[str, Any]] = {}
+        bins: dict[tuple[Any, ...], int] = {}
+        for event in events:
+            key = (
+                event["tenant_id"],
+                hour_floor(event["timestamp"]),
+                event["provider"],
+                event["model"],
+                event["feature"],
+            )
+            bin_key = (*key, latency_bin(event["latency_ms"]))
+            bins[bin_key] = bins.get(bin_key, 0) + 1
+            row = deltas.get(key)
+            if row is None:
+                row = dict(zip(ROLLUP_KEY_COLUMNS, key, strict=True))
+                row.update({column: 0 for column in ROLLUP_SUM_COLUMNS})
+                deltas[key] = row
+            row["requests"] += 1
+            row["errors"] += int(is_error_status(event["status"]))
+            row["prompt_tokens"] += event["prompt_tokens"]
+            row["completion_tokens"] += event["completion_tokens"]
+            row["total_tokens"] += event["total_tokens"]
+            # Summed as micros, each event rounded like its stored ``llm_events.cost_usd``.
+            row["cost_usd"] += to_micros(event["cost_usd"])
+            row["latency_sum_ms"] += event["latency_ms"]
+        if not deltas:
+            return 0
+
+        rows = [{**deltas[key], "cost_usd": micros_to_usd(deltas[key]["cost_usd"])} for key in sorted(deltas)]
+        stmt: Any = upsert_insert(self.session, LLMHourlyRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY_COLUMNS),
+            set_={column: getattr(LLMHourlyRollup, column) + stmt.excluded[column] for column in ROLLUP_SUM_COLUMNS},
+        )
+        self.session.execute(stmt)
+        self._apply_bins(bins)
+        return len(rows)
+
+    def _apply_bins(self, bins: Mapping[tuple[Any, ...], int]) -> None:
+        if not bins:
+            return
+        rows = [{**dict(zip(ROLLUP_BIN_KEY_COLUMNS, key, strict=True)), "count": bins[key]} for key in sorted(bins)]
+        stmt: Any = upsert_insert(self.session, LLMRollupLatencyBin).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(ROLLUP_BIN_KEY_COLUMNS),
+            set_={"count": LLMRollupLatencyBin.count + stmt.excluded["count"]},
+        )
+        self.session.execute(stmt)
+
+    def latency_bins(
+        self,
+        tenant_id: TenantScope,
+        from_ts: datetime,
+        to_ts: datetime,
+        group_by: Sequence[str] = (),
+        by_day: bool = False,
+    ) -> list[Row[Any]]:
+        keys: list[ColumnElement[Any]] = [getattr(LLMRollupLatencyBin, name).label(name) for name in group_by]
+        if by_day:
+            dialect_name = self.session.get_bind().dialect.name
+            keys.append(day_bucket_expr(dialect_name, LLMRollupLatencyBin.bucket_start).label("day"))
+        stmt = (
+            select(*keys, LLMRollupLatencyBin.bin, func.sum(LLMRollupLatencyBin.count).label("bin_count"))
+            .where(
+                and_(
+                    tenant_filter(LLMRollupLatencyBin.tenant_id, tenant_id),
+                    LLMRollupLatencyBin.bucket_start >= from_ts,
+                    LLMRollupLatencyBin.bucket_start < to_ts,
+                )
+            )
+            .group_by(*keys, LLMRollupLatencyBin.bin)
+        )
+        return list(self.session.execute(stmt))
+
+    def list_for_window(self, tenant_id: TenantScope, from_ts: datetime, to_ts: datetime) -> list[LLMHourlyRollup]:
+        stmt = (
+            select(LLMHourlyRollup)
+            .where(
+                and_(
+                    tenant_filter(LLMHourlyRollup.tenant_id, tenant_id),
+                    LLMHourlyRollup.bucket_start >= from_ts,
+                    LLMHourlyRollup.bucket_start < to_ts,
+                )
+            )
+            .order_by(LLMHourlyRollup.bucket_start.asc())
+        )
+        return list(self.session.scalars(stmt))
+
+    def window_rows(self, tenant_id: TenantScope, from_ts: datetime, to_ts: datetime) -> list[Row[Any]]:
+        stmt = select(*analytics_columns(LLMHourlyRollup, ROLLUP_ANALYTICS_COLUMNS)).where(
+            and_(
+                tenant_filter(LLMHourlyRollup.tenant_id, tenant_id),
+                LLMHourlyRollup.bucket_start >= from_ts,
+                LLMHourlyRollup.bucket_start < to_ts,
+            )
+        )
+        return list(self.session.execute(stmt))
+
+    def count_before(self, before: datetime) -> int:
+        return int(self.session.scalar(select(func.count()).where(LLMHourlyRollup.bucket_start < before)) or 0)
+
+    def lock_hour(self, tenant_id: str, hour: datetime) -> None:
+        """Serialize rebuilds of one tenant-hour across workers until the transaction ends (Postgres only)."""
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        key = f"llm_rollups\x1f{tenant_id}\x1f{hour_floor(hour).isoformat()}"
+        self.session.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(key, 0))))
+
+    def rebuild(self, from_ts: datetime, to_ts: datetime, tenant_id: str | None = None) -> int:
+        start, end = hour_floor(from_ts), hour_ceil(to_ts)
+        # Rollups before the retention watermark are the only copy of that history.
+        horizon = RetentionRepo(self.session).get(LLM_EVENTS_WATERMARK)
+        if horizon is not None:
+            start = max(start, horizon)
+        if start >= end:
+            return 0
+        event_filter = and_(LLMEvent.timestamp >= start, LLMEvent.timestamp < end)
+        if tenant_id is not None:
+            event_filter = and_(event_filter, LLMEvent.tenant_id == tenant_id)
+        for table in (LLMHourlyRollup, LLMRollupLatencyBin):
+            clear = delete(table).where(and_(table.bucket_start >= start, table.bucket_start < end))
+            if tenant_id is not None:
+                clear = clear.where(table.tenant_id == tenant_id)
+            self.session.execute(clear)
+
+        bucket = hour_bucket_expr(self.session.get_bind().dialect.name, LLMEvent.timestamp)
+        aggregate = (
+            select(
+                LLMEvent.tenant_id,
+                bucket,
+                LLMEvent.provider,
+                LLMEvent.model,
+                LLMEvent.feature,
+                func.count(),
+                func.sum(_error_flag()),
+                func.sum(LLMEvent.prompt_tokens),
+                func.sum(LLMEvent.completion_tokens),
+                func.sum(LLMEvent.total_tokens),
+                func.sum(LLMEvent.cost_usd),
+                func.sum(LLMEvent.latency_ms),
+            )
+            .where(event_filter)
+            .group_by(LLMEvent.tenant_id, bucket, LLMEvent.provider, LLMEvent.model, LLMEvent.feature)
+        )
+        result = self.session.execute(
+            insert(LLMHourlyRollup).from_select([*ROLLUP_KEY_COLUMNS, *ROLLUP_SUM_COLUMNS], aggregate)
+        )
+
+        key_columns = (LLMEvent.tenant_id, bucket, LLMEvent.provider, LLMEvent.model, LLMEvent.feature)
+        latencies = (
+            select(*key_columns, LLMEvent.latency_ms, func.count())
+            .where(event_filter)
+            .group_by(*key_columns, LLMEvent.latency_ms)
+        )
+        bins: dict[tuple[Any, ...], int] = {}
+        for row_tenant, row_bucket, provider, model, feature, latency_ms, count in self.session.execute(latencies):
+            bin_key = (row_tenant, hour_floor(_as_datetime(row_bucket)), provider, model, feature, latency_bin(latency_ms))
+            bins[bin_key] = bins.get(bin_key, 0) + count
+        items = list(bins.items())
+        for offset in range(0, len(items), 1000):
+            self._apply_bins(dict(items[offset : offset + 1000]))
+        return int(getattr(result, "rowcount", 0) or 0)
+
+
+class RetentionRepo:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def get(self, name: str) -> datetime | None:
+        value = self.session.scalar(select(RetentionWatermark.purged_before).where(RetentionWatermark.name == name))
+        return None if value is None else as_utc(_as_datetime(value))
+
+    def advance(self, name: str, purged_before: datetime) -> datetime:
+        """Move the watermark forward to ``purged_before``; it never moves back."""
+        row = self.session.get(RetentionWatermark, name)
+        if row is None:
+            self.session.add(RetentionWatermark(name=name, purged_before=purged_before))
+            return purged_before
+        if as_utc(row.purged_before) < purged_before:
+            row.purged_before = purged_before
+            row.updated_at = datetime.now(UTC)
+        return as_utc(row.purged_before)
 
 
 class RevenueEventRepo:
@@ -116,13 +860,75 @@ class RevenueEventRepo:
         )
         return list(self.session.scalars(stmt))
 
+    def export_page(
+        self,
+        from_ts: datetime,
+        to_ts: datetime,
+        after: ExportKey | None,
+        limit: int,
+        tenant_id: str | None = None,
+    ) -> Sequence[Row[Any]]:
+        return keyset_page(
+            self.session, RevenueEvent, REVENUE_EXPORT_COLUMNS, from_ts, to_ts, after, limit, tenant_id
+        )
+
+    def sum_for_window(self, tenant_id: str, from_ts: datetime, to_ts: datetime) -> Decimal:
+        stmt = select(func.coalesce(func.sum(micros_expr(RevenueEvent.amount_usd)), 0)).where(
+            and_(
+                RevenueEvent.tenant_id == tenant_id,
+                RevenueEvent.timestamp >= from_ts,
+                RevenueEvent.timestamp < to_ts,
+            )
+        )
+        return micros_to_usd(int(self.session.scalar(stmt) or 0))
+
+    def sums_by_tenant(self, tenant_id: TenantScope, from_ts: datetime, to_ts: datetime) -> dict[str, Decimal]:
+        stmt = (
+            select(RevenueEvent.tenant_id, func.sum(micros_expr(RevenueEvent.amount_usd)))
+            .where(
+                and_(
+                    tenant_filter(RevenueEvent.tenant_id, tenant_id),
+                    RevenueEvent.timestamp >= from_ts,
+                    RevenueEvent.timestamp < to_ts,
+                )
+            )
+            .group_by(RevenueEvent.tenant_id)
+        )
+        return {row_tenant: micros_to_usd(int(value or 0)) for row_tenant, value in self.session.execute(stmt)}
+
+    def sum_by_feature(
+        self,
+        tenant_id: str,
+        from_ts: datetime,
+        to_ts: datetime,
+        by_day: bool = False,
+    ) -> list[tuple[str, date | None, Decimal]]:
+        keys: list[ColumnElement[Any]] = [RevenueEvent.feature.label("feature")]
+        if by_day:
+            keys.append(day_bucket_expr(self.session.get_bind().dialect.name, RevenueEvent.timestamp).label("day"))
+        stmt = (
+            select(*keys, func.sum(micros_expr(RevenueEvent.amount_usd)))
+            .where(
+                and_(
+                    RevenueEvent.tenant_id == tenant_id,
+                    RevenueEvent.timestamp >= from_ts,
+                    RevenueEvent.timestamp < to_ts,
+                )
+            )
+            .group_by(*keys)
+        )
+        return [
+            (row[0], _as_date(row[1]) if by_day else None, micros_to_usd(int(row[-1] or 0)))
+            for row in self.session.execute(stmt)
+        ]
+
     def month_revenue_sum(self, tenant_id: str, reference: datetime) -> Decimal:
         start, end = month_bounds(reference)
-        stmt = select(func.coalesce(func.sum(RevenueEvent.amount_usd), 0)).where(
+        stmt = select(func.coalesce(func.sum(micros_expr(RevenueEvent.amount_usd)), 0)).where(
             and_(RevenueEvent.tenant_id == tenant_id, RevenueEvent.timestamp >= start, RevenueEvent.timestamp < end)
         )
         value = self.session.scalar(stmt)
-        return Decimal(value or 0)
+        return micros_to_usd(int(value or 0))
 
 
 class BudgetRepo:
@@ -132,6 +938,10 @@ class BudgetRepo:
     def get(self, tenant_id: str) -> Budget | None:
         return self.session.get(Budget, tenant_id)
 
+    def lock(self, tenant_id: str) -> None:
+        """Hold the budget row until the transaction ends (``FOR UPDATE``; no-op on SQLite)."""
+        self.session.execute(select(Budget.tenant_id).where(Budget.tenant_id == tenant_id).with_for_update())
+
     def upsert(
         self,
         tenant_id: str,
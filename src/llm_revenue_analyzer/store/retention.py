@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from time import perf_counter
+
+from sqlalchemy import text
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.core.settings import Settings
+from llm_revenue_analyzer.store.db import get_engine, get_session_factory
+from llm_revenue_analyzer.store.repos import (
+    LLM_EVENTS_WATERMARK,
+    LLMEventRepo,
+    RetentionRepo,
+    RollupRepo,
+    hour_floor,
+)
+
+logger = get_logger(__name__)
+
+# Rollups are rebuilt one day at a time so a long backlog never holds one huge transaction.
+FOLD_CHUNK = timedelta(days=1)
+# Shared by every worker so only one of them folds and deletes at a time (Postgres only).
+_ADVISORY_LOCK_KEY = 0x11E7_7E7D
+
+
+@dataclass
+class RetentionReport:
+    cutoff: datetime | None = None
+    dry_run: bool = False
+    rows: int = 0
+    bytes_estimate: int = 0
+    rollup_rows: int = 0
+    folded_rollup_rows: int = 0
+    deleted: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class RetentionJob:
+    """Downsample raw ``llm_events`` older than ``retention_days`` to hourly rollups.
+
+    Hourly rollups for the expiring range are rebuilt from the raw rows first, then the
+    ``llm_events`` retention watermark is advanced, and only then are raw rows deleted in
+    batches of ``batch_size``, one transaction per batch. Readers answer anything before the
+    watermark from rollups, so results stay the same while rows are being deleted and after.
+    """
+
+    settings: Settings
+    retention_days: int = 0
+    batch_size: int = 5000
+    _report: RetentionReport = field(default_factory=RetentionReport, init=False)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> RetentionJob:
+        return cls(
+            settings,
+            retention_days=settings.llm_raw_retention_days,
+            batch_size=settings.llm_raw_retention_batch_size,
+        )
+
+    def cutoff(self, now: datetime | None = None) -> datetime | None:
+        if self.retention_days <= 0:
+            return None
+        return hour_floor((now or datetime.now(UTC)) - timedelta(days=self.retention_days))
+
+    def run(self, now: datetime | None = None, dry_run: bool = False) -> RetentionReport:
+        start = perf_counter()
+        cutoff = self.cutoff(now)
+        self._report = RetentionReport(cutoff=cutoff, dry_run=dry_run)
+        if cutoff is None:
+            return self._report
+        session_factory = get_session_factory(self.settings)
+        with session_factory() as session:
+            self._report.rows, self._report.bytes_estimate = LLMEventRepo(session).raw_usage(cutoff)
+            self._report.rollup_rows = RollupRepo(session).count_before(cutoff)
+        if not dry_run:
+            with self._exclusive() as acquired:
+                if acquired:
+                    self._fold(cutoff)
+                    self._delete(cutoff)
+        self._report.elapsed_seconds = perf_counter() - start
+        logger.info(
+            "llm_events_retention",
+            extra={
+                "extra": {
+                    "cutoff": cutoff.isoformat(),
+                    "dry_run": dry_run,
+                    "rows": self._report.rows,
+                    "bytes_estimate": self._report.bytes_estimate,
+                    "deleted": self._report.deleted,
+                    "batches": self._report.batches,
+                    "elapsed_seconds": round(self._report.elapsed_seconds, 3),
+                }
+            },
+        )
+        return self._report
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[bool]:
+        engine = get_engine(self.settings)
+        if engine.dialect.name != "postgresql":
+            yield True
+            return
+        with engine.connect() as conn:
+            acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}).scalar())
+            conn.commit()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+                    conn.commit()
+
+    def _fold(self, cutoff: datetime) -> None:
+        session_factory = get_session_factory(self.settings)
+        with session_factory() as session:
+            horizon = RetentionRepo(session).get(LLM_EVENTS_WATERMARK)
+            cursor = horizon or LLMEventRepo(session).earliest_timestamp()
+        if cursor is None or cursor >= cutoff:
+            return
+        cursor = hour_floor(cursor)
+        while cursor < cutoff:
+            end = min(cursor + FOLD_CHUNK, cutoff)
+            with session_factory() as session:
+                self._report.folded_rollup_rows += RollupRepo(session).rebuild(cursor, end)
+                session.commit()
+            cursor = end
+        with session_factory() as session:
+            RetentionRepo(session).advance(LLM_EVENTS_WATERMARK, cutoff)
+            session.commit()
+
+    def _delete(self, cutoff: datetime) -> None:
+        session_factory = get_session_factory(self.settings)
+        while True:
+            with session_factory() as session:
+                deleted = LLMEventRepo(session).delete_before(cutoff, self.batch_size)
+                session.commit()
+            self._report.deleted += deleted
+            self._report.batches += 1
+            if deleted < self.batch_size:
+                return
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime, timedelta
+
+from llm_revenue_analyzer.core.logging import get_logger
+from llm_revenue_analyzer.core.settings import Settings
+from llm_revenue_analyzer.store.db import get_session_factory
+from llm_revenue_analyzer.store.repos import (
+    LLM_EVENTS_WATERMARK,
+    RetentionRepo,
+    RollupRepo,
+    hour_floor,
+)
+
+logger = get_logger(__name__)
+
+TenantHour = tuple[str, datetime]
+
+
+class RollupCompactor:
+    """Rebuild the hourly rollups of tenant-hours touched by ingest (``LRA_ROLLUP_MODE=deferred``).
+
+    Inline rollups upsert the hourly row and its latency bins inside every ingest transaction, so
+    concurrent ingest for one tenant/model/hour queues on those rows until each request commits.
+    In deferred mode ingest only marks ``(tenant_id, hour)`` after its commit, and ``run`` rebuilds
+    each marked hour from raw rows in a short transaction of its own. Rollups, and the rollup
+    engine, then trail ingest by up to one compaction interval. Marks live in this process; after
+    a crash, rebuild the affected range with ``scripts.rebuild_rollups``.
+
+    ``rebuild`` never touches hours before the retention watermark, so events for those hours, or
+    for hours retention may fold before the next compaction, are still rolled up inline.
+    """
+
+    def __init__(self, settings: Settings, on_rebuilt: Callable[[str, list[datetime]], None] | None = None) -> None:
+        self.settings = settings
+        self.on_rebuilt = on_rebuilt
+        self._lock = threading.Lock()
+        self._dirty: set[TenantHour] = set()
+        self._horizon: datetime | None = None
+        self._horizon_loaded = False
+
+    def __len__(self) -> int:
+        return len(self._dirty)
+
+    def applies_inline(self, timestamp: datetime, now: datetime | None = None) -> bool:
+        """Whether ingest must upsert this event's rollup itself because no rebuild will cover it."""
+        if not self._horizon_loaded:
+            self._load_horizon()
+        threshold = self._horizon
+        if self.settings.llm_raw_retention_days > 0:
+            ahead = timedelta(hours=1, seconds=self.settings.rollup_compact_seconds)
+            cutoff = hour_floor((now or datetime.now(UTC)) - timedelta(days=self.settings.llm_raw_retention_days) + ahead)
+            threshold = cutoff if threshold is None else max(threshold, cutoff)
+        return threshold is not None and hour_floor(timestamp) < threshold
+
+    def mark(self, tenant_id: str, timestamps: Iterable[datetime]) -> None:
+        with self._lock:
+            self._dirty.update((tenant_id, hour_floor(timestamp)) for timestamp in timestamps)
+
+    def run(self) -> int:
+        """Rebuild every marked tenant-hour; returns how many were rebuilt."""
+        self._load_horizon()
+        with self._lock:
+            dirty, self._dirty = sorted(self._dirty), set()
+        session_factory = get_session_factory(self.settings)
+        for index, (tenant_id, hour) in enumerate(dirty):
+            try:
+                with session_factory() as session:
+                    repo = RollupRepo(session)
+                    repo.lock_hour(tenant_id, hour)
+                    repo.rebuild(hour, hour + timedelta(hours=1), tenant_id=tenant_id)
+                    session.commit()
+            except Exception:
+                # Keep the hours not rebuilt yet for the next run.
+                with self._lock:
+                    self._dirty.update(dirty[index:])
+                raise
+            if self.on_rebuilt is not None:
+                self.on_rebuilt(tenant_id, [hour])
+        if dirty:
+            logger.info("llm_rollups_compacted", extra={"extra": {"tenant_hours": len(dirty)}})
+        return len(dirty)
+
+    def _load_horizon(self) -> None:
+        with get_session_factory(self.settings)() as session:
+            self._horizon = RetentionRepo(session).get(LLM_EVENTS_WATERMARK)
+        self._horizon_loaded = True
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from llm_revenue_analyzer.api.app import create_app
@@ -51,3 +52,31 @@ def client(test_settings: Settings) -> Generator[TestClient, None, None]:
 
     reset_engine()
     get_settings.cache_clear()
+
+
+@pytest.fixture()
+def make_app(test_settings: Settings) -> Generator[Callable[..., FastAPI], None, None]:
+    """Build an app on ``test_settings`` with ``updates`` applied; engine and settings reset on teardown."""
+    apps: list[FastAPI] = []
+
+    def _make_app(**updates: object) -> FastAPI:
+        settings = test_settings.model_copy(update=updates)
+        create_all(settings)
+        app = create_app(settings)
+        app.dependency_overrides[get_settings] = lambda: settings
+        apps.append(app)
+        return app
+
+    try:
+        yield _make_app
+    finally:
+        for app in apps:
+            app.dependency_overrides.clear()
+        reset_engine()
+        get_settings.cache_clear()
+
+
+@pytest.fixture()
+def async_client(make_app: Callable[..., FastAPI]) -> Generator[TestClient, None, None]:
+    with TestClient(make_app(db_mode="async")) as test_client:
+        yield test_client
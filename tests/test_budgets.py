@@ -1,6 +1,13 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from llm_revenue_analyzer.budgets import BudgetService, SpendLedger
+from llm_revenue_analyzer.store.db import create_all, get_session_factory
+from llm_revenue_analyzer.store.models import LLMEvent
+from llm_revenue_analyzer.store.repos import BudgetRepo, TenantRepo
 
 
 def test_budget_hard_limit_blocks(client) -> None:
@@ -30,3 +37,139 @@ def test_budget_hard_limit_blocks(client) -> None:
     assert response.status_code == 403
     detail = response.json()["detail"]
     assert detail["guardrail_status"] == "hard_limit_exceeded"
+
+
+def test_budget_hard_limit_applies_within_batch(client) -> None:
+    budget = {
+        "tenant_id": "tenant-batch-hard",
+        "monthly_budget_usd": 0.002,
+        "hard_limit": True,
+        "soft_limit_pct": 0.9,
+    }
+    assert client.post("/budgets/set", json=budget).status_code == 200
+
+    item = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "tenant_id": "tenant-batch-hard",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 300,
+        "status": "success",
+        "feature": "chat",
+    }
+    items = [{**item, "request_id": f"req-bh{i}"} for i in range(4)]
+    response = client.post("/events/llm/batch", json=items)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [r["accepted"] for r in results] == [True, True, False, False]
+    assert results[2]["guardrail_status"] == "hard_limit_exceeded"
+
+
+def test_spend_ledger_tracks_commits_and_reconciles(test_settings) -> None:
+    create_all(test_settings)
+    now = datetime.now(UTC)
+    ledger = SpendLedger()
+    with get_session_factory(test_settings)() as session:
+        TenantRepo(session).ensure("tenant-ledger")
+        session.add(_llm_event("tenant-ledger", now, Decimal("1.5")))
+        session.commit()
+
+        assert ledger.month_spend(session, "tenant-ledger", now) == Decimal("1.5")
+
+        session.add(_llm_event("tenant-ledger", now, Decimal("0.25")))
+        ledger.record(session, "tenant-ledger", now, Decimal("0.25"))
+        assert ledger.month_spend(session, "tenant-ledger", now) == Decimal("1.75")
+        session.commit()
+        assert ledger.month_spend(session, "tenant-ledger", now) == Decimal("1.75")
+
+        session.add(_llm_event("tenant-ledger", now, Decimal("5")))
+        ledger.record(session, "tenant-ledger", now, Decimal("5"))
+        session.rollback()
+        assert ledger.month_spend(session, "tenant-ledger", now) == Decimal("1.75")
+
+        session.add(_llm_event("tenant-ledger", now, Decimal("2")))
+        session.commit()
+        assert ledger.reconcile(session, now) == 1
+        assert ledger.month_spend(session, "tenant-ledger", now) == Decimal("3.75")
+
+
+def test_hard_limit_rechecks_database_when_other_workers_spent(test_settings) -> None:
+    create_all(test_settings)
+    now = datetime.now(UTC)
+    factory = get_session_factory(test_settings)
+    worker_a, worker_b = SpendLedger(), SpendLedger()
+    with factory() as session:
+        TenantRepo(session).ensure("tenant-workers")
+        BudgetService(session, ledger=worker_a).set_budget("tenant-workers", Decimal("1"), True, 0.99)
+        session.commit()
+        # Both workers have cached the month total before either admits anything.
+        assert worker_a.month_spend(session, "tenant-workers", now) == worker_b.month_spend(session, "tenant-workers", now) == 0
+
+    with factory() as session:
+        assert BudgetService(session, ledger=worker_a).evaluate_llm_cost("tenant-workers", Decimal("0.6"), now).allowed
+        session.add(_llm_event("tenant-workers", now, Decimal("0.6")))
+        worker_a.record(session, "tenant-workers", now, Decimal("0.6"))
+        session.commit()
+
+    with factory() as session:
+        service = BudgetService(session, ledger=worker_b)
+        # Far from the limit worker B trusts its ledger; near it, the database decides.
+        assert service.evaluate_llm_cost("tenant-workers", Decimal("0.1"), now).current_spend_usd == 0.0
+        rejected = service.evaluate_llm_cost("tenant-workers", Decimal("0.85"), now)
+        assert (rejected.allowed, rejected.current_spend_usd) == (False, 0.6)
+        assert worker_b.month_spend(session, "tenant-workers", now) == Decimal("0.6")
+        batch = service.evaluate_llm_batch("tenant-workers", [(Decimal("0.3"), now), (Decimal("0.3"), now)])
+        assert [evaluation.allowed for evaluation in batch] == [True, False]
+
+
+def test_batch_locks_budget_rows_in_tenant_order(client, monkeypatch) -> None:
+    locked: list[str] = []
+    lock = BudgetRepo.lock
+
+    def record(self, tenant_id: str) -> None:
+        locked.append(tenant_id)
+        lock(self, tenant_id)
+
+    monkeypatch.setattr(BudgetRepo, "lock", record)
+    tenants = ["tenant-lock-z", "tenant-lock-m", "tenant-lock-z"]
+    for tenant_id in set(tenants):
+        budget = {"tenant_id": tenant_id, "monthly_budget_usd": 1.0, "hard_limit": True, "soft_limit_pct": 0.99}
+        assert client.post("/budgets/set", json=budget).status_code == 200
+    base = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 10,
+        "completion_tokens": 10,
+        "latency_ms": 50,
+        "status": "success",
+        "feature": "chat",
+        "cost_usd": 0.9,
+    }
+    items = [{**base, "tenant_id": tenant_id, "request_id": f"req-{idx}"} for idx, tenant_id in enumerate(tenants)]
+    body = client.post("/events/llm/batch", json=items).json()
+    assert [result["accepted"] for result in body["results"]] == [True, True, False]
+    # Near the hard limit each tenant's budget row is locked once, in one global order.
+    assert locked == ["tenant-lock-m", "tenant-lock-z"]
+
+
+def _llm_event(tenant_id: str, timestamp: datetime, cost_usd: Decimal) -> LLMEvent:
+    return LLMEvent(
+        timestamp=timestamp,
+        tenant_id=tenant_id,
+        user_id="user-1",
+        request_id=f"req-ledger-{uuid4().hex}",
+        model="gpt-4o-mini",
+        provider="openai",
+        prompt_tokens=10,
+        completion_tokens=10,
+        total_tokens=20,
+        latency_ms=100,
+        status="success",
+        cost_usd=cost_usd,
+        feature="chat",
+    )
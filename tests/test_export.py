@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import UTC, datetime, timedelta
+
+
+def _llm_event(ts: datetime, tenant_id: str, request_id: str) -> dict[str, object]:
+    return {
+        "timestamp": ts.isoformat(),
+        "tenant_id": tenant_id,
+        "user_id": "user-1",
+        "request_id": request_id,
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 100,
+        "completion_tokens": 50,
+        "latency_ms": 120,
+        "status": "success",
+        "feature": "chat",
+        "metadata_json": {"n": request_id},
+    }
+
+
+def test_export_streams_keyset_pages_and_resumes(client) -> None:
+    client.app.state.settings.export_page_size = 2
+    start = datetime.now(UTC).replace(microsecond=0) - timedelta(hours=1)
+    events = [
+        _llm_event(start + timedelta(minutes=minute), tenant_id, f"{tenant_id}-{minute}")
+        for tenant_id, minute in [("tenant-b", 1), ("tenant-a", 3), ("tenant-a", 1), ("tenant-b", 1), ("tenant-a", 2)]
+    ]
+    events[3]["request_id"] = "tenant-b-1-retry"
+    events.append(_llm_event(start - timedelta(days=1), "tenant-a", "outside"))
+    for event in events:
+        assert client.post("/events/llm", json=event).status_code == 200
+    client.post(
+        "/events/revenue",
+        json={"timestamp": start.isoformat(), "tenant_id": "tenant-a", "user_id": "u", "amount_usd": 9.5, "source": "stripe"},
+    )
+    window = {"from": start.isoformat(), "to": (start + timedelta(hours=1)).isoformat()}
+
+    response = client.get("/events/llm/export", params=window)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["request_id"] for row in rows] == ["tenant-a-1", "tenant-a-2", "tenant-a-3", "tenant-b-1", "tenant-b-1-retry"]
+    assert rows[3]["id"] < rows[4]["id"]
+    assert rows[0]["cost_usd"] == "0.000045"
+
+    resumed = client.get("/events/llm/export", params={**window, "resume_token": rows[2]["resume_token"]})
+    assert [json.loads(line)["id"] for line in resumed.text.splitlines()] == [rows[3]["id"], rows[4]["id"]]
+
+    tenant_csv = client.get("/events/llm/export", params={**window, "tenant_id": "tenant-b", "format": "csv"})
+    records = list(csv.DictReader(io.StringIO(tenant_csv.text)))
+    assert [record["id"] for record in records] == [str(rows[3]["id"]), str(rows[4]["id"])]
+    assert json.loads(records[0]["metadata_json"]) == {"n": "tenant-b-1"}
+
+    revenue = client.get("/events/revenue/export", params=window)
+    assert [json.loads(line)["amount_usd"] for line in revenue.text.splitlines()] == ["9.500000"]
+
+    assert client.get("/events/llm/export", params={**window, "resume_token": "nope"}).status_code == 422
@@ -1,7 +1,169 @@
 from __future__ import annotations
 
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import exc as sa_exc
+
+from llm_revenue_analyzer.analytics import AnalyticsService
+from llm_revenue_analyzer.budgets import BudgetService
+from llm_revenue_analyzer.store.db import InstrumentedQueuePool, instrument_pool
+
 
 def test_health(client) -> None:
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] in {"ok", "degraded"}
+
+
+def test_async_db_mode_round_trip(async_client) -> None:
+    now = datetime.now(UTC)
+    assert async_client.get("/health").json() == {"status": "ok", "database": "ok"}
+
+    event = {
+        "timestamp": now.isoformat(),
+        "tenant_id": "tenant-async",
+        "user_id": "user-1",
+        "request_id": "req-async",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 500,
+        "status": "success",
+        "feature": "chat",
+    }
+    assert async_client.post("/events/llm", json=event).status_code == 200
+    batch = [{**event, "request_id": f"req-async-{i}"} for i in range(2)]
+    assert async_client.post("/events/llm/batch", json=batch).json()["accepted"] == 2
+    budget = {"tenant_id": "tenant-async", "monthly_budget_usd": 10, "hard_limit": True, "soft_limit_pct": 0.8}
+    assert async_client.post("/budgets/set", json=budget).status_code == 200
+
+    params = {
+        "tenant_id": "tenant-async",
+        "from": (now - timedelta(hours=1)).isoformat(),
+        "to": (now + timedelta(hours=1)).isoformat(),
+    }
+    summary = async_client.get("/metrics/summary", params=params).json()
+    assert summary["requests"] == 3
+    status = async_client.get("/budgets/status", params={"tenant_id": "tenant-async"}).json()
+    assert status["monthly_spend_usd"] == pytest.approx(summary["cost_usd"])
+
+
+def test_async_db_mode_keeps_cpu_heavy_handlers_off_the_event_loop(async_client, monkeypatch) -> None:
+    on_loop: dict[str, bool] = {}
+
+    def recording(owner: type, name: str) -> None:
+        original = getattr(owner, name)
+
+        def wrapper(self, *args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop[name] = True
+            except RuntimeError:
+                on_loop[name] = False
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(owner, name, wrapper)
+
+    for name in ("summary", "summaries", "by_model", "by_feature"):
+        recording(AnalyticsService, name)
+    recording(BudgetService, "evaluate_llm_batch")
+    recording(BudgetService, "evaluate_llm_cost")
+
+    now = datetime.now(UTC)
+    event = {
+        "timestamp": now.isoformat(),
+        "tenant_id": "tenant-async-cpu",
+        "user_id": "user-1",
+        "request_id": "req-async-cpu",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 500,
+        "status": "success",
+        "feature": "chat",
+    }
+    assert async_client.post("/events/llm", json=event).status_code == 200
+    batch = [{**event, "request_id": f"req-async-cpu-{i}"} for i in range(3)]
+    assert async_client.post("/events/llm/batch", json=batch).json()["accepted"] == 3
+    params = {
+        "tenant_id": "tenant-async-cpu",
+        "from": (now - timedelta(hours=1)).isoformat(),
+        "to": (now + timedelta(hours=1)).isoformat(),
+    }
+    assert async_client.get("/metrics/summary", params=params).json()["requests"] == 4
+    by_model = async_client.get("/metrics/by-model", params=params).json()["rows"]
+    assert [row["requests"] for row in by_model] == [4]
+    by_feature = async_client.get("/metrics/by-feature", params=params).json()["rows"]
+    assert [(row["feature"], row["requests"]) for row in by_feature] == [("chat", 4)]
+    fleet = async_client.get("/metrics/summary/all", params={k: params[k] for k in ("from", "to")}).json()
+    assert fleet["rows"][0]["tenant_id"] == "tenant-async-cpu"
+
+    assert on_loop == {
+        "evaluate_llm_cost": True,
+        "evaluate_llm_batch": False,
+        "summary": False,
+        "by_model": False,
+        "by_feature": False,
+        "summaries": False,
+    }
+
+
+def test_async_db_mode_serves_requests_while_a_cpu_handler_runs(async_client, monkeypatch) -> None:
+    entered, release = threading.Event(), threading.Event()
+    released: list[bool] = []
+    summary = AnalyticsService.summary
+
+    def blocking_summary(self, *args, **kwargs):
+        entered.set()
+        released.append(release.wait(5))
+        return summary(self, *args, **kwargs)
+
+    monkeypatch.setattr(AnalyticsService, "summary", blocking_summary)
+    now = datetime.now(UTC)
+    params = {
+        "tenant_id": "tenant-async-blocked",
+        "from": (now - timedelta(hours=1)).isoformat(),
+        "to": (now + timedelta(hours=1)).isoformat(),
+    }
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(async_client.get, "/metrics/summary", params=params)
+        assert entered.wait(5)
+        # The summary holds a worker thread, not the event loop, so health answers meanwhile.
+        assert async_client.get("/health").json()["database"] == "ok"
+        release.set()
+        assert pending.result(5).json()["requests"] == 0
+    # On the event loop the summary would have stalled health until its wait timed out.
+    assert released == [True]
+
+
+def test_pool_metrics_track_checkouts_and_timeouts() -> None:
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:"),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.01,
+        logging_name="test",
+    )
+    instrument_pool(pool)
+
+    def sample(name: str) -> float | None:
+        return REGISTRY.get_sample_value(name, {"pool": "test"})
+
+    connection = pool.connect()
+    assert sample("lra_db_pool_checked_out") == 1
+    assert sample("lra_db_pool_checkout_wait_seconds_count") == 1
+    with pytest.raises(sa_exc.TimeoutError):
+        pool.connect()
+    assert sample("lra_db_pool_timeouts_total") == 1
+    connection.close()
+    assert sample("lra_db_pool_checked_out") == 0
+    assert sample("lra_db_pool_size") == 1
+    pool.dispose()
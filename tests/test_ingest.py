@@ -1,6 +1,27 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import json
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, text
+
+from llm_revenue_analyzer.analytics import DailyCostSeries
+from llm_revenue_analyzer.budgets import BudgetService
+from llm_revenue_analyzer.store.db import create_all, get_engine, get_session_factory
+from llm_revenue_analyzer.store.models import LLMEvent
+from llm_revenue_analyzer.store.repos import (
+    LLM_EVENTS_WATERMARK,
+    AlertRepo,
+    LLMEventRepo,
+    RetentionRepo,
+    RevenueEventRepo,
+    RollupRepo,
+    TenantRepo,
+)
 
 
 def test_ingest_llm_computes_cost(client) -> None:
@@ -24,3 +45,439 @@ def test_ingest_llm_computes_cost(client) -> None:
     assert body["cost_source"] == "computed"
     assert body["cost_usd"] == 0.00075
     assert body["accepted"] is True
+    assert body["pricing_version"] == client.app.state.pricing_watcher.current.version
+
+
+def test_ingest_llm_batch_per_item_results(client) -> None:
+    now = datetime.now(UTC).isoformat()
+    base = {
+        "timestamp": now,
+        "tenant_id": "tenant-batch",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 500,
+        "status": "success",
+        "feature": "chat",
+    }
+    items = [
+        {**base, "request_id": "req-b1"},
+        {**base, "request_id": "req-b2", "model": "unknown-model"},
+        {**base, "request_id": "req-b3", "prompt_tokens": -1},
+        {**base, "request_id": "req-b4", "cost_usd": 0.5},
+    ]
+    response = client.post("/events/llm/batch", json=items)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (2, 2)
+    results = body["results"]
+    assert [r["accepted"] for r in results] == [True, False, False, True]
+    assert results[0]["cost_usd"] == 0.00075
+    assert results[3]["cost_source"] == "supplied"
+    assert results[1]["error"] and results[2]["error"]
+
+    ndjson = "\n".join(json.dumps({**base, "request_id": f"req-n{i}"}) for i in range(3))
+    response = client.post(
+        "/events/llm/batch",
+        content=ndjson,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["accepted"] == 3
+
+
+def test_retried_llm_events_are_deduplicated(client, test_settings) -> None:
+    now = datetime.now(UTC)
+    event = {
+        "timestamp": now.isoformat(),
+        "tenant_id": "tenant-dedup",
+        "user_id": "user-1",
+        "request_id": "req-d1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 500,
+        "status": "success",
+        "feature": "chat",
+    }
+    first = client.post("/events/llm", json=event).json()
+    assert first["duplicate"] is False
+    cached = client.post("/events/llm", json=event).json()
+    assert (cached["duplicate"], cached["event_id"], cached["cost_usd"]) == (True, first["event_id"], 0.00075)
+
+    client.app.state.recent_requests = None
+    stored = client.post("/events/llm", json={**event, "cost_usd": 9}).json()
+    assert (stored["duplicate"], stored["event_id"], stored["cost_source"]) == (True, first["event_id"], "computed")
+
+    items = [event, {**event, "request_id": "req-d2"}, {**event, "request_id": "req-d2"}]
+    body = client.post("/events/llm/batch", json=items).json()
+    assert (body["accepted"], body["duplicates"]) == (3, 2)
+    assert [r["duplicate"] for r in body["results"]] == [True, False, True]
+    assert body["results"][0]["event_id"] == first["event_id"]
+    assert body["results"][1]["event_id"] == body["results"][2]["event_id"]
+
+    with get_session_factory(test_settings)() as session:
+        assert LLMEventRepo(session).month_cost_sum("tenant-dedup", now) == Decimal("0.0015")
+        rollup_cost = sum(r.cost_usd for r in RollupRepo(session).list_for_window("tenant-dedup", now - timedelta(hours=1), now + timedelta(hours=1)))
+        assert rollup_cost == Decimal("0.0015")
+
+
+def test_retries_are_deduplicated_when_the_unique_index_includes_timestamp(test_settings, make_app) -> None:
+    create_all(test_settings)
+    engine = get_engine(test_settings)
+    with engine.begin() as conn:
+        # The shape of migration 0009 on a partitioned Postgres table.
+        conn.execute(text("DROP INDEX uq_llm_events_tenant_request"))
+        conn.execute(
+            text("CREATE UNIQUE INDEX uq_llm_events_tenant_request ON llm_events (tenant_id, request_id, timestamp)")
+        )
+    app = make_app()
+    now = datetime.now(UTC)
+    event = {
+        "timestamp": now.isoformat(),
+        "tenant_id": "tenant-partitioned",
+        "user_id": "user-1",
+        "request_id": "req-p1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 500,
+        "status": "success",
+        "feature": "chat",
+    }
+    with TestClient(app) as client:
+        client.app.state.recent_requests = None
+        first = client.post("/events/llm", json=event).json()
+        retry = client.post("/events/llm", json={**event, "timestamp": (now + timedelta(seconds=3)).isoformat()}).json()
+        assert (retry["duplicate"], retry["event_id"]) == (True, first["event_id"])
+        batch = client.post("/events/llm/batch", json=[{**event, "timestamp": (now - timedelta(seconds=3)).isoformat()}])
+        assert batch.json()["duplicates"] == 1
+
+    with get_session_factory(test_settings)() as session:
+        assert LLMEventRepo(session).month_cost_sum("tenant-partitioned", now) == Decimal("0.00075")
+
+
+def test_batch_visits_tenants_in_sorted_order(client, monkeypatch) -> None:
+    order: list[tuple[str, str]] = []
+    ensure, evaluate_llm_batch = TenantRepo.ensure, BudgetService.evaluate_llm_batch
+
+    def record_ensure(self, tenant_id, name=None):
+        order.append(("tenant", tenant_id))
+        return ensure(self, tenant_id, name)
+
+    def record_evaluate(self, tenant_id, items):
+        order.append(("budget", tenant_id))
+        return evaluate_llm_batch(self, tenant_id, items)
+
+    monkeypatch.setattr(TenantRepo, "ensure", record_ensure)
+    monkeypatch.setattr(BudgetService, "evaluate_llm_batch", record_evaluate)
+    base = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 10,
+        "completion_tokens": 10,
+        "latency_ms": 50,
+        "status": "success",
+        "feature": "chat",
+    }
+    tenants = ["tenant-order-c", "tenant-order-a", "tenant-order-b", "tenant-order-a"]
+    items = [{**base, "tenant_id": tenant_id, "request_id": f"req-{idx}"} for idx, tenant_id in enumerate(tenants)]
+    assert client.post("/events/llm/batch", json=items).json()["accepted"] == 4
+    # Row locks (tenant rows, then budget rows) follow one global order whatever the body order is.
+    ordered = sorted(set(tenants))
+    assert order == [("tenant", tenant_id) for tenant_id in ordered] + [("budget", tenant_id) for tenant_id in ordered]
+
+
+def test_batch_request_id_locks_follow_one_order_across_tenants(client, monkeypatch) -> None:
+    calls: list[list[tuple[str, str]]] = []
+    lock_request_ids = LLMEventRepo.lock_request_ids
+
+    def record(self, keys) -> None:
+        calls.append(list(keys))
+        lock_request_ids(self, calls[-1])
+
+    monkeypatch.setattr(LLMEventRepo, "request_id_unique", lambda self: False)
+    monkeypatch.setattr(LLMEventRepo, "lock_request_ids", record)
+    base = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 10,
+        "completion_tokens": 10,
+        "latency_ms": 50,
+        "status": "success",
+        "feature": "chat",
+    }
+    keys = [
+        ("tenant-lock-b", "req-2"),
+        ("tenant-lock-a", "req-9"),
+        ("tenant-lock-b", "req-1"),
+        ("tenant-lock-a", "req-3"),
+    ]
+    items = [{**base, "tenant_id": tenant_id, "request_id": request_id} for tenant_id, request_id in keys]
+    assert client.post("/events/llm/batch", json=items).json()["accepted"] == 4
+    # Every key of the batch is locked in one call, before any tenant is processed.
+    assert len(calls) == 1 and sorted(calls[0]) == sorted(keys)
+
+    executed: list[dict[str, object]] = []
+    postgres = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+        execute=lambda stmt: executed.append(stmt.compile().params),
+    )
+    lock_request_ids(LLMEventRepo(postgres), calls[0])
+    assert [next(iter(params.values())) for params in executed] == [
+        "tenant-lock-a\x1freq-3",
+        "tenant-lock-a\x1freq-9",
+        "tenant-lock-b\x1freq-1",
+        "tenant-lock-b\x1freq-2",
+    ]
+
+
+def test_anomaly_checks_are_queued_and_coalesced(client, test_settings) -> None:
+    now = datetime.now(UTC).replace(hour=12)
+    base = {
+        "tenant_id": "tenant-spike",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 10,
+        "completion_tokens": 10,
+        "latency_ms": 100,
+        "status": "success",
+        "feature": "chat",
+    }
+    items = [
+        {**base, "request_id": f"req-base-{days}", "timestamp": (now - timedelta(days=days)).isoformat(), "cost_usd": 1}
+        for days in (1, 2, 3)
+    ]
+    items += [
+        {**base, "request_id": f"req-today-{i}", "timestamp": (now + timedelta(minutes=i)).isoformat(), "cost_usd": 5}
+        for i in range(3)
+    ]
+    response = client.post("/events/llm/batch", json=items)
+    assert response.status_code == 200, response.text
+    assert response.json()["anomaly_warnings"] == []
+
+    queue = client.app.state.anomaly_queue
+    assert len(queue) == 4
+
+    series = client.app.state.daily_cost_series
+    with get_session_factory(test_settings)() as session:
+        results = queue.process(session, multiplier=2.0, lookback_days=7, series=series)
+        assert len(queue) == 0
+        assert [r.triggered for r in results] == [False, False, False, True]
+        assert results[-1].today_cost_usd == 15.0
+        alerts = AlertRepo(session).list_recent("tenant-spike")
+        assert [a.type for a in alerts] == ["cost_anomaly"]
+
+
+def test_inline_anomaly_checks_count_each_event_once(make_app) -> None:
+    app = make_app(anomaly_check_interval_seconds=0, anomaly_multiplier=2.0)
+    settings = app.state.settings
+    now = datetime.now(UTC).replace(hour=12)
+    base = {
+        "tenant_id": "tenant-inline",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 10,
+        "completion_tokens": 10,
+        "latency_ms": 100,
+        "status": "success",
+        "feature": "chat",
+    }
+
+    def post(request_id: str, at: datetime, cost: float) -> dict[str, object]:
+        payload = {**base, "request_id": request_id, "timestamp": at.isoformat(), "cost_usd": cost}
+        response = client.post("/events/llm", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    with TestClient(app) as client:
+        batch = [
+            {**base, "request_id": f"inline-base-{days}", "timestamp": (now - timedelta(days=days)).isoformat(), "cost_usd": 1}
+            for days in (1, 2, 3)
+        ]
+        assert client.post("/events/llm/batch", json=batch).json()["anomaly_warnings"] == []
+        assert post("inline-1", now, 1.0)["anomaly_warning"] is None
+        assert post("inline-2", now + timedelta(minutes=1), 1.0)["anomaly_warning"] is None
+        series = app.state.daily_cost_series
+        with get_session_factory(settings)() as session:
+            fresh = DailyCostSeries(settings.anomaly_lookback_days + 1).window(session, "tenant-inline", now.date(), 7)
+            assert series.window(session, "tenant-inline", now.date(), 7) == fresh
+            assert fresh[now.date()] == Decimal("2")
+        # The event that crosses the threshold is the one that reports it.
+        assert post("inline-3", now + timedelta(minutes=2), 0.5)["anomaly_warning"] is not None
+        with get_session_factory(settings)() as session:
+            assert [a.type for a in AlertRepo(session).list_recent("tenant-inline")] == ["cost_anomaly"]
+
+
+def test_daily_cost_series_matches_history(client, test_settings) -> None:
+    now = datetime.now(UTC).replace(hour=12)
+    base = {
+        "tenant_id": "tenant-series",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 10,
+        "completion_tokens": 10,
+        "latency_ms": 100,
+        "status": "success",
+        "feature": "chat",
+    }
+
+    def post(request_id: str, ts: datetime, cost: float) -> None:
+        payload = {**base, "request_id": request_id, "timestamp": ts.isoformat(), "cost_usd": cost}
+        response = client.post("/events/llm", json=payload)
+        assert response.status_code == 200, response.text
+
+    for days in (9, 4, 2):
+        post(f"req-old-{days}", now - timedelta(days=days), 1.5)
+
+    series = DailyCostSeries(capacity=4)
+    with get_session_factory(test_settings)() as session:
+        today = now.date()
+        assert series.window(session, "tenant-series", today, 3) == {(now - timedelta(days=2)).date(): Decimal("1.5")}
+
+        post("req-today", now, 2.0)
+        series.add("tenant-series", now, Decimal("2.0"))
+        post("req-yesterday", now - timedelta(days=1), 0.5)
+        series.add("tenant-series", now - timedelta(days=1), Decimal("0.5"))
+
+        expected = {
+            (now - timedelta(days=2)).date(): Decimal("1.5"),
+            (now - timedelta(days=1)).date(): Decimal("0.5"),
+            today: Decimal("2.0"),
+        }
+        assert series.window(session, "tenant-series", today, 3) == expected
+        history = DailyCostSeries(capacity=12).window(session, "tenant-series", today, 10)
+        assert {day: cost for day, cost in history.items() if day >= today - timedelta(days=3)} == expected
+        assert (now - timedelta(days=9)).date() in series.window(session, "tenant-series", today, 9)
+        assert series.reconcile(session) == 0
+
+
+def test_revenue_feature_is_stored_as_column(client, test_settings) -> None:
+    base = {"timestamp": datetime.now(UTC).isoformat(), "tenant_id": "tenant-rev", "user_id": "u", "source": "stripe"}
+    for extra in (
+        {"amount_usd": 1.0, "feature": "search", "metadata_json": {"feature": "ignored"}},
+        {"amount_usd": 2.0, "metadata_json": {"feature": "chat"}},
+        {"amount_usd": 4.0},
+    ):
+        assert client.post("/events/revenue", json={**base, **extra}).status_code == 200
+    with get_session_factory(test_settings)() as session:
+        totals = RevenueEventRepo(session).sum_by_feature(
+            "tenant-rev", datetime.now(UTC) - timedelta(hours=1), datetime.now(UTC) + timedelta(hours=1)
+        )
+    assert sorted(totals) == [
+        ("chat", None, Decimal("2.000000")),
+        ("search", None, Decimal("1.000000")),
+        ("unattributed", None, Decimal("4.000000")),
+    ]
+
+
+def test_buffered_ingest_group_commits_and_flushes_on_shutdown(make_app) -> None:
+    app = make_app(ingest_mode="buffered", ingest_buffer_flush_events=3, ingest_buffer_flush_ms=60_000)
+    session_factory = get_session_factory(app.state.settings)
+    base = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "tenant_id": "tenant-buffered",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 200,
+        "status": "success",
+        "feature": "chat",
+    }
+
+    def stored(tenant_id: str = "tenant-buffered") -> int:
+        with session_factory() as session:
+            return session.scalar(select(func.count()).where(LLMEvent.tenant_id == tenant_id)) or 0
+
+    with TestClient(app) as client:
+        first = client.post("/events/llm", json={**base, "request_id": "buf-1"})
+        assert first.status_code == 202, first.text
+        assert first.json()["queued"] is True and first.json()["cost_usd"] == 0.00075
+        retry = client.post("/events/llm", json={**base, "request_id": "buf-1"}).json()
+        assert retry["duplicate"] is True and retry["provisional_id"] == first.json()["provisional_id"]
+        assert stored() == 0
+
+        for idx in (2, 3, 4):
+            assert client.post("/events/llm", json={**base, "request_id": f"buf-{idx}"}).status_code == 202
+        deadline = time.monotonic() + 5
+        while stored() < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert stored() == 3
+
+        # Hard budget limits are enforced synchronously, so those tenants skip the buffer.
+        client.post("/budgets/set", json={"tenant_id": "tenant-capped", "monthly_budget_usd": 10, "hard_limit": True})
+        capped = client.post("/events/llm", json={**base, "tenant_id": "tenant-capped", "request_id": "cap-1"})
+        assert capped.status_code == 200 and capped.json()["event_id"] > 0
+
+    assert stored() == 4
+    assert stored("tenant-capped") == 1
+
+
+def test_deferred_rollups_are_rebuilt_by_the_compactor(make_app) -> None:
+    app = make_app(rollup_mode="deferred", rollup_compact_seconds=3600, analytics_engine="rollup")
+    session_factory = get_session_factory(app.state.settings)
+    hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+    params = {"tenant_id": "tenant-deferred", "from": (hour - timedelta(hours=2)).isoformat(), "to": (hour + timedelta(hours=1)).isoformat()}
+    base = {
+        "tenant_id": "tenant-deferred",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 200,
+        "status": "success",
+        "feature": "chat",
+    }
+
+    def rollups() -> list[tuple[datetime, int, Decimal]]:
+        with session_factory() as session:
+            rows = RollupRepo(session).list_for_window("tenant-deferred", hour - timedelta(hours=2), hour + timedelta(hours=1))
+            return sorted((r.bucket_start.replace(tzinfo=UTC), r.requests, r.cost_usd) for r in rows)
+
+    with session_factory() as session:
+        RetentionRepo(session).advance(LLM_EVENTS_WATERMARK, hour - timedelta(days=1))
+        session.commit()
+
+    with TestClient(app) as client:
+        compactor = client.app.state.rollup_compactor
+        # A rebuild never reaches behind the retention watermark, so a late event there is rolled up inline.
+        late = hour - timedelta(days=2)
+        client.post("/events/llm", json={**base, "request_id": "def-late", "timestamp": late.isoformat()})
+        with session_factory() as session:
+            assert [r.requests for r in RollupRepo(session).list_for_window("tenant-deferred", late, late + timedelta(hours=1))] == [1]
+
+        client.post("/events/llm", json={**base, "request_id": "def-1", "timestamp": (hour + timedelta(minutes=5)).isoformat()})
+        batch = [
+            {**base, "request_id": f"def-{idx}", "timestamp": (hour - timedelta(minutes=idx)).isoformat()}
+            for idx in (2, 3)
+        ]
+        assert client.post("/events/llm/batch", json=batch).json()["accepted"] == 2
+        # Ingest only marks the tenant-hours; the rollup engine trails until the compactor runs.
+        assert rollups() == [] and len(compactor) == 3
+        assert client.get("/metrics/summary", params=params).json()["requests"] == 0
+
+        assert compactor.run() == 3
+        assert rollups() == [
+            (hour - timedelta(hours=1), 2, Decimal("0.0015")),
+            (hour, 1, Decimal("0.00075")),
+        ]
+        assert client.get("/metrics/summary", params=params).json()["requests"] == 3
+
+        client.post("/events/llm", json={**base, "request_id": "def-4", "timestamp": (hour + timedelta(minutes=6)).isoformat()})
+
+    # Stopping the app compacts what is still marked.
+    assert rollups()[-1] == (hour, 2, Decimal("0.0015"))
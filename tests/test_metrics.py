@@ -1,6 +1,33 @@
 from __future__ import annotations
 
+import json
+import random
+import time
 from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from math import ceil
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select
+
+from llm_revenue_analyzer.analytics import AnalyticsService, MetricsCacheKey, MetricsResultCache
+from llm_revenue_analyzer.analytics.bench import count_queries, run_bench
+from llm_revenue_analyzer.analytics.service import Window, _split_window
+from llm_revenue_analyzer.budgets import BudgetService, SpendLedger
+from llm_revenue_analyzer.core.money import micros_to_usd, to_micros
+from llm_revenue_analyzer.core.sketch import RELATIVE_ACCURACY, LatencySketch
+from llm_revenue_analyzer.observability.metrics import METRICS_CACHE_REQUESTS
+from llm_revenue_analyzer.store.db import create_all, get_session_factory
+from llm_revenue_analyzer.store.models import LLMEvent, RevenueEvent
+from llm_revenue_analyzer.store.repos import (
+    LLM_EVENTS_WATERMARK,
+    LLMEventRepo,
+    RetentionRepo,
+    RollupRepo,
+    TenantRepo,
+)
 
 
 def test_metrics_summary_shape(client) -> None:
@@ -49,3 +76,583 @@ def test_metrics_summary_shape(client) -> None:
     )
     assert by_model.status_code == 200
     assert isinstance(by_model.json()["rows"], list)
+
+    with_quantiles = client.get(
+        "/metrics/by-feature",
+        params={"tenant_id": "tenant-metrics", "from": from_ts, "to": to_ts, "quantiles": "0.5,0.99"},
+    )
+    assert with_quantiles.status_code == 200, with_quantiles.text
+    chat = next(row for row in with_quantiles.json()["rows"] if row["feature"] == "chat")
+    assert set(chat["latency_quantiles_ms"]) == {"p50", "p99"}
+
+    fleet = client.get(
+        "/metrics/summary/all",
+        params={"tenant_ids": "tenant-metrics,tenant-idle", "from": from_ts, "to": to_ts, "order_by": "margin_usd"},
+    )
+    assert fleet.status_code == 200, fleet.text
+    assert fleet.json()["total"] == 2
+    assert [row["tenant_id"] for row in fleet.json()["rows"]] == ["tenant-metrics", "tenant-idle"]
+    assert fleet.json()["rows"][0]["requests"] == body["requests"]
+
+
+def test_default_engine_reports_exact_latency_quantiles(client) -> None:
+    hour = datetime.now(UTC).replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    latencies = [101 + 7 * idx for idx in range(40)]
+    items = [
+        {
+            "timestamp": (hour + timedelta(minutes=idx)).isoformat(),
+            "tenant_id": "tenant-exact",
+            "user_id": "user-1",
+            "request_id": f"req-x{idx}",
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "prompt_tokens": 10,
+            "completion_tokens": 10,
+            "latency_ms": latency,
+            "status": "success",
+            "feature": "chat",
+        }
+        for idx, latency in enumerate(latencies)
+    ]
+    assert client.post("/events/llm/batch", json=items).json()["accepted"] == len(items)
+
+    # The window spans whole hours, which the opt-in rollup engine would answer from sketch bins.
+    params = {
+        "tenant_id": "tenant-exact",
+        "from": (hour - timedelta(hours=1)).isoformat(),
+        "to": (hour + timedelta(hours=2)).isoformat(),
+        "quantiles": "0.5,0.99",
+    }
+    body = client.get("/metrics/summary", params=params).json()
+    ordered = sorted(latencies)
+    assert body["p95_latency_ms"] == ordered[ceil(0.95 * len(ordered)) - 1]
+    assert body["latency_quantiles_ms"] == {"p50": ordered[19], "p99": ordered[39]}
+
+
+def _seed_window(test_settings) -> tuple[datetime, datetime]:
+    create_all(test_settings)
+    base = datetime(2026, 3, 10, 21, 17, tzinfo=UTC)
+    models = [("openai", "gpt-4o-mini"), ("anthropic", "claude-3-5-haiku")]
+    features = ["chat", "search", "copilot"]
+    with get_session_factory(test_settings)() as session:
+        TenantRepo(session).ensure("tenant-engines")
+        rows = []
+        for idx in range(60):
+            provider, model = models[idx % len(models)]
+            rows.append(
+                {
+                    "timestamp": base + timedelta(minutes=23 * idx),
+                    "tenant_id": "tenant-engines",
+                    "user_id": "user-1",
+                    "request_id": f"req-e{idx}",
+                    "model": model,
+                    "provider": provider,
+                    "prompt_tokens": 100 + idx,
+                    "completion_tokens": 50 + 2 * idx,
+                    "total_tokens": 150 + 3 * idx,
+                    "latency_ms": 100 + (idx * 37) % 900,
+                    "status": "error" if idx % 7 == 0 else "success",
+                    "cost_usd": Decimal("0.000123") * (idx + 1),
+                    "feature": features[idx % len(features)],
+                    "metadata_json": None,
+                }
+            )
+        LLMEventRepo(session).bulk_create(rows)
+        RollupRepo(session).apply(rows)
+        for idx in range(10):
+            session.add(
+                RevenueEvent(
+                    timestamp=base + timedelta(hours=2 * idx, minutes=5),
+                    tenant_id="tenant-engines",
+                    user_id="user-1",
+                    amount_usd=Decimal("1.25") * (idx + 1),
+                    currency="USD",
+                    source="usage",
+                    metadata_json={"feature": features[idx % 2]} if idx % 3 else None,
+                )
+            )
+        session.commit()
+    return base + timedelta(minutes=10), base + timedelta(hours=20, minutes=3)
+
+
+def _assert_matches(actual, expected, approx_latency: bool) -> None:
+    if isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for actual_item, expected_item in zip(actual, expected, strict=True):
+            _assert_matches(actual_item, expected_item, approx_latency)
+        return
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if approx_latency and key in {"p95_latency_ms", "latency_quantiles_ms"}:
+            assert actual[key] == pytest.approx(value, rel=RELATIVE_ACCURACY), key
+        else:
+            assert actual[key] == value, key
+
+
+# Expected results for ``_seed_window``, frozen from the original ``Decimal`` sums over ORM rows so
+# that rewrites of the python engine are checked too rather than used as the yardstick.
+ENGINE_REFERENCE = Path(__file__).parent / "fixtures" / "engine_reference.json"
+
+
+def _engine_reference(quantiles: tuple[float, ...]) -> dict[str, Any]:
+    reference = json.loads(ENGINE_REFERENCE.read_text())
+    keys = {f"p{q * 100:g}" for q in quantiles}
+
+    def trim(row: dict[str, Any]) -> dict[str, Any]:
+        row = dict(row)
+        selected = {key: value for key, value in row.pop("latency_quantiles_ms").items() if key in keys}
+        return {**row, "latency_quantiles_ms": selected} if quantiles else row
+
+    summary = trim(reference["summary"])
+    summary["from"], summary["to"] = datetime.fromisoformat(summary["from"]), datetime.fromisoformat(summary["to"])
+    breakdowns = {
+        name: {granularity: [trim(row) for row in rows] for granularity, rows in reference[name].items()}
+        for name in ("by_model", "by_feature")
+    }
+    return {"summary": summary, **breakdowns}
+
+
+@pytest.mark.parametrize("engine", ["python", "rollup", "sql"])
+def test_engines_match_frozen_reference(test_settings, engine) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    quantiles = (0.5, 0.9, 0.99)
+    expected, expected_plain = _engine_reference(quantiles), _engine_reference(())
+    approx = engine == "rollup"
+    with get_session_factory(test_settings)() as session:
+        service = AnalyticsService(session, engine=engine)
+        _assert_matches(service.summary("tenant-engines", from_ts, to_ts, quantiles), expected["summary"], approx)
+        for granularity in ("total", "day"):
+            _assert_matches(
+                service.by_model("tenant-engines", from_ts, to_ts, granularity),
+                expected_plain["by_model"][granularity],
+                approx,
+            )
+            _assert_matches(
+                service.by_feature("tenant-engines", from_ts, to_ts, granularity, quantiles),
+                expected["by_feature"][granularity],
+                approx,
+            )
+
+
+def test_sql_engine_returns_one_row_per_bucket(test_settings) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    with get_session_factory(test_settings)() as session:
+        service = AnalyticsService(session, engine="sql")
+        assert service.raw_horizon is None
+        for granularity in ("total", "day"):
+            with count_queries(session) as stats:
+                rows = service.by_model("tenant-engines", from_ts, to_ts, granularity, (0.5, 0.99))
+            # Quantiles are ranked in the database; no latency rows are fetched.
+            assert (stats.statements, stats.rows_returned) == (1, len(rows))
+
+
+def test_offline_parquet_engine_matches_frozen_reference(test_settings, tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    from llm_revenue_analyzer.analytics.offline import OfflineAnalytics
+    from llm_revenue_analyzer.store.parquet import ParquetExporter
+
+    from_ts, to_ts = _seed_window(test_settings)
+    stats = ParquetExporter(test_settings, tmp_path, page_size=7).export(from_ts, to_ts)
+    assert stats.rows == 70
+    assert sorted(p.parent.name for p in (tmp_path / "llm_events").glob("*/*/*.parquet")) == [
+        "day=2026-03-10",
+        "day=2026-03-11",
+    ]
+    offline = OfflineAnalytics(tmp_path, workers=2)
+    quantiles = (0.5, 0.9, 0.99)
+    expected, expected_plain = _engine_reference(quantiles), _engine_reference(())
+    _assert_matches(offline.summary("tenant-engines", from_ts, to_ts, quantiles), expected["summary"], False)
+    for granularity in ("total", "day"):
+        _assert_matches(
+            offline.by_model("tenant-engines", from_ts, to_ts, granularity, quantiles),
+            expected["by_model"][granularity],
+            False,
+        )
+        _assert_matches(
+            offline.by_feature("tenant-engines", from_ts, to_ts, granularity),
+            expected_plain["by_feature"][granularity],
+            False,
+        )
+
+
+def test_latency_sketch_error_bound_and_merge() -> None:
+    rng = random.Random(7)
+    values = [rng.randint(0, 20000) for _ in range(5000)]
+    left, right = LatencySketch.from_values(values[:2000]), LatencySketch.from_values(values[2000:])
+    merged = left.merge(right)
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.95, 0.99, 1.0):
+        exact = ordered[max(0, ceil(q * len(ordered)) - 1)]
+        assert merged.quantile(q) == pytest.approx(exact, rel=RELATIVE_ACCURACY, abs=1e-9)
+
+
+def _decimal_money(total: Decimal) -> float:
+    return float(total.quantize(Decimal("0.000001")))
+
+
+@pytest.mark.parametrize("seed", [3, 25])
+def test_money_outputs_equal_a_decimal_reference(test_settings, seed) -> None:
+    """Summaries, breakdowns and budget status against plain ``Decimal`` sums of random events."""
+    create_all(test_settings)
+    rng = random.Random(seed)
+    from_ts = datetime(2026, 5, 10, 5, 30, tzinfo=UTC)
+    to_ts = from_ts + timedelta(days=3)
+    features = ["chat", "search", "copilot"]
+    models = [("openai", "gpt-4o-mini"), ("anthropic", "claude-3-5-haiku")]
+
+    def amount() -> Decimal:
+        return Decimal(rng.randint(0, rng.choice([10**3, 10**6, 10**10]))).scaleb(-6)
+
+    rows = []
+    for idx in range(400):
+        provider, model = rng.choice(models)
+        rows.append(
+            {
+                "timestamp": from_ts + timedelta(minutes=rng.randint(-12 * 60, 84 * 60)),
+                "tenant_id": "tenant-money",
+                "user_id": "user-1",
+                "request_id": f"req-money-{idx}",
+                "provider": provider,
+                "model": model,
+                "prompt_tokens": 10,
+                "completion_tokens": 5,
+                "total_tokens": 15,
+                "latency_ms": rng.randint(50, 900),
+                "status": "success",
+                "cost_usd": amount(),
+                "feature": rng.choice(features),
+                "metadata_json": None,
+            }
+        )
+    revenue = [
+        (from_ts + timedelta(minutes=rng.randint(-12 * 60, 84 * 60)), rng.choice(features), amount()) for _ in range(80)
+    ]
+    budget_usd = Decimal(rng.randint(10**6, 10**12)).scaleb(-6)
+    with get_session_factory(test_settings)() as session:
+        TenantRepo(session).ensure("tenant-money")
+        LLMEventRepo(session).bulk_create(rows)
+        RollupRepo(session).apply(rows)
+        for timestamp, feature, amount_usd in revenue:
+            session.add(
+                RevenueEvent(
+                    timestamp=timestamp,
+                    tenant_id="tenant-money",
+                    user_id="user-1",
+                    amount_usd=amount_usd,
+                    currency="USD",
+                    source="usage",
+                    feature=feature,
+                )
+            )
+        BudgetService(session).set_budget("tenant-money", budget_usd, hard_limit=False, soft_limit_pct=0.8)
+        session.commit()
+
+    in_window = [row for row in rows if from_ts <= row["timestamp"] < to_ts]
+    revenue_in_window = [item for item in revenue if from_ts <= item[0] < to_ts]
+    cost = sum((row["cost_usd"] for row in in_window), Decimal("0"))
+    income = sum((item[2] for item in revenue_in_window), Decimal("0"))
+    daily: dict[str, Decimal] = {}
+    by_model: dict[tuple[str, str], Decimal] = {}
+    feature_cost: dict[str, Decimal] = {}
+    for row in in_window:
+        day = row["timestamp"].date().isoformat()
+        daily[day] = daily.get(day, Decimal("0")) + row["cost_usd"]
+        key = (row["provider"], row["model"])
+        by_model[key] = by_model.get(key, Decimal("0")) + row["cost_usd"]
+        feature_cost[row["feature"]] = feature_cost.get(row["feature"], Decimal("0")) + row["cost_usd"]
+    feature_revenue: dict[str, Decimal] = {}
+    for _, feature, amount_usd in revenue_in_window:
+        feature_revenue[feature] = feature_revenue.get(feature, Decimal("0")) + amount_usd
+
+    with get_session_factory(test_settings)() as session:
+        for engine in ("python", "rollup", "sql"):
+            service = AnalyticsService(session, engine=engine)
+            summary = service.summary("tenant-money", from_ts, to_ts)
+            assert (summary["cost_usd"], summary["revenue_usd"], summary["margin_usd"]) == (
+                _decimal_money(cost),
+                _decimal_money(income),
+                _decimal_money(income - cost),
+            ), engine
+            assert summary["daily"] == [
+                {"day": day, "cost_usd": _decimal_money(total)} for day, total in sorted(daily.items())
+            ], engine
+            assert {
+                (row["provider"], row["model"]): row["cost_usd"]
+                for row in service.by_model("tenant-money", from_ts, to_ts)
+            } == {key: _decimal_money(total) for key, total in by_model.items()}, engine
+            assert {
+                row["feature"]: (row["cost_usd"], row["revenue_usd"], row["margin_usd"])
+                for row in service.by_feature("tenant-money", from_ts, to_ts)
+            } == {
+                feature: (
+                    _decimal_money(feature_cost.get(feature, Decimal("0"))),
+                    _decimal_money(feature_revenue.get(feature, Decimal("0"))),
+                    _decimal_money(feature_revenue.get(feature, Decimal("0")) - feature_cost.get(feature, Decimal("0"))),
+                )
+                for feature in {*feature_cost, *feature_revenue}
+            }, engine
+
+        month_cost = sum((row["cost_usd"] for row in rows), Decimal("0"))
+        month_revenue = sum((item[2] for item in revenue), Decimal("0"))
+        for ledger in (None, SpendLedger()):
+            status = BudgetService(session, ledger=ledger).get_status("tenant-money", now=from_ts)
+            assert (
+                status["monthly_spend_usd"],
+                status["monthly_revenue_usd"],
+                status["remaining_budget_usd"],
+                status["monthly_budget_usd"],
+            ) == (
+                _decimal_money(month_cost),
+                _decimal_money(month_revenue),
+                _decimal_money(budget_usd - month_cost),
+                _decimal_money(budget_usd),
+            )
+            if month_cost > budget_usd:
+                assert status["status"] == "over_budget"
+            else:
+                assert status["status"] == ("soft_limit_exceeded" if month_cost >= budget_usd * Decimal("0.8") else "ok")
+
+        # Daily cost series read raw rows after the retention watermark and rollups before it.
+        days = {row["timestamp"].date(): Decimal("0") for row in rows}
+        for row in rows:
+            days[row["timestamp"].date()] += row["cost_usd"]
+        first, last = min(days), max(days)
+        midnight = from_ts.replace(hour=0, minute=0)
+        start = midnight + timedelta(days=(first - midnight.date()).days)
+        window = (start, start + timedelta(days=(last - first).days + 1))
+        RetentionRepo(session).advance(LLM_EVENTS_WATERMARK, start + timedelta(days=2))
+        assert LLMEventRepo(session).list_daily_costs("tenant-money", *window) == sorted(days.items())
+        session.rollback()
+
+    assert to_micros(Decimal("0.0000005")) == 1
+    assert to_micros(Decimal("-0.0000015")) == -2
+    assert to_micros("1.5") == to_micros(1.5) == 1_500_000
+    assert micros_to_usd(to_micros(Decimal("12.345678"))) == Decimal("12.345678")
+
+
+def test_rollup_rebuild_matches_incremental(test_settings) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    with get_session_factory(test_settings)() as session:
+
+        rollups = RollupRepo(session)
+        start, end = from_ts - timedelta(days=1), to_ts + timedelta(days=2)
+
+        def snapshot() -> list[tuple[object, ...]]:
+            return sorted(
+                (r.bucket_start, r.provider, r.model, r.feature, r.requests, r.errors, r.cost_usd)
+                for r in rollups.list_for_window("tenant-engines", start, end)
+            )
+
+        incremental = snapshot()
+        rollups.rebuild(start, end)
+        session.expire_all()
+        assert snapshot() == incremental
+
+
+def test_metrics_cache_serves_repeats_and_invalidates_on_ingest(client) -> None:
+    cache: MetricsResultCache = client.app.state.metrics_cache
+    day = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    params = {"tenant_id": "tenant-cache", "from": day.isoformat(), "to": (day + timedelta(days=1)).isoformat()}
+    base = {
+        "tenant_id": "tenant-cache",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 500,
+        "latency_ms": 300,
+        "status": "success",
+        "feature": "chat",
+    }
+
+    def post(request_id: str, at: datetime) -> None:
+        payload = {**base, "request_id": request_id, "timestamp": at.isoformat()}
+        assert client.post("/events/llm", json=payload).status_code == 200
+
+    def hits() -> float:
+        return METRICS_CACHE_REQUESTS.labels(endpoint="summary", outcome="hit")._value.get()
+
+    post("cache-1", day + timedelta(hours=2))
+    first = client.get("/metrics/summary", params=params).json()
+    before = hits()
+    assert client.get("/metrics/summary", params=params).json() == first
+    assert hits() == before + 1
+
+    post("cache-outside", day + timedelta(days=2))
+    assert len(cache) == 1
+    post("cache-2", day + timedelta(hours=5))
+    assert len(cache) == 0
+    assert client.get("/metrics/summary", params=params).json()["requests"] == first["requests"] + 1
+
+
+def test_metrics_cache_past_windows_expire_to_see_other_writers(client, test_settings) -> None:
+    client.app.state.metrics_cache = MetricsResultCache(max_bytes=1 << 20, ttl_seconds=60, past_ttl_seconds=0.2)
+    day = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    params = {"tenant_id": "tenant-other", "from": day.isoformat(), "to": (day + timedelta(days=1)).isoformat()}
+    assert client.get("/metrics/summary", params=params).json()["requests"] == 0
+
+    # A write by another process (worker, repricing job, backfill) never reaches this cache.
+    with get_session_factory(test_settings)() as session:
+        TenantRepo(session).ensure("tenant-other")
+        row = {
+            "timestamp": day + timedelta(hours=4),
+            "tenant_id": "tenant-other",
+            "user_id": "user-1",
+            "request_id": "req-other",
+            "provider": "openai",
+            "model": "gpt-4o-mini",
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+            "total_tokens": 15,
+            "latency_ms": 120,
+            "status": "success",
+            "cost_usd": Decimal("0.000010"),
+            "feature": "chat",
+            "metadata_json": None,
+        }
+        LLMEventRepo(session).bulk_create([row])
+        RollupRepo(session).apply([row])
+        session.commit()
+    assert client.get("/metrics/summary", params=params).json()["requests"] == 0
+    time.sleep(0.3)
+    assert client.get("/metrics/summary", params=params).json()["requests"] == 1
+
+
+def test_metrics_cache_bounds_bytes_and_skips_stale_results() -> None:
+    window = Window.normalize(datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 1, 2, tzinfo=UTC))
+    value = {"requests": 1, "cost_usd": 0.5}
+    size = len(json.dumps(value))
+    cache = MetricsResultCache(max_bytes=2 * size, ttl_seconds=60)
+    keys = [MetricsCacheKey("summary", f"tenant-{idx}", window) for idx in range(3)]
+    for key in keys:
+        cache.put(key, value, cache.generation(key.tenant_id))
+    assert cache.size_bytes == 2 * size
+    assert cache.get(keys[0]) is None and cache.get(keys[2]) == value
+
+    generation = cache.generation("tenant-9")
+    cache.invalidate("tenant-9", [datetime(2025, 1, 1, tzinfo=UTC)])
+    cache.put(MetricsCacheKey("summary", "tenant-9", window), value, generation)
+    assert cache.get(MetricsCacheKey("summary", "tenant-9", window)) is None
+
+
+@pytest.mark.parametrize("engine", ["python", "rollup", "sql"])
+def test_tenant_summaries_match_per_tenant_summary(test_settings, engine) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    with get_session_factory(test_settings)() as session:
+        rows = [
+            {
+                "timestamp": from_ts + timedelta(hours=idx, minutes=7),
+                "tenant_id": "tenant-small",
+                "user_id": "user-2",
+                "request_id": f"req-small-{idx}",
+                "model": "gpt-4o-mini",
+                "provider": "openai",
+                "prompt_tokens": 10,
+                "completion_tokens": 5,
+                "total_tokens": 15,
+                "latency_ms": 80 + idx,
+                "status": "error" if idx == 0 else "success",
+                "cost_usd": Decimal("0.000010"),
+                "feature": "chat",
+                "metadata_json": None,
+            }
+            for idx in range(3)
+        ]
+        LLMEventRepo(session).bulk_create(rows)
+        RollupRepo(session).apply(rows)
+        session.add(
+            RevenueEvent(
+                timestamp=from_ts + timedelta(hours=1),
+                tenant_id="tenant-revenue-only",
+                user_id="user-3",
+                amount_usd=Decimal("2.50"),
+                currency="USD",
+                source="usage",
+            )
+        )
+        session.commit()
+
+    quantiles = (0.5, 0.99)
+    with get_session_factory(test_settings)() as session:
+        service = AnalyticsService(session, engine=engine)
+        total, page = service.summaries(None, from_ts, to_ts, quantiles)
+        assert total == 3
+        assert [row["tenant_id"] for row in page] == ["tenant-engines", "tenant-small", "tenant-revenue-only"]
+        for row in page:
+            _assert_matches(row, service.summary(str(row["tenant_id"]), from_ts, to_ts, quantiles), False)
+        _assert_matches(page[0], _engine_reference(quantiles)["summary"], engine == "rollup")
+
+        total, page = service.summaries(None, from_ts, to_ts, order_by="error_rate", limit=1, offset=0)
+        assert total == 3 and [row["tenant_id"] for row in page] == ["tenant-small"]
+        total, page = service.summaries(
+            ["tenant-revenue-only", "tenant-missing"], from_ts, to_ts, order_by="margin_usd", descending=False
+        )
+        assert total == 2
+        assert [(row["tenant_id"], row["margin_usd"]) for row in page] == [
+            ("tenant-missing", 0.0),
+            ("tenant-revenue-only", 2.5),
+        ]
+
+
+def test_python_breakdowns_bucket_naive_rows_by_utc_day(test_settings, monkeypatch) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    # SQLite hands timestamps back naive; they must not be read as local time.
+    monkeypatch.setenv("TZ", "Etc/GMT+5")
+    time.tzset()
+    try:
+        with get_session_factory(test_settings)() as session:
+            python = AnalyticsService(session, engine="python")
+            sql = AnalyticsService(session, engine="sql")
+            by_model = python.by_model("tenant-engines", from_ts, to_ts, "day")
+            assert by_model == sql.by_model("tenant-engines", from_ts, to_ts, "day")
+            by_feature = python.by_feature("tenant-engines", from_ts, to_ts, "day")
+            assert by_feature == sql.by_feature("tenant-engines", from_ts, to_ts, "day")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    base, midnight = datetime(2026, 3, 10, 21, 17, tzinfo=UTC), datetime(2026, 3, 11, tzinfo=UTC)
+    first_day = sum(1 for idx in range(60) if from_ts <= base + timedelta(minutes=23 * idx) < midnight)
+    assert sum(row["requests"] for row in by_model if row["day"] == "2026-03-10") == first_day
+    assert {row["day"] for row in by_feature} == {"2026-03-10", "2026-03-11"}
+
+
+@pytest.mark.parametrize("engine", ["python", "rollup", "sql"])
+def test_summary_reads_each_raw_row_once_without_hydrating(test_settings, engine) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    window = Window.normalize(from_ts, to_ts)
+    edges, inner = _split_window(window)
+    assert inner is not None
+    with get_session_factory(test_settings)() as session:
+        in_window = session.scalar(
+            select(func.count()).where(LLMEvent.timestamp >= from_ts, LLMEvent.timestamp < to_ts)
+        )
+        in_edges = sum(
+            session.scalar(select(func.count()).where(LLMEvent.timestamp >= start, LLMEvent.timestamp < end))
+            for start, end in edges
+        )
+        rollups = len(RollupRepo(session).window_rows("tenant-engines", *inner))
+        bins = len(RollupRepo(session).latency_bins("tenant-engines", *inner, by_day=True))
+        with count_queries(session) as fleet:
+            AnalyticsService(session, engine=engine).summaries(None, from_ts, to_ts, (0.5,))
+        with count_queries(session) as stats:
+            summary = AnalyticsService(session, engine=engine).summary("tenant-engines", from_ts, to_ts, (0.5,))
+        # Rows are plain column projections, never tracked ORM instances.
+        assert len(session.identity_map) == 0
+    # Retention watermark, the window's llm_events read once, and the revenue sum.
+    expected = {
+        "python": (3, in_window + 1),
+        "sql": (3, len(summary["daily"]) + 1),
+        "rollup": (4 + len(edges), in_edges + rollups + bins + 1),
+    }
+    assert (stats.statements, stats.rows_returned) == expected[engine]
+    assert fleet.statements == expected[engine][0]
+
+
+def test_run_bench_reports_each_endpoint_and_engine(test_settings) -> None:
+    from_ts, to_ts = _seed_window(test_settings)
+    results = run_bench(test_settings, "tenant-engines", from_ts, to_ts, repeat=1)
+    assert [(result.endpoint, result.engine) for result in results][:2] == [
+        ("summary", "python"),
+        ("summary_all", "python"),
+    ]
+    assert all(result.statements > 0 and result.median_ms >= 0 for result in results)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import date
+
+from llm_revenue_analyzer.store.db import get_engine
+from llm_revenue_analyzer.store.partitions import PartitionManager, PartitionRange, plan_partitions
+
+
+def test_partition_plan_premakes_contiguous_ranges_and_expires_old() -> None:
+    existing = [PartitionRange(date(2026, 1, 1), date(2026, 2, 1)), PartitionRange(date(2026, 2, 1), date(2026, 3, 1))]
+    plan = plan_partitions(existing, date(2026, 3, 15), "month", premake=2, retention_days=30)
+    assert [item.name for item in plan.create] == [
+        "llm_events_p20260301_20260401",
+        "llm_events_p20260401_20260501",
+        "llm_events_p20260501_20260601",
+    ]
+    assert plan.expire == [existing[0]]
+    assert PartitionRange.from_name(plan.create[0].name) == plan.create[0]
+
+    daily = plan_partitions(plan.create, date(2026, 5, 30), "day", premake=3, retention_days=0)
+    assert [(item.start, item.end) for item in daily.create] == [
+        (date(2026, 6, 1), date(2026, 6, 2)),
+        (date(2026, 6, 2), date(2026, 6, 3)),
+    ]
+    assert plan_partitions([], date(2026, 12, 31), "month", premake=0, retention_days=0).create == [
+        PartitionRange(date(2026, 12, 1), date(2027, 1, 1))
+    ]
+
+
+def test_partition_manager_is_noop_without_postgres(test_settings) -> None:
+    plan = PartitionManager.from_settings(get_engine(test_settings), test_settings).run()
+    assert plan.create == [] and plan.expire == []
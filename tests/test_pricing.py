@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+import os
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
 
-from llm_revenue_analyzer.pricing import CostCalculator, PricingCatalog
+import pytest
+import yaml
+
+from llm_revenue_analyzer.pricing import (
+    CostCalculator,
+    PricingCatalog,
+    PricingCatalogWatcher,
+    PricingNotFound,
+)
+from llm_revenue_analyzer.pricing.loader import ModelPricing
+from llm_revenue_analyzer.pricing.reprice import RepriceScope, RepriceStats, RepricingJob
 
 
 def test_pricing_cost_calculation() -> None:
@@ -15,3 +30,144 @@ def test_pricing_cost_calculation() -> None:
         completion_tokens=1000,
     )
     assert float(cost) == 0.00075
+
+
+def test_bulk_pricing_matches_scalar_rounding() -> None:
+    np = pytest.importorskip("numpy")
+    from llm_revenue_analyzer.pricing.bulk import BulkCostCalculator
+
+    catalog = PricingCatalog(
+        {
+            ("openai", "gpt-4o-mini"): ModelPricing("openai", "gpt-4o-mini", Decimal("0.00015"), Decimal("0.0006")),
+            ("x", "fine"): ModelPricing("x", "fine", Decimal("0.0000003"), Decimal("0.0000017")),
+            ("x", "huge"): ModelPricing("x", "huge", Decimal("123456.789"), Decimal("0.5")),
+        }
+    )
+    scalar = CostCalculator(catalog)
+    bulk = BulkCostCalculator(catalog)
+    rng = random.Random(7)
+    rows = [
+        (rng.choice(["openai", "X"]), rng.choice(["gpt-4o-mini", "FINE"]), rng.randint(0, 50_000), rng.randint(0, 50_000))
+        for _ in range(2000)
+    ]
+    rows += [("x", "fine", 5000, 0), ("x", "fine", 1666, 0), ("openai", "gpt-4o-mini", 1, 1)]
+    rows = [row for row in rows if (row[0].lower(), row[1].lower()) in catalog.models()]
+    providers, models, prompt, completion = (list(column) for column in zip(*rows, strict=True))
+    assert bulk.compute_cost_usd(providers, models, prompt, completion) == [
+        scalar.compute_cost_usd(*row) for row in rows
+    ]
+
+    big = [("x", "huge", 10**9, 10**9)]
+    assert bulk.compute_cost_usd(["x"], ["huge"], np.array([10**9]), np.array([10**9])) == [
+        scalar.compute_cost_usd(*big[0])
+    ]
+    with pytest.raises(PricingNotFound):
+        bulk.compute_micros(bulk.encode(["openai"], ["missing"]), [1], [1])
+
+
+def test_effective_dated_pricing_uses_event_timestamp() -> None:
+    catalog = PricingCatalog.from_bytes(
+        yaml.safe_dump(
+            {
+                "providers": {
+                    "openai": {
+                        "models": {
+                            "gpt-4o": {
+                                "effective_from": "2024-10-01",
+                                "input_per_1k_tokens": 0.0025,
+                                "output_per_1k_tokens": 0.01,
+                                "history": [
+                                    {"effective_from": "2024-05-13", "input_per_1k_tokens": 0.005, "output_per_1k_tokens": 0.015}
+                                ],
+                            },
+                            "legacy": {"input_per_1k_tokens": 0.001, "output_per_1k_tokens": 0.002},
+                        }
+                    }
+                }
+            }
+        ).encode()
+    )
+    calc = CostCalculator(catalog)
+    october = datetime(2024, 10, 1, tzinfo=UTC)
+    assert calc.compute_cost_usd("openai", "gpt-4o", 1000, 1000) == Decimal("0.0125")
+    assert calc.compute_cost_usd("openai", "gpt-4o", 1000, 1000, at=october - timedelta(seconds=1)) == Decimal("0.02")
+    assert calc.compute_cost_usd("openai", "gpt-4o", 1000, 1000, at=october) == Decimal("0.0125")
+    assert calc.compute_cost_usd("openai", "legacy", 1000, 0, at=datetime(2001, 1, 1)) == Decimal("0.001")
+    with pytest.raises(PricingNotFound):
+        calc.compute_cost_usd("openai", "gpt-4o", 1000, 1000, at=datetime(2024, 1, 1, tzinfo=UTC))
+
+    pytest.importorskip("numpy")
+    from llm_revenue_analyzer.pricing.bulk import BulkCostCalculator
+
+    bulk = BulkCostCalculator(catalog)
+    stamps = sorted(datetime(2024, 5, 13, tzinfo=UTC) + timedelta(hours=7 * i) for i in range(400))
+    stamps.append(october - timedelta(seconds=1))
+    rows = [("openai", "gpt-4o" if i % 3 else "legacy", 1000 + i, 500 + i) for i in range(len(stamps))]
+    providers, models, prompt, completion = (list(column) for column in zip(*rows, strict=True))
+    assert bulk.compute_cost_usd(providers, models, prompt, completion, timestamps=stamps) == [
+        calc.compute_cost_usd(*row, at=ts) for row, ts in zip(rows, stamps, strict=True)
+    ]
+    with pytest.raises(PricingNotFound):
+        bulk.compute_cost_usd(["openai"], ["gpt-4o"], [1], [1], timestamps=[datetime(2024, 1, 1, tzinfo=UTC)])
+
+
+def test_repricing_job_updates_computed_costs_and_rollups(client, test_settings, tmp_path) -> None:
+    now = datetime.now(UTC)
+    base = {
+        "timestamp": now.isoformat(),
+        "tenant_id": "tenant-reprice",
+        "user_id": "user-1",
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "prompt_tokens": 1000,
+        "completion_tokens": 1000,
+        "latency_ms": 100,
+        "status": "success",
+        "feature": "chat",
+    }
+    items = [{**base, "request_id": f"req-{i}"} for i in range(5)] + [{**base, "request_id": "req-s", "cost_usd": 9}]
+    assert client.post("/events/llm/batch", json=items).json()["accepted"] == 6
+
+    raw = yaml.safe_load(Path("data/pricing.yaml").read_text(encoding="utf-8"))
+    raw["providers"]["openai"]["models"]["gpt-4o-mini"]["input_per_1k_tokens"] = 0.00115
+    pricing_path = tmp_path / "pricing.yaml"
+    pricing_path.write_text(yaml.safe_dump(raw), encoding="utf-8")
+    settings = test_settings.model_copy(update={"pricing_file": str(pricing_path)})
+    scope = RepriceScope(now - timedelta(hours=1), now + timedelta(hours=1))
+    checkpoint = tmp_path / "checkpoint.json"
+
+    def interrupt(stats: RepriceStats, total: int) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        RepricingJob(settings, scope, chunk_size=2, chunks_per_range=1, checkpoint_path=checkpoint, progress=interrupt).run()
+    assert checkpoint.exists()
+
+    stats = RepricingJob(settings, scope, chunk_size=2, chunks_per_range=1, checkpoint_path=checkpoint).run()
+    assert (stats.skipped_ranges, stats.scanned + 2, stats.updated + 2) == (1, 5, 5)
+    assert not checkpoint.exists()
+
+    params = {"tenant_id": "tenant-reprice", "from": scope.from_ts.isoformat(), "to": scope.to_ts.isoformat()}
+    summary = client.get("/metrics/summary", params=params).json()
+    assert summary["cost_usd"] == pytest.approx(5 * 0.00175 + 9)
+
+
+def test_pricing_watcher_swaps_versions_on_change(tmp_path) -> None:
+    source = Path("data/pricing.yaml").read_text(encoding="utf-8")
+    path = tmp_path / "pricing.yaml"
+    path.write_text(source, encoding="utf-8")
+    watcher = PricingCatalogWatcher(path)
+    original = watcher.current
+    assert original.version.startswith("sha256:")
+    assert watcher.refresh() is False
+
+    path.write_text("version: 2026-10-01\n" + source.replace("0.00015", "0.00030"), encoding="utf-8")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+    assert watcher.refresh() is True
+    assert watcher.current.version == "2026-10-01"
+    assert CostCalculator(watcher.current).compute_cost_usd("openai", "gpt-4o-mini", 1000, 0) == Decimal("0.0003")
+
+    path.write_text("providers: [", encoding="utf-8")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 2_000_000))
+    assert watcher.refresh() is False
+    assert watcher.current.version == "2026-10-01"
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from llm_revenue_analyzer.analytics import AnalyticsService
+from llm_revenue_analyzer.core.sketch import RELATIVE_ACCURACY
+from llm_revenue_analyzer.store.db import create_all, get_session_factory
+from llm_revenue_analyzer.store.models import LLMEvent
+from llm_revenue_analyzer.store.repos import LLMEventRepo, RollupRepo, TenantRepo
+from llm_revenue_analyzer.store.retention import RetentionJob
+
+
+def test_retention_downsamples_old_events_without_changing_results(test_settings) -> None:
+    create_all(test_settings)
+    now = datetime(2026, 5, 20, 12, 30, tzinfo=UTC)
+    base = datetime(2026, 5, 1, 6, 10, tzinfo=UTC)
+    with get_session_factory(test_settings)() as session:
+        TenantRepo(session).ensure("tenant-retention")
+        rows = [
+            {
+                "timestamp": base + timedelta(hours=7 * idx, minutes=idx),
+                "tenant_id": "tenant-retention",
+                "user_id": "user-1",
+                "request_id": f"req-r{idx}",
+                "model": "gpt-4o-mini",
+                "provider": "openai",
+                "prompt_tokens": 100 + idx,
+                "completion_tokens": 40 + idx,
+                "total_tokens": 140 + 2 * idx,
+                "latency_ms": 120 + (idx * 53) % 700,
+                "status": "error" if idx % 5 == 0 else "success",
+                "cost_usd": Decimal("0.000321") * (idx + 1),
+                "feature": ("chat", "search")[idx % 2],
+                "metadata_json": None,
+            }
+            for idx in range(60)
+        ]
+        LLMEventRepo(session).bulk_create(rows)
+        RollupRepo(session).apply(rows)
+        session.commit()
+
+    window = (datetime(2026, 5, 1, tzinfo=UTC), datetime(2026, 5, 21, tzinfo=UTC))
+
+    def snapshot() -> tuple[dict[str, object], list[dict[str, object]], dict[str, Decimal], object]:
+        with get_session_factory(test_settings)() as session:
+            service = AnalyticsService(session, engine="python")
+            repo = LLMEventRepo(session)
+            return (
+                service.summary("tenant-retention", *window),
+                service.by_feature("tenant-retention", *window, granularity="day"),
+                repo.month_cost_sums(now),
+                repo.list_daily_costs("tenant-retention", *window),
+            )
+
+    before = snapshot()
+    job = RetentionJob(test_settings, retention_days=7, batch_size=10)
+    cutoff = job.cutoff(now)
+    with get_session_factory(test_settings)() as session:
+        expiring = session.scalar(select(func.count()).where(LLMEvent.timestamp < cutoff))
+    assert expiring and expiring < len(rows)
+
+    dry = job.run(now=now, dry_run=True)
+    assert (dry.rows, dry.deleted) == (expiring, 0)
+    assert dry.bytes_estimate > 0 and dry.rollup_rows > 0
+
+    report = job.run(now=now)
+    assert report.deleted == expiring
+    assert report.batches == expiring // 10 + 1
+    with get_session_factory(test_settings)() as session:
+        assert session.scalar(select(func.count()).where(LLMEvent.timestamp < cutoff)) == 0
+        assert LLMEventRepo(session).raw_horizon() == cutoff
+        # Rebuilding rollups over the purged range must not erase the downsampled history.
+        RollupRepo(session).rebuild(*window)
+        session.commit()
+
+    summary, by_feature, month_sums, daily = snapshot()
+    assert month_sums == before[2]
+    assert daily == before[3]
+    for actual, expected in [(summary, before[0]), *zip(by_feature, before[1], strict=True)]:
+        for key, value in expected.items():
+            if key in {"p95_latency_ms", "latency_quantiles_ms"}:
+                assert actual[key] == pytest.approx(value, rel=RELATIVE_ACCURACY), key
+            else:
+                assert actual[key] == value, key